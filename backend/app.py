@@ -1,62 +1,248 @@
 import json
-from flask import Flask, request, jsonify
-from .services.data_processor import DataProcessor 
+import logging
+import uuid
+from flask import Flask, Response, request, jsonify, stream_with_context
+from .services.columnar_store import ColumnarStore
+from .services.compression import ResponseCompressor
+from .services.executor import AnalysisExecutor, ExecutorBusy
+from .services.instrumentation import default_metrics
+from .services.jobs import JobManager, PipelineError, run_pipeline
+from .services.progress import PHASE_DONE
+from .services.result_cache import ResultCache
+from .services.result_pages import InvalidPageRequest, ResultPages
+from .services.scratch import default_scratch
+from .services.snapshots import SnapshotStore
+from .services.state_store import create_state_store
+from .services.structured_logging import configure_logging, current_job_id, redact_url
 from flask_cors import CORS
 
 app = Flask(__name__)
-CORS(app) 
+CORS(app)
 
-# React Native uygulamamızın çağıracağı ana API rotası
-@app.route('/', methods=['POST'])
-def analyze_data():
+# JSON satırları halinde, kuyruk üzerinden (istek iş parçacığını bekletmeden) stdout'a yazılan günlükler
+configure_logging()
+# Doğrudan çalıştırıldığında __name__ '__main__' olur; ad sabit tutulur ki kayıtlar backend günlükçüsünden geçsin
+logger = logging.getLogger('backend.app')
+
+# İş durumu, ilerleme ve önbellek için depo (REDIS_URL varsa tüm işçiler arasında paylaşılır)
+state_store = create_state_store()
+
+# Aynı dışa aktarımın tekrar gönderilmesinde analiz sonucunu yeniden kullanan önbellek
+result_cache = ResultCache(store=state_store)
+
+# Analiz sonuçlarını saklayıp kullanıcı listelerini sayfa sayfa sunar (GET /results/<id>/lists/<key>)
+result_pages = ResultPages(state_store)
+
+# Hesap başına takipçi anlık görüntüleri; arşivdeki hesabın analizlerine "son seferden beri" farkı eklenir
+snapshot_store = SnapshotStore()
+
+# Ayrıştırılmış ilişkiler arşiv başına diskte sütunlu tutulur; aynı arşiv tekrar ayrıştırılmaz
+columnar_store = ColumnarStore()
+
+# İşlerin geçici klasörleri toplam bayt kotasıyla yönetilir; temizlikçi sahipsiz eski klasörleri siler
+scratch_manager = default_scratch
+scratch_manager.start_janitor()
+
+# Tüm analizler (senkron ve arka plan) bu sınırlı havuzlardan geçer; kuyruk dolunca 429 döner
+analysis_executor = AnalysisExecutor()
+
+# Arka plan analiz işlerini yöneten havuz (POST /jobs, GET /jobs/<id>)
+job_manager = JobManager(executor=analysis_executor, result_cache=result_cache, store=state_store, result_pages=result_pages,
+                         snapshot_store=snapshot_store, columnar_store=columnar_store,
+                         scratch_manager=scratch_manager)
+
+# JSON yanıtlarını Accept-Encoding'e göre sıkıştırır (kullanıcı listeleri çok iyi sıkışır)
+response_compressor = ResponseCompressor()
+
+# SSE bağlantısını canlı tutmak için boş yorum satırı gönderme aralığı (saniye)
+SSE_HEARTBEAT_SECONDS = 15
+
+
+@app.after_request
+def compress_response(response):
+    return response_compressor.compress(response, request.accept_encodings)
+
+
+def _busy_response(error: ExecutorBusy):
+    """Analiz kuyruğu ya da geçici alan doluyken 429 + Retry-After yanıtı."""
+    response = jsonify({"status": "error", "message": str(error)})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
+
+def _parse_analysis_request():
     """
-    Frontend'den gelen POST isteğini işler.DataProcessor'ı başlatır.
+    İstek gövdesinden downloadUrl, username ve lazyLists alanlarını okur.
+    Hata durumunda (None, None, None, hata yanıtı) döndürür.
     """
-    processor = None # Temizlik için erişilebilir olmalı
-    # 1. İstek Gövdesini Alma
     try:
         data = request.get_json()
     except Exception as e:
         # JSON ayrıştırma hatası
-        return jsonify({"status": "error", "message": "Geçersiz JSON formatı"}), 400
+        return None, None, None, (jsonify({"status": "error", "message": "Geçersiz JSON formatı"}), 400)
 
     download_url = data.get('downloadUrl')
     username = data.get('username') # Opsiyonel kullanıcı adı
-    
+    lazy_lists = bool(data.get('lazyLists')) # True ise listeler yanıta gömülmez, sayfa sayfa istenir
+
     if not download_url or not download_url.startswith('http'):
-        return jsonify({"status": "error", "message": "Geçersiz indirme URL'si."}), 400
+        return None, None, None, (jsonify({"status": "error", "message": "Geçersiz indirme URL'si."}), 400)
 
-    # Hata Ayıklama (Debug) Mesajı
-    print(f"[{download_url}] URL'si Backend'e ulaştı. Analiz başlıyor...")
+    return download_url, username, lazy_lists, None
 
-    # 2. DataProcessor'ı Başlatma ve İndirme
-    processor = DataProcessor(download_url=download_url, username=username)
 
-    # İndirme işlemi
-    if not processor.download_file():
-        #processor.cleanup()  # İndirme başarısızsa temizleme yap
-        return jsonify({"status": "error", "message": "Dosya indirme işlemi başarısız oldu. Link süresi dolmuş veya ağ hatası var."}), 500
+# React Native uygulamamızın çağıracağı ana API rotası
+@app.route('/', methods=['POST'])
+def analyze_data():
+    """
+    Frontend'den gelen POST isteğini işler. Analizi istek içinde (senkron) çalıştırır.
+    Uzun süren analizler için POST /jobs tercih edilmelidir.
+    lazyLists=true gönderilirse yanıt sadece metrikleri ve sonuç kimliğini içerir.
+    """
+    # 1. İstek Gövdesini Alma
+    download_url, username, lazy_lists, error_response = _parse_analysis_request()
+    if error_response:
+        return error_response
 
-    #zip açma
-    if not processor.unzip_and_extract():
-        processor.cleanup(keep_extracted=False)#hata varsa açılan dosyaları sil
-        return jsonify({"status": "error", "message": "ZIP dosyasını açma işlemi başarısız oldu veya dosya bozuk."}), 500   
- 
-    # 3. Analiz İşlemini Başlatma (YENİ EKLEME)
+    # Senkron analizin günlük kayıtları da bir iş kimliğiyle gruplanır
+    token = current_job_id.set(f"sync-{uuid.uuid4().hex}")
+    logger.info("Analiz isteği alındı: %s", redact_url(download_url))
+
+    # 2. İndirme, ZIP açma ve analiz (temizlik run_pipeline içinde yapılır)
     try:
-        results = processor.run_analysis()
-    except Exception as e:
-        print(f"Analiz sırasında beklenmedik hata oluştu: {e}")
-        processor.cleanup()
-        return jsonify({"status": "error", "message": f"Analiz sırasında hata oluştu: {e}"}), 500
+        scratch_manager.admit()
+        future = analysis_executor.submit(run_pipeline, download_url, username, result_cache=result_cache,
+                                          snapshot_store=snapshot_store, columnar_store=columnar_store,
+                                          parse_executor=analysis_executor.parse_pool,
+                                          scratch_manager=scratch_manager, result_pages=result_pages)
+        results = future.result()
+    except ExecutorBusy as e:
+        logger.warning("Analiz reddedildi (Retry-After: %d): %s", e.retry_after, e)
+        return _busy_response(e)
+    except PipelineError as e:
+        logger.warning("Analiz başarısız: %s", e)
+        return jsonify({"status": "error", "message": str(e)}), 500
+    finally:
+        current_job_id.reset(token)
 
-    # 4. Temizlik İşlemi (Başarılı analizden sonra dosyaları sil)
-    processor.cleanup()
+    # Sonuç run_pipeline içinde saklandı; listeler sonradan sayfa sayfa da istenebilir
+    if lazy_lists:
+        return jsonify({"status": "success", "results": ResultPages.summary(results, results["result_id"])}), 200
 
     return jsonify({"status": "success", "results": results}), 200
 
 
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Analizi arka planda başlatır ve hemen bir iş kimliği döndürür.
+    Durum ve sonuçlar GET /jobs/<job_id> ile sorgulanır.
+    """
+    download_url, username, _lazy_lists, error_response = _parse_analysis_request()
+    if error_response:
+        return error_response
+
+    try:
+        job_id = job_manager.submit(download_url, username)
+    except ExecutorBusy as e:
+        return _busy_response(e)
+    logger.info("Analiz işi kuyruğa eklendi.", extra={"job_id": job_id})
+
+    response = jsonify({"status": "accepted", "job_id": job_id})
+    response.headers['Location'] = f"/jobs/{job_id}"
+    return response, 202
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Analiz işinin durumunu (queued/running/success/error) ve bittiyse sonuçlarını döndürür."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "İş bulunamadı veya süresi doldu."}), 404
+
+    return jsonify({"status": "success", "job": job}), 200
+
+
+@app.route('/results/<result_id>', methods=['GET'])
+def get_result_summary(result_id):
+    """Saklanan sonucun metriklerini ve liste boyutlarını döndürür."""
+    summary = result_pages.get_summary(result_id)
+    if summary is None:
+        return jsonify({"status": "error", "message": "Sonuç bulunamadı veya süresi doldu."}), 404
+
+    return jsonify({"status": "success", "results": summary}), 200
+
+
+@app.route('/results/<result_id>/lists/<list_key>', methods=['GET'])
+def get_result_list_page(result_id, list_key):
+    """
+    Kullanıcı listesinin bir sayfasını döndürür.
+    Sorgu parametreleri: cursor (önceki yanıttaki next_cursor), limit, prefix (kullanıcı adı öneki).
+    """
+    try:
+        page = result_pages.get_page(
+            result_id, list_key,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit'),
+            prefix=request.args.get('prefix'),
+        )
+    except InvalidPageRequest as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    if page is None:
+        return jsonify({"status": "error", "message": "Sonuç veya liste bulunamadı ya da süresi doldu."}), 404
+
+    return jsonify({"status": "success", **page}), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Aşama süreleri, CPU, bayt ve kuyruk doluluğu (Prometheus metin biçimi, bu işçi için)."""
+    body = default_metrics.render(gauges={
+        'analyses_in_flight': ("Running and queued analyses in this worker.", analysis_executor.in_flight),
+        'analysis_capacity': ("Maximum running plus queued analyses per worker.", analysis_executor.capacity),
+        'scratch_used_bytes': ("Scratch bytes reserved by running jobs plus orphaned files.", scratch_manager.used_bytes),
+        'scratch_quota_bytes': ("Scratch space quota in bytes.", scratch_manager.quota_bytes),
+        'parse_pool_restarts': ("Parse process pools replaced after a worker process died.",
+                                analysis_executor.parse_pool.restarts if analysis_executor.parse_pool else 0),
+    })
+    return Response(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def stream_job_progress(job_id):
+    """
+    İşin ilerlemesini Server-Sent Events olarak yayınlar (indirilen bayt, okunan öğe, aşama).
+    İş bitince son durumla birlikte 'done' olayı gönderilir ve akış kapanır.
+    """
+    if job_manager.get(job_id) is None:
+        return jsonify({"status": "error", "message": "İş bulunamadı veya süresi doldu."}), 404
+
+    def generate():
+        last_version = -1
+        while True:
+            version, progress = job_manager.progress.wait_for_update(job_id, last_version, SSE_HEARTBEAT_SECONDS)
+            if progress is None:
+                break
+            if version == last_version:
+                yield ": heartbeat\n\n"
+                continue
+
+            last_version = version
+            yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+            if progress.get("phase") == PHASE_DONE:
+                break
+
+        job = job_manager.get(job_id) or {}
+        yield f"event: done\ndata: {json.dumps({'state': job.get('state'), 'message': job.get('message')})}\n\n"
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 if __name__ == '__main__':
     # Geliştirme ortamında çalıştır
-    print("Flask Sunucusu 5000 portunda başlatılıyor...")
-    app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
+    logger.info("Flask Sunucusu 5000 portunda başlatılıyor...")
+    app.run(debug=True, port=5000, host='0.0.0.0')
@@ -0,0 +1,160 @@
+"""
+Analiz hattının aşama aşama ölçümü: sentetik dışa aktarımlar (bkz. synthetic_export.py) yerel,
+Range destekli bir HTTP sunucusundan sunulur ve DataProcessor adımları tek tek çalıştırılır.
+
+Her senaryo ayrı bir süreçte çalışır; böylece tepe RSS değeri senaryoya özeldir. Her aşama için
+duvar saati süresi, CPU süresi, sunucudan okunan bayt ve o ana kadarki tepe RSS raporlanır.
+Bunlar test değildir; bir performans değişikliğinin önce/sonra karşılaştırması için kullanılır.
+
+Kullanım:
+    python -m backend.benchmarks.run_benchmarks --sizes 1000 100000 1000000 --media-mb 50
+    python -m backend.benchmarks.run_benchmarks --scenarios remote --json sonuc.json
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import ThreadingHTTPServer
+
+from backend.benchmarks.synthetic_export import generate_export
+from backend.tests.support import RangeRequestHandler
+
+# Senaryo -> (stream_mode, uzak okuma denensin mi)
+SCENARIOS = {
+    'remote': (True, True),      # HTTP Range ile yalnızca gerekli öğeler okunur
+    'download': (True, False),   # tam indirme, öğeler ZIP'ten akış halinde okunur
+    'extract': (False, False),   # tam indirme, gerekli öğeler diske çıkarılır
+}
+DEFAULT_SIZES = (1000, 100000)
+
+
+def _serve(directory: str):
+    server = ThreadingHTTPServer(('127.0.0.1', 0),
+                                 lambda *args: RangeRequestHandler(*args, directory=directory))
+    server.bytes_sent = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _peak_rss_mb() -> float:
+    # Linux'ta ru_maxrss KB cinsindendir
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_scenario(fixture_path: str, scenario: str, parse_workers: int) -> dict:
+    """Alt süreçte çalışır: senaryonun aşamalarını ölçer ve sonuçları döndürür."""
+    from backend.services.data_processor import DataProcessor
+
+    stream_mode, try_remote = SCENARIOS[scenario]
+    server = _serve(os.path.dirname(fixture_path))
+    url = f"http://127.0.0.1:{server.server_address[1]}/{os.path.basename(fixture_path)}"
+    parse_executor = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 0 else None
+    processor = DataProcessor(url, username=f"benchmark-{scenario}-{os.getpid()}", stream_mode=stream_mode,
+                              parse_executor=parse_executor)
+    phases = []
+
+    def measure(name, step):
+        bytes_before = server.bytes_sent
+        wall, cpu = time.perf_counter(), time.process_time()
+        ok = step()
+        phases.append({
+            "phase": name,
+            "ok": ok is not False,
+            "wall_s": round(time.perf_counter() - wall, 4),
+            "cpu_s": round(time.process_time() - cpu, 4),
+            "bytes_read": server.bytes_sent - bytes_before,
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        })
+        return ok
+
+    # Hattın konsol çıktısı sonuç tablosuna karışmasın
+    with contextlib.redirect_stdout(sys.stderr), contextlib.ExitStack() as cleanup:
+        cleanup.callback(server.shutdown)
+        if parse_executor is not None:
+            cleanup.callback(parse_executor.shutdown)
+
+        if try_remote:
+            if not measure('remote_open', processor.open_remote_archive):
+                raise RuntimeError("Uzak ZIP açılamadı")
+        else:
+            if not measure('download', processor.download_file):
+                raise RuntimeError("İndirme başarısız")
+            if not measure('extract', processor.unzip_and_extract):
+                raise RuntimeError("ZIP açılamadı")
+        results = {}
+        measure('analysis', lambda: results.update(processor.run_analysis()))
+        measure('cleanup', processor.cleanup)
+
+    return {
+        "scenario": scenario,
+        "phases": phases,
+        "total_wall_s": round(sum(phase["wall_s"] for phase in phases), 4),
+        "total_bytes_read": sum(phase["bytes_read"] for phase in phases),
+        "metrics": results.get("all_metrics", {}),
+    }
+
+
+def _format_table(rows: list) -> str:
+    header = f"{'fixture':<34}{'scenario':<10}{'phase':<13}{'wall_s':>9}{'cpu_s':>9}{'MB read':>10}{'peak RSS MB':>13}"
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        for phase in row["phases"]:
+            lines.append(f"{row['fixture']:<34}{row['scenario']:<10}{phase['phase']:<13}"
+                         f"{phase['wall_s']:>9.3f}{phase['cpu_s']:>9.3f}"
+                         f"{phase['bytes_read'] / 1024 / 1024:>10.2f}{phase['peak_rss_mb']:>13.1f}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analiz hattını sentetik dışa aktarımlarla aşama aşama ölçer.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="takipçi sayıları")
+    parser.add_argument('--following', type=int, default=None, help="takip edilen sayısı (varsayılan: takipçi/2, en fazla 7500)")
+    parser.add_argument('--shard-size', type=int, default=250000, help="followers_N.json başına takipçi")
+    parser.add_argument('--media-mb', type=int, default=20)
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--parse-workers', type=int, default=0, help="ayrıştırma süreç sayısı (0: aynı süreçte)")
+    parser.add_argument('--fixtures-dir', default=None, help="üretilen ZIP'ler burada tutulur ve yeniden kullanılır")
+    parser.add_argument('--json', dest='json_path', default=None, help="sonuçları JSON olarak yaz")
+    args = parser.parse_args()
+
+    fixtures_dir = args.fixtures_dir or tempfile.mkdtemp(prefix='insta-benchmark-')
+    os.makedirs(fixtures_dir, exist_ok=True)
+    # Her senaryo temiz bir süreçte: tepe RSS ve modül önbellekleri senaryolar arasında taşınmaz
+    context = multiprocessing.get_context('spawn')
+
+    rows = []
+    for size in args.sizes:
+        following = args.following if args.following is not None else min(max(size // 2, 1), 7500)
+        shards = max(1, -(-size // args.shard_size))
+        fixture = f"export_{size}_{following}_{shards}_{args.media_mb}mb.zip"
+        fixture_path = os.path.join(fixtures_dir, fixture)
+        if not os.path.exists(fixture_path):
+            started = time.perf_counter()
+            info = generate_export(fixture_path, followers=size, following=following, shards=shards,
+                                   media_mb=args.media_mb)
+            print(f"{fixture}: {info['size'] / 1024 / 1024:.1f} MB üretildi "
+                  f"({time.perf_counter() - started:.1f} s)", file=sys.stderr)
+
+        for scenario in args.scenarios:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as runner:
+                row = runner.submit(_run_scenario, fixture_path, scenario, args.parse_workers).result()
+            row["fixture"] = fixture
+            rows.append(row)
+
+    print(_format_table(rows))
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Gerçek kullanıcı verisi olmadan ölçüm yapabilmek için sentetik Instagram dışa aktarım ZIP'i üretir.
+
+Arşiv, manifest.py'deki tüm dosyaları extractors.py'deki beş belge biçimiyle içerir:
+tarihli ana klasör, hesap bilgileri (personal_information.json), parçalı takipçi dosyaları
+(followers_1.json, ...) ve isteğe bağlı medya dolgusu. Büyük belgeler ZIP'e parça parça yazılır; 1M takipçi bellekte tutulmaz.
+
+Kullanım:
+    python -m backend.benchmarks.synthetic_export out.zip --followers 100000 --following 2000 --shards 4
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import time
+import zipfile
+
+from backend.services.manifest import FILE_PATH_PREFIX, PERSONAL_INFORMATION_PATH
+
+USERNAME_ALPHABET = string.ascii_lowercase + string.digits + '._'
+# Medya dolgusu dosya başına boyutu (bayt)
+MEDIA_FILE_SIZE = 4 * 1024 * 1024
+# Belgeleri ZIP'e yazarken kaç öğede bir arabellek boşaltılır
+WRITE_BATCH = 10000
+
+
+def _usernames(rng: random.Random, count: int, taken: set) -> list:
+    """Instagram kurallarına benzer (a-z, 0-9, '.', '_'; 3-30 karakter) benzersiz kullanıcı adları."""
+    usernames = []
+    while len(usernames) < count:
+        username = ''.join(rng.choices(USERNAME_ALPHABET, k=rng.randint(5, 20))).strip('.')
+        if len(username) >= 3 and username not in taken:
+            taken.add(username)
+            usernames.append(username)
+    return usernames
+
+
+def _string_list_data(username: str, timestamp: int) -> dict:
+    return {"href": f"https://www.instagram.com/{username}", "value": username, "timestamp": timestamp}
+
+
+def _title_item(username: str, timestamp: int) -> dict:
+    # SHAPE_TITLE: kullanıcı adı 'title' alanında, string_list_data'da value yok
+    return {"title": username, "media_list_data": [],
+            "string_list_data": [{"href": f"https://www.instagram.com/_u/{username}", "timestamp": timestamp}]}
+
+
+def _value_item(username: str, timestamp: int) -> dict:
+    # SHAPE_TOP_LEVEL_LIST / SHAPE_KEY_AND_VALUE: kullanıcı adı string_list_data[0]['value'] alanında
+    return {"title": "", "media_list_data": [], "string_list_data": [_string_list_data(username, timestamp)]}
+
+
+def _write_json_array(zip_file, member_name: str, items, prefix: str = '', suffix: str = ''):
+    """Öğeleri JSON dizisi olarak ZIP'e akış halinde yazar: prefix + [öğe, ...] + suffix"""
+    with zip_file.open(member_name, 'w', force_zip64=True) as f:
+        f.write(f"{prefix}[".encode('utf-8'))
+        batch = []
+        first = True
+        for item in items:
+            batch.append(json.dumps(item, ensure_ascii=False))
+            if len(batch) >= WRITE_BATCH:
+                f.write((('' if first else ',') + ','.join(batch)).encode('utf-8'))
+                first = False
+                batch = []
+        if batch:
+            f.write((('' if first else ',') + ','.join(batch)).encode('utf-8'))
+        f.write(f"]{suffix}".encode('utf-8'))
+
+
+def generate_export(path: str, followers: int = 1000, following: int = 500, shards: int = 1,
+                    mutual_ratio: float = 0.6, media_mb: int = 0, account: str = 'benchmark_user',
+                    seed: int = 0) -> dict:
+    """
+    Sentetik dışa aktarım ZIP'i yazar ve üretim bilgilerini döndürür.
+    mutual_ratio: takip edilenlerin ne kadarının aynı zamanda takipçi olduğu.
+    media_mb: arşive eklenecek sıkıştırılmamış medya dolgusu (analizde okunmaz; uzak okuma/indirme farkını gösterir).
+    """
+    rng = random.Random(seed)
+    taken = set()
+    follower_names = _usernames(rng, followers, taken)
+    mutual_count = min(int(following * mutual_ratio), followers)
+    following_names = rng.sample(follower_names, mutual_count) + _usernames(rng, following - mutual_count, taken)
+    rng.shuffle(following_names)
+    others = _usernames(rng, 60, taken)
+
+    now = int(time.time())
+    # Dosyalarda en yeni kayıt en üstte; takipçiler son ~3 yıla dağılır
+    follower_times = sorted((now - rng.randint(0, 3 * 365 * 86400) for _ in follower_names), reverse=True)
+    root = f"instagram-{account}-{time.strftime('%Y-%m-%d', time.gmtime(now))}-{rng.randint(0, 99999):05d}/"
+    prefix = root + FILE_PATH_PREFIX
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        # SHAPE_TOP_LEVEL_LIST: followers_N.json (belgenin kendisi liste)
+        shard_size = max(1, -(-followers // max(shards, 1)))
+        for shard in range(max(shards, 1)):
+            start = shard * shard_size
+            _write_json_array(zip_file, f"{prefix}followers_{shard + 1}.json",
+                              (_value_item(follower_names[i], follower_times[i])
+                               for i in range(start, min(followers, start + shard_size))))
+
+        # SHAPE_TITLE
+        _write_json_array(zip_file, prefix + 'following.json',
+                          (_title_item(username, now - rng.randint(0, 3 * 365 * 86400)) for username in following_names),
+                          prefix='{"relationships_following":', suffix='}')
+        _write_json_array(zip_file, prefix + 'blocked_profiles.json',
+                          (_title_item(username, now) for username in others[0:5]),
+                          prefix='{"relationships_blocked_users":', suffix='}')
+
+        # SHAPE_KEY_AND_VALUE
+        for file_name, key, users in (
+                ('recently_unfollowed_profiles.json', 'relationships_unfollowed_users', others[5:25]),
+                ('recent_follow_requests.json', 'relationships_permanent_follow_requests', others[25:35]),
+                ('hide_story_from.json', 'relationships_hide_stories_from', others[35:40]),
+                ('pending_follow_requests.json', 'relationships_follow_requests_sent', others[40:50])):
+            _write_json_array(zip_file, prefix + file_name, (_value_item(username, now) for username in users),
+                              prefix=f'{{"{key}":', suffix='}')
+
+        # SHAPE_VALUE: üst seviye string_list_data
+        _write_json_array(zip_file, prefix + "follow_requests_you've_received.json",
+                          (_string_list_data(username, now) for username in others[50:55]),
+                          prefix='{"string_list_data":', suffix='}')
+
+        # SHAPE_EMBEDDED_LIST: kullanıcılar ilk elemanın string_list_data alanında
+        restricted = {"relationships_restricted_users": [
+            {"title": "", "string_list_data": [_string_list_data(username, now) for username in others[55:60]]}]}
+        zip_file.writestr(prefix + 'restricted_profiles.json', json.dumps(restricted))
+
+        # Hesap bilgileri: anlık görüntüler bu kullanıcı adına kaydedilir
+        personal_information = {"profile_user": [{"media_map_data": {}, "string_map_data": {
+            "Username": {"href": "", "value": account, "timestamp": 0},
+            "Name": {"href": "", "value": account.title(), "timestamp": 0}}}]}
+        zip_file.writestr(root + PERSONAL_INFORMATION_PATH, json.dumps(personal_information))
+
+        # Analizin okumadığı medya dolgusu (zaten sıkıştırılmış veri gibi davranması için rastgele bayt)
+        remaining = media_mb * 1024 * 1024
+        index = 0
+        while remaining > 0:
+            size = min(MEDIA_FILE_SIZE, remaining)
+            zip_file.writestr(zipfile.ZipInfo(f"{root}media/posts/{index:05d}.jpg"), os.urandom(size),
+                              compress_type=zipfile.ZIP_STORED)
+            remaining -= size
+            index += 1
+
+    return {"path": path, "size": os.path.getsize(path), "followers": followers, "following": following,
+            "shards": max(shards, 1), "mutual": mutual_count, "media_mb": media_mb}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik Instagram dışa aktarım ZIP'i üretir.")
+    parser.add_argument('path')
+    parser.add_argument('--followers', type=int, default=1000)
+    parser.add_argument('--following', type=int, default=500)
+    parser.add_argument('--shards', type=int, default=1)
+    parser.add_argument('--mutual-ratio', type=float, default=0.6)
+    parser.add_argument('--media-mb', type=int, default=0)
+    parser.add_argument('--account', default='benchmark_user')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    info = generate_export(args.path, followers=args.followers, following=args.following, shards=args.shards,
+                           mutual_ratio=args.mutual_ratio, media_mb=args.media_mb, account=args.account,
+                           seed=args.seed)
+    print(json.dumps(info))
+
+
+if __name__ == '__main__':
+    main()
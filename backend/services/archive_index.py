@@ -0,0 +1,84 @@
+import re
+import unicodedata
+from fnmatch import fnmatchcase
+
+# Bu karakterleri içeren manifest yolları desen olarak (örn. 'followers_[0-9]*.json') çözülür
+_PATTERN_CHARS = '*?['
+
+
+def normalize_member_path(path: str) -> str:
+    """
+    Arşiv içi yolu karşılaştırılabilir hale getirir:
+    ters eğik çizgi -> '/', baştaki './' ve '/' temizlenir, Unicode NFC + büyük/küçük harf katlama.
+    """
+    path = path.replace('\\', '/')
+    while path.startswith('./'):
+        path = path[2:]
+    path = path.lstrip('/')
+    return unicodedata.normalize('NFC', path).casefold()
+
+
+def _natural_sort_key(name: str) -> list:
+    """'followers_10.json' 'followers_2.json'dan sonra gelsin diye sayıları sayı olarak karşılaştırır."""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name.casefold())]
+
+
+class ArchiveIndex:
+    """
+    ZIP merkez dizininden (namelist) tek geçişte oluşturulan yol indeksi.
+    Mantıksal yollar (örn. 'connections/followers_and_following/following.json')
+    büyük/küçük harf ve tarihli ana klasörden bağımsız olarak O(1) çözülür.
+    """
+
+    def __init__(self, member_names):
+        self._members = {}
+        # Klasör anahtarı -> [(dosya adı anahtarı, gerçek öğe adı)]; desen eşleştirme için
+        self._directories = {}
+        self.root_dir = None
+
+        file_names = [name for name in member_names if not name.endswith('/')]
+        self.member_count = len(file_names)
+
+        # 1. Doğrudan yollar (öncelikli)
+        for name in file_names:
+            self._add(normalize_member_path(name), name)
+
+        # 2. Tüm dosyalar tek bir (tarihli) ana klasör altındaysa, o klasör atılmış hali
+        root_dirs = {name.replace('\\', '/').split('/', 1)[0] for name in file_names}
+        if len(root_dirs) == 1 and all('/' in name.replace('\\', '/') for name in file_names):
+            self.root_dir = root_dirs.pop()
+            prefix_length = len(self.root_dir) + 1
+            for name in file_names:
+                stripped = name.replace('\\', '/')[prefix_length:]
+                self._add(normalize_member_path(stripped), name)
+
+    def _add(self, key: str, name: str):
+        if key in self._members:
+            return
+        self._members[key] = name
+        directory, _, base_name = key.rpartition('/')
+        self._directories.setdefault(directory, []).append((base_name, name))
+
+    def resolve(self, relative_path: str):
+        """Mantıksal yola karşılık gelen gerçek arşiv öğe adını döndürür, yoksa None."""
+        return self._members.get(normalize_member_path(relative_path))
+
+    def resolve_members(self, relative_path: str) -> list:
+        """
+        Mantıksal yolu arşiv öğe adlarının listesine çözer. Yol bir desen içeriyorsa
+        (örn. parçalı 'followers_[0-9]*.json') aynı klasördeki tüm eşleşmeler doğal sırayla döner.
+        """
+        if not any(char in relative_path for char in _PATTERN_CHARS):
+            member_name = self.resolve(relative_path)
+            return [member_name] if member_name else []
+
+        directory, _, pattern = normalize_member_path(relative_path).rpartition('/')
+        matches = [name for base_name, name in self._directories.get(directory, [])
+                   if fnmatchcase(base_name, pattern)]
+        return sorted(matches, key=_natural_sort_key)
+
+    def __contains__(self, relative_path: str) -> bool:
+        return self.resolve(relative_path) is not None
+
+    def __len__(self) -> int:
+        return self.member_count
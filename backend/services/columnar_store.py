@@ -0,0 +1,163 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from .username_store import ID_DTYPE
+
+# Ayrıştırılmış ilişkilerin sütunlu olarak saklandığı dizin
+COLUMNAR_STORE_DIR = os.environ.get(
+    'COLUMNAR_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'columnar'))
+# Diskte tutulacak en fazla arşiv sayısı (aşılınca en eski kullanılan silinir)
+COLUMNAR_STORE_MAX_ARCHIVES = int(os.environ.get('COLUMNAR_STORE_MAX_ARCHIVES', 64))
+# Yazılmasının üzerinden bu kadar saniye geçen arşiv verisi okunmaz ve silinir (0: süre sınırı yok)
+COLUMNAR_STORE_MAX_AGE_SECONDS = int(os.environ.get('COLUMNAR_STORE_MAX_AGE_SECONDS', 7 * 24 * 60 * 60))
+
+# Dosya düzeni değiştiğinde artırılır; eski dizinler okunmaz ve zamanla silinir
+COLUMNAR_FORMAT_VERSION = 1
+
+
+class ColumnarRelations:
+    """
+    Bir arşivden ayrıştırılmış ilişkilerin bellek eşlemeli (mmap) görünümü.
+    vocabulary: sıralı kullanıcı adları (kimlik = listedeki konum, bkz. UsernameStore)
+    ids(key) / timestamps(key): ilişkinin dosya sırasındaki kimlikleri ve zaman damgaları
+    Eşlemeler load() sırasında açılır; dizin sonradan budansa da açık eşlemeler okunabilir kalır.
+    """
+
+    def __init__(self, vocabulary: list, ids: dict, timestamps: dict):
+        self.vocabulary = vocabulary
+        self.keys = sorted(ids)
+        self._ids = ids
+        self._timestamps = timestamps
+
+    def ids(self, key: str) -> np.ndarray:
+        return self._ids[key]
+
+    def timestamps(self, key: str) -> np.ndarray:
+        return self._timestamps[key]
+
+
+class ColumnarStore:
+    """
+    Ayrıştırılmış dışa aktarım verisini arşiv parmak izine göre diskte sütunlu tutar.
+    Her arşiv için bir dizin: kullanıcı adı sözlüğü (UTF-8 bayt + ofsetler) ve her ilişki için
+    int32 kimlik ve int64 zaman damgası .npy dosyaları. Aynı arşivin sonraki analizleri
+    JSON'u yeniden ayrıştırmak yerine bu dosyaları bellek eşlemeyle okur.
+    """
+
+    def __init__(self, root: str = COLUMNAR_STORE_DIR, max_archives: int = COLUMNAR_STORE_MAX_ARCHIVES,
+                 max_age: int = COLUMNAR_STORE_MAX_AGE_SECONDS):
+        self.root = root
+        self.max_archives = max_archives
+        self.max_age = max_age
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, fingerprint: str) -> str:
+        # 'archive:<sha256>' -> 'v1-<sha256>'
+        return os.path.join(self.root, f"v{COLUMNAR_FORMAT_VERSION}-{fingerprint.split(':', 1)[-1]}")
+
+    def _expired(self, meta: dict) -> bool:
+        return bool(self.max_age) and time.time() - meta.get("created_at", 0) > self.max_age
+
+    def _read_meta(self, path: str):
+        """Dizinin meta.json'u; yoksa, okunamıyorsa ya da süresi dolmuşsa None."""
+        try:
+            with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return None if self._expired(meta) else meta
+
+    def contains(self, fingerprint: str) -> bool:
+        """Arşivin (süresi dolmamış) sütunlu verisi diskte var mı (sütunları okumadan)."""
+        return self._read_meta(self._path(fingerprint)) is not None
+
+    def load(self, fingerprint: str):
+        """
+        Arşivin sütunlu verisi varsa ColumnarRelations, yoksa None döndürür.
+        Okuma sırasında başka bir işçi dizini budarsa ya da dosyalar eksikse önbellek ıskası sayılır;
+        süresi dolmuş veri silinir.
+        """
+        path = self._path(fingerprint)
+        meta = self._read_meta(path)
+        if meta is None:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            return None
+
+        try:
+            names = np.load(os.path.join(path, 'vocabulary.bin.npy'))
+            offsets = np.load(os.path.join(path, 'vocabulary.offsets.npy'))
+            ids = {key: np.load(os.path.join(path, f"{key}.ids.npy"), mmap_mode='r') for key in meta["keys"]}
+            timestamps = {key: np.load(os.path.join(path, f"{key}.timestamps.npy"), mmap_mode='r')
+                          for key in meta["keys"]}
+            # Erişim zamanı budama sırasını belirler
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        data = names.tobytes()
+        bounds = offsets.tolist()
+        vocabulary = [data[start:end].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+        return ColumnarRelations(vocabulary, ids, timestamps)
+
+    def save(self, fingerprint: str, vocabulary: list, relations: dict):
+        """
+        relations: anahtar -> (dosya sırasındaki kimlik dizisi, zaman damgası dizisi)
+        Dosyalar geçici bir dizine yazılır ve tek adımda yerine taşınır; yarım kayıt okunmaz.
+        """
+        path = self._path(fingerprint)
+        if self._read_meta(path) is not None:
+            return
+        # Süresi dolmuş eski kayıt yenisiyle değiştirilir
+        shutil.rmtree(path, ignore_errors=True)
+
+        tmp_path = tempfile.mkdtemp(dir=self.root, prefix='.tmp-')
+        try:
+            encoded = [username.encode('utf-8') for username in vocabulary]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(name) for name in encoded], out=offsets[1:])
+            np.save(os.path.join(tmp_path, 'vocabulary.bin.npy'), np.frombuffer(b''.join(encoded), dtype=np.uint8))
+            np.save(os.path.join(tmp_path, 'vocabulary.offsets.npy'), offsets)
+
+            for key, (ids, timestamps) in relations.items():
+                np.save(os.path.join(tmp_path, f"{key}.ids.npy"), np.asarray(ids, dtype=ID_DTYPE))
+                np.save(os.path.join(tmp_path, f"{key}.timestamps.npy"), np.asarray(timestamps, dtype=np.int64))
+
+            with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump({"format": COLUMNAR_FORMAT_VERSION, "keys": sorted(relations),
+                           "created_at": time.time()}, f)
+
+            os.rename(tmp_path, path)
+        except OSError:
+            # Başka bir işçi aynı arşivi önce yazmış olabilir
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+        self.prune()
+
+    def prune(self):
+        """Süresi dolmuş ve max_archives'ı aşan en eski kullanılmış arşiv dizinlerini siler."""
+        entries = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            if self._read_meta(path) is None:
+                # Süresi dolmuş (dizinler tek adımda taşındığı için meta.json'suz dizin de bozuktur)
+                shutil.rmtree(path, ignore_errors=True)
+                continue
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                # Başka bir işçi bu arada sildi
+                continue
+
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_archives:]:
+            shutil.rmtree(path, ignore_errors=True)
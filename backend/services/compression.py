@@ -0,0 +1,115 @@
+import gzip
+import hashlib
+import os
+import threading
+
+from cachetools import LRUCache
+
+try:
+    import brotli
+except ImportError:  # Opsiyonel: kurulu değilse br sunulmaz
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Opsiyonel: kurulu değilse zstd sunulmaz
+    zstandard = None
+
+# Bu boyuttan (bayt) küçük yanıtlar sıkıştırılmaz; başlık maliyeti kazançtan büyük olur
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', 1024))
+# Önceden sıkıştırılmış gövdeler için ayrılan en fazla bellek (bayt)
+COMPRESSION_CACHE_MAX_BYTES = int(os.environ.get('COMPRESSION_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+# Sıkıştırılacak içerik tipleri (görseller ve zip zaten sıkıştırılmış)
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/plain', 'text/html'}
+
+# Mobil istemcilerde CPU da önemli; orta seviye ayarlar boyut/hız dengesini korur
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 6
+
+
+def _gzip(body: bytes) -> bytes:
+    # mtime=0: aynı gövde her zaman aynı baytları üretir
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=BROTLI_QUALITY)
+
+
+def _zstd(body: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+
+
+def available_encoders() -> dict:
+    """Kurulu kütüphanelere göre kodlama -> sıkıştırma fonksiyonu (tercih sırasıyla)."""
+    encoders = {}
+    if brotli is not None:
+        encoders['br'] = _brotli
+    if zstandard is not None:
+        encoders['zstd'] = _zstd
+    encoders['gzip'] = _gzip
+    return encoders
+
+
+class ResponseCompressor:
+    """
+    Flask yanıtlarını Accept-Encoding başlığına göre sıkıştırır (after_request içinde çağrılır).
+    Aynı sonucun tekrar istenmesinde gövde yeniden sıkıştırılmaz; sıkıştırılmış gövdeler
+    içerik özeti + kodlama anahtarıyla bayt sınırlı bir LRU önbellekte tutulur.
+    Akış yanıtları (SSE) olduğu gibi bırakılır.
+    """
+
+    def __init__(self, min_size: int = COMPRESSION_MIN_BYTES,
+                 cache_max_bytes: int = COMPRESSION_CACHE_MAX_BYTES, encoders: dict = None):
+        self.min_size = min_size
+        self.encoders = encoders if encoders is not None else available_encoders()
+        self._cache = LRUCache(maxsize=cache_max_bytes, getsizeof=len)
+        self._lock = threading.Lock()
+
+    def _compressed_body(self, body: bytes, encoding: str) -> bytes:
+        key = (hashlib.sha256(body).digest(), encoding)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        compressed = self.encoders[encoding](body)
+        with self._lock:
+            try:
+                self._cache[key] = compressed
+            except ValueError:
+                # Tek başına önbellekten büyük gövde; önbelleğe alınmadan döndürülür
+                pass
+        return compressed
+
+    def compress(self, response, accept_encodings):
+        """
+        Yanıtı uygunsa istemcinin kabul ettiği en iyi kodlamayla sıkıştırır.
+        accept_encodings: request.accept_encodings (q=0 ile reddedilen kodlamalar seçilmez)
+        """
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        # Aynı URL farklı kodlamalarla dönebilir; ara önbellekler bunu bilmeli
+        response.vary.add('Accept-Encoding')
+
+        encoding = accept_encodings.best_match(list(self.encoders))
+        if encoding is None:
+            return response
+
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+
+        compressed = self._compressed_body(body, encoding)
+        if len(compressed) >= len(body):
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
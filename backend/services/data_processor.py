@@ -1,272 +1,478 @@
+import json
+import logging
 import requests
 import os
 import shutil
-import json
+import time
+import io
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from zipfile import ZipFile
+from .archive_index import ArchiveIndex
+from .downloader import ParallelDownloader
+from .extractors import (ExtractedRelation, extract_account_username, extract_relation_from_member,
+                         extract_relation_from_stream)
+from .instrumentation import PHASE_CLEANUP, PHASE_COLUMNAR_LOAD, PHASE_PARSE, PhaseRecorder, instrumented
+from .manifest import DEFAULT_ANALYSIS, PERSONAL_INFORMATION_PATH, RELATION_SPECS, required_members
+from .progress import PHASE_ANALYSIS, PHASE_DOWNLOAD, PHASE_EXTRACT, PHASE_REMOTE_READ
+from .remote_zip import HttpRangeFile, RangeRequestsNotSupported, member_byte_range
+from .result_cache import archive_fingerprint
+from .scratch import ScratchManager, ScratchSpaceFull, default_scratch
+from .structured_logging import redact_url
+from .timeline import FollowerTimeline
+from .username_store import UsernameStore
+
+# Parçalı takipçi dosyalarını (followers_N.json) aynı anda ayrıştıracak iş parçacığı sayısı
+SHARD_PARSE_WORKERS = int(os.environ.get('SHARD_PARSE_WORKERS', 4))
+
+# Yeni takipçi sayısı raporlanan zaman pencereleri (gün) ve haftalık takip hızı için hafta sayısı
+NEW_FOLLOWER_WINDOWS_DAYS = (7, 30)
+FOLLOWER_VELOCITY_WEEKS = 12
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_DIR = os.path.join(BASE_DIR, 'data')
+# Bu boyuta kadar olan dışa aktarımlar diske yazılmadan bellekte indirilir ve ZIP oradan okunur (bayt)
+DOWNLOAD_SPOOL_MAX_BYTES = int(os.environ.get('DOWNLOAD_SPOOL_MAX_BYTES', 32 * 1024 * 1024))
 
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
+logger = logging.getLogger(__name__)
 
 class DataProcessor:
-    def __init__(self, download_url: str, username: str = "user"):
+    def __init__(self, download_url: str, username: str = "user", stream_mode: bool = True,
+                 analyses=(DEFAULT_ANALYSIS,), progress_callback=None, columnar_store=None,
+                 parse_executor=None, instrumentation: PhaseRecorder = None,
+                 scratch_manager: ScratchManager = None):
         self.download_url = download_url
         self.username = username
-        self.zip_filename = f"{self.username}_instagram_data.zip"
-        self.zip_path = os.path.join(DATA_DIR, self.zip_filename)
-        self.extraction_path = os.path.join(DATA_DIR, f"{self.username}_extracted_data")
+        # Her işin kendine ait geçici klasörü: aynı kullanıcı adıyla (örn. varsayılan "user")
+        # eşzamanlı çalışan işler birbirinin ZIP'ini ezemez ya da klasörünü silemez.
+        # Kullanıcı adı yola girmez; klasör nesne çöpe gidince ya da süreç kapanırken de silinir.
+        # Klasör geçici alan kotasından ayrılır (bkz. scratch.py); yer yoksa ScratchSpaceFull.
+        self.scratch = (scratch_manager if scratch_manager is not None else default_scratch).allocate()
+        self.scratch_dir = self.scratch.path
+        self._remove_scratch = weakref.finalize(self, self.scratch.release)
+        self.zip_filename = "instagram_data.zip"
+        self.zip_path = os.path.join(self.scratch_dir, self.zip_filename)
+        self.extraction_path = os.path.join(self.scratch_dir, "extracted_data")
+        # Tüm kayıtlar hesap adıyla (account alanı) yazılır
+        self.log = logging.LoggerAdapter(logger, {"account": self.username})
+
+        # stream_mode=True iken ZIP diske çıkarılmaz; JSON dosyaları doğrudan arşivden okunur.
+        self.stream_mode = stream_mode
+        self._zip_ref = None
+        # Küçük dosyalar için bellek içi indirme tamponu (SpooledTemporaryFile); None ise ZIP zip_path'te
+        self._download_buffer = None
+        # Uzak ZIP (HTTP Range) modunda ZipFile'ın okuduğu dosya nesnesi
+        self._remote_file = None
+        # ZIP merkez dizininden oluşturulan yol indeksi (bkz. archive_index.py)
+        self._index = None
+        # Gerekli öğelerin içerik parmak izi (sonuç önbelleği anahtarı, bkz. result_cache.py)
+        self.fingerprint = None
+        # Sunucunun bildirdiği ETag ve dosya boyutu (indirmeden önce önbellek kontrolü için)
+        self.remote_etag = None
+        self.remote_size = None
+
+        # Çalıştırılacak analizlerin ihtiyaç duyduğu arşiv öğeleri (veri anahtarı -> göreli yol)
+        self.manifest = required_members(analyses)
+        # Okunan tüm öğeler: manifest + hesap bilgileri (bkz. read_account); parmak izi hepsinden üretilir
+        self.member_paths = {**self.manifest, 'account': PERSONAL_INFORMATION_PATH}
+
+        # İlerleme bildirimi: progress_callback(phase, force=False, **alanlar) (bkz. progress.py)
+        self.progress_callback = progress_callback
+
+        # Ayrıştırılmış ilişkilerin arşiv parmak izine göre saklandığı sütunlu depo (bkz. columnar_store.py)
+        self.columnar_store = columnar_store
+        # Verilirse diskteki arşivlerin JSON ayrıştırması bu havuzda (örn. AnalysisExecutor.parse_pool) yapılır
+        self.parse_executor = parse_executor
+        # Aşama başına süre / CPU / bayt / bellek ölçümleri (bkz. instrumentation.py)
+        self.instrumentation = instrumentation if instrumentation is not None else PhaseRecorder()
         
         self.analysis_results = {}
+        # run_analysis'in kurduğu kullanıcı adı sözlüğü (bkz. username_store.py)
+        self.username_store = None
+        # Takipçi zaman damgaları üzerinde pencere sorguları (bkz. timeline.py)
+        self.follower_timeline = None
+
+    def _report_progress(self, phase: str, force: bool = False, **fields):
+        if self.progress_callback is not None:
+            self.progress_callback(phase, force=force, **fields)
 
+    @instrumented(PHASE_DOWNLOAD)
     def download_file(self) -> bool:
 
-        print(f"[{self.username}]: İndirme işlemi başlatılıyor: {self.download_url[:50]}...")
+        # İmzalı linkin sorgu kısmı (belirteçler) günlüğe yazılmaz
+        self.log.debug("İndirme işlemi başlatılıyor: %s", redact_url(self.download_url))
         
-        # 4 MB (1024 * 4) bloklar halinde indirme
-        chunk_size = 1024 * 4
+        self._report_progress(PHASE_DOWNLOAD, downloaded_bytes=0)
+
+        # Dosya bayt aralıklarına bölünüp birden fazla bağlantıyla indirilir (bkz. downloader.py)
+        downloader = ParallelDownloader(
+            self.download_url, self.zip_path,
+            on_progress=lambda downloaded, total: self._report_progress(
+                PHASE_DOWNLOAD, downloaded_bytes=downloaded, total_bytes=total),
+            reserve_space=self.scratch.reserve,
+            spool_max_bytes=DOWNLOAD_SPOOL_MAX_BYTES,
+        )
         try:
-            # stream=True ile büyük dosyaları bellek dostu bir şekilde indiriyoruz
-            with requests.get(self.download_url, stream=True) as r:
-                r.raise_for_status() # HTTP hatalarını yakalar (4xx veya 5xx)
-                
-                # İndirilecek dosya boyutunu al (opsiyonel)
-                total_size = int(r.headers.get('content-length', 0))
-                downloaded_size = 0
-                
-                with open(self.zip_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=chunk_size): 
-                        if chunk: # boş chunk'ları filtrele
-                            f.write(chunk)
-                            downloaded_size += len(chunk)
-                            # İlerleme çubuğu simülasyonu için log (opsiyonel)
-                            # print(f"İndiriliyor: {downloaded_size / total_size * 100:.2f}%", end='\r')
-                            
-            print(f"[{self.username}]: Dosya başarıyla indirildi: {self.zip_path}")
+            total_size = downloader.download()
+            self._download_buffer = downloader.buffer
+            # Bellek içi indirmede diske yazılan bayt yok
+            self.instrumentation.add_bytes(bytes_in=total_size,
+                                           bytes_out=0 if self._download_buffer is not None else total_size)
+            self._report_progress(PHASE_DOWNLOAD, force=True, downloaded_bytes=total_size, total_bytes=total_size)
+            self.log.info("Dosya başarıyla indirildi (%d bayt): %s", total_size,
+                          'bellek' if self._download_buffer is not None else self.zip_path)
             return True
             
+        except ScratchSpaceFull:
+            # Ağ hatası değil; çağıran taraf 429 ile yanıt verir
+            raise
         except requests.exceptions.RequestException as e:
-            print(f"[{self.username}]: İndirme sırasında ağ hatası oluştu: {e}")
+            self.log.warning("İndirme sırasında ağ hatası oluştu: %s", e)
+            return False
+        except Exception as e:
+            self.log.exception("Beklenmedik hata: %s", e)
+            return False
+        finally:
+            # Hata durumunda da tampon cleanup'ta kapatılsın
+            self._download_buffer = downloader.buffer
+            downloader.close()
+
+    def _archive_source(self):
+        """ZipFile'a verilecek kaynak: bellek içi tampon (kopyalanmadan) ya da indirilen dosyanın yolu."""
+        return self._download_buffer if self._download_buffer is not None else self.zip_path
+
+    def open_archive(self) -> bool:
+        """
+        ZIP dosyasını diske çıkarmadan okumak üzere açar.
+        Fotoğraf/video gibi büyük medya dosyalarına hiç dokunulmaz.
+        """
+        self.log.debug("ZIP dosyası akış modunda açılıyor...")
+        self.close_archive()
+
+        try:
+            self._zip_ref = ZipFile(self._archive_source(), 'r')
+            self._build_index(self._zip_ref)
+            self.log.info("ZIP dosyası açıldı (%d öğe).", len(self._index))
+            return True
+
+        except FileNotFoundError:
+            self.log.error("ZIP dosyası bulunamadı: %s", self.zip_path)
             return False
         except Exception as e:
-            print(f"[{self.username}]: Beklenmedik hata: {e}")
+            self.log.exception("ZIP açılırken beklenmedik hata: %s", e)
             return False
 
+    @instrumented(PHASE_REMOTE_READ)
+    def open_remote_archive(self) -> bool:
+        """
+        ZIP'i indirmeden, HTTP Range istekleriyle açar: önce merkez dizin, sonra yalnızca
+        manifest'teki öğelerin baytları indirilir. Sunucu Range desteklemiyorsa False döner
+        ve çağıran taraf tam indirmeye (download_file) geçer.
+        """
+        if not self.stream_mode:
+            return False
+
+        self.log.debug("Uzak ZIP okuma (HTTP Range) deneniyor...")
+        self._report_progress(PHASE_REMOTE_READ, downloaded_bytes=0)
+        self.close_archive()
+
+        try:
+            self._remote_file = HttpRangeFile(self.download_url)
+            self.remote_etag, self.remote_size = self._remote_file.etag, self._remote_file.size
+            self._zip_ref = ZipFile(self._remote_file, 'r')
+            self._build_index(self._zip_ref)
+            self.instrumentation.add_bytes(bytes_in=self._remote_file.bytes_fetched)
+
+            # Öğe verileri henüz indirilmedi; önbellekte sonuç yoksa run_analysis getirir
+            self.log.info("Uzak ZIP merkez dizini okundu: %d baytlık arşivden %d bayt, %d istekte.",
+                          self._remote_file.size, self._remote_file.bytes_fetched, self._remote_file.request_count)
+            return True
+
+        except RangeRequestsNotSupported as e:
+            self.remote_etag = e.headers.get('ETag')
+            self.remote_size = e.headers.get('Content-Length')
+            self.log.info("Sunucu Range isteklerini desteklemiyor (%s), tam indirmeye geçiliyor.", e)
+        except requests.exceptions.RequestException as e:
+            self.log.warning("Uzak ZIP okunurken ağ hatası oluştu: %s", e)
+        except Exception as e:
+            self.log.exception("Uzak ZIP açılırken beklenmedik hata: %s", e)
+
+        self.close_archive()
+        return False
+
+    @instrumented(PHASE_REMOTE_READ)
+    def _prefetch_remote_members(self, member_names: list = None):
+        """Uzak ZIP modunda gerekli öğeleri (verilmezse hepsini) birleştirilmiş aralıklarla tek seferde getirir."""
+        if self._remote_file is None:
+            return
+
+        if member_names is None:
+            member_names = self._manifest_member_names()
+        member_ranges = [member_byte_range(self._zip_ref.getinfo(member_name)) for member_name in member_names]
+        fetched_before = self._remote_file.bytes_fetched
+        self._remote_file.prefetch(member_ranges)
+        self.instrumentation.add_bytes(bytes_in=self._remote_file.bytes_fetched - fetched_before)
+
+        self._report_progress(PHASE_REMOTE_READ, force=True, downloaded_bytes=self._remote_file.bytes_fetched,
+                              total_bytes=self._remote_file.size)
+        self.log.info("Gerekli öğeler indirildi: toplam %d bayt, %d istek.",
+                      self._remote_file.bytes_fetched, self._remote_file.request_count)
+
+    def fetch_remote_members(self) -> bool:
+        """
+        Uzak ZIP modunda gerekli öğeleri (hesap bilgileri dahil) tek toplu Range isteğiyle getirir.
+        Dosya açılıştan sonra değiştiyse (Content-Range tutmuyor) arşiv kapatılır ve False döner;
+        çağıran taraf tam indirmeye (download_file) geçer. Uzak modda değilse bir şey yapmaz.
+        """
+        if self._remote_file is None:
+            return True
+
+        member_names = None
+        if self.columnar_store is not None and self.fingerprint is not None \
+                and self.columnar_store.contains(self.fingerprint):
+            # İlişkiler sütunlu depodan okunacak; JSON öğeleri yerine yalnızca hesap bilgileri gerekir
+            member_names = self._index.resolve_members(PERSONAL_INFORMATION_PATH)
+        try:
+            self._prefetch_remote_members(member_names)
+            return True
+        except RangeRequestsNotSupported as e:
+            self.log.warning("Uzak arşiv okuma sırasında değişti (%s), tam indirmeye geçiliyor.", e)
+        except requests.exceptions.RequestException as e:
+            self.log.warning("Gerekli öğeler indirilirken ağ hatası oluştu (%s), tam indirmeye geçiliyor.", e)
+        # Açılışta görülen sürüme ait bilgiler yeni indirilecek dosyaya uygulanmamalı
+        self.close_archive()
+        self._index = None
+        self.fingerprint = None
+        self.remote_etag = self.remote_size = None
+        return False
+
+    def _manifest_member_names(self) -> list:
+        """Okunan tüm yolların (parçalı dosyalar ve hesap bilgileri dahil) arşivdeki gerçek öğe adları."""
+        return [member_name
+                for relative_path in self.member_paths.values()
+                for member_name in self._index.resolve_members(relative_path)]
+
+    def _build_index(self, zip_ref):
+        """Arşiv indeksini ve gerekli öğelerin içerik parmak izini merkez dizinden oluşturur."""
+        self._index = ArchiveIndex(zip_ref.namelist())
+        self.fingerprint = archive_fingerprint(zip_ref, self._index, self.member_paths)
+
+    def close_archive(self):
+        """Akış modunda açık tutulan ZIP dosyasını kapatır."""
+        if self._zip_ref is not None:
+            self._zip_ref.close()
+            self._zip_ref = None
+        if self._remote_file is not None:
+            self._remote_file.close()
+            self._remote_file = None
+
+    @instrumented(PHASE_EXTRACT)
     def unzip_and_extract(self) -> bool:
 
-        print(f"[{self.username}]: ZIP dosyasını açma işlemi başlatılıyor...")
-        # Daha önce açılmış klasör varsa temizle (önemli)
+        self._report_progress(PHASE_EXTRACT)
+
+        # Akış modunda dosyalar diske çıkarılmaz, arşiv sadece açılır
+        if self.stream_mode:
+            return self.open_archive()
+
+        self.log.debug("ZIP dosyasını açma işlemi başlatılıyor...")
+        # Bu işte daha önce açılmış klasör varsa temizle
         if os.path.exists(self.extraction_path):
             shutil.rmtree(self.extraction_path)
-            print(f"[{self.username}]: Eski ayıklama klasörü temizlendi.")
+            self.log.debug("Eski ayıklama klasörü temizlendi.")
 
         try:
-            with ZipFile(self.zip_path, 'r') as zip_ref:
-                # Dosyaları extraction_path dizinine çıkar
-                zip_ref.extractall(self.extraction_path)
+            with ZipFile(self._archive_source(), 'r') as zip_ref:
+                # Sadece manifest'te listelenen dosyaları extraction_path dizinine çıkar
+                self._build_index(zip_ref)
+                member_names = self._manifest_member_names()
+                self.scratch.reserve(sum(zip_ref.getinfo(member_name).file_size for member_name in member_names))
+                for member_name in member_names:
+                    zip_ref.extract(member_name, self.extraction_path)
+                    info = zip_ref.getinfo(member_name)
+                    self.instrumentation.add_bytes(bytes_in=info.compress_size, bytes_out=info.file_size)
             
-            print(f"[{self.username}]: ZIP dosyası başarıyla açıldı: {self.extraction_path}")
+            self.log.info("ZIP dosyası başarıyla açıldı (%d dosya): %s", len(member_names), self.extraction_path)
             return True
 
         except FileNotFoundError:
-            print(f"[{self.username}]: Hata: ZIP dosyası bulunamadı: {self.zip_path}")
+            self.log.error("ZIP dosyası bulunamadı: %s", self.zip_path)
             return False
+        except ScratchSpaceFull:
+            raise
         except Exception as e:
-            print(f"[{self.username}]: Ayıklama sırasında beklenmedik hata: {e}")
+            self.log.exception("Ayıklama sırasında beklenmedik hata: %s", e)
             return False
 
-    def _load_json_data(self, relative_path: str) -> list:
-
-        # 1. Doğrudan Yolu Dene (connections/followers_and_following/...)
-        full_path = os.path.join(self.extraction_path, relative_path)
-        found_path = None
-
-        if os.path.exists(full_path):
-            found_path = full_path
-
-        # 2. Esnek Yolu Dene (Tarihli ana klasör)
-        if not found_path:
-            content_list = os.listdir(self.extraction_path)
-            sub_dirs = [d for d in content_list if os.path.isdir(os.path.join(self.extraction_path, d))]
-
-            if len(sub_dirs) == 1:
-                single_sub_dir = sub_dirs[0]
-                potential_path = os.path.join(self.extraction_path, single_sub_dir, relative_path)
-                
-                if os.path.exists(potential_path):
-                    found_path = potential_path
-                    print(f"[{self.username}]: KRİTİK BAŞARI: Dosya '{single_sub_dir}' alt klasöründe bulundu.")
-                
-        # 3. Klasör Adlarının Duyarlılığını Dene (Örneğin 'Connections' yerine 'connections' olması)
-        # Eğer hala bulunamadıysa, klasör adlarının küçük harfli olduğunu varsayarak dene.
-        if not found_path:
-            parts = relative_path.split('/')
-            lower_case_path = '/'.join([p.lower() for p in parts])
-            lower_case_full_path = os.path.join(self.extraction_path, lower_case_path)
-
-            if os.path.exists(lower_case_full_path):
-                 found_path = lower_case_full_path
-                 print(f"[{self.username}]: KRİTİK BAŞARI: Dosya küçük harfli yolda bulundu: {lower_case_path}")
-
-        if not found_path:
-            print(f"[{self.username}]: Uyarı: Dosya bulunamadı: {relative_path}")
-            return []
-        
-        # 4. JSON Okuma ve Veri Çıkarma (Önceki mantık)
-        try:
-            with open(found_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data
-        except Exception as e:
-            print(f"[{self.username}]: Hata: JSON okunamadı ({found_path}): {e}")
-            return []
+    def _open_member(self, member_name: str):
+        """Akış modunda doğrudan ZIP öğesini, aksi halde çıkarılmış dosyayı ikili kipte açar."""
+        if self._zip_ref is not None:
+            return self._zip_ref.open(member_name)
+        return open(os.path.join(self.extraction_path, member_name), 'rb')
 
-
-    def _extract_users_from_title(self, raw_data, main_key: str) -> set:
-        """Tip 1 Formatı: Veri, main_key altında listedir ve kullanıcı adı 'title' alanındadır."""
-        if main_key in raw_data:
-            data_list = raw_data.get(main_key, [])
-            return {item.get('title') for item in data_list if item.get('title')}
-        return set()
-        
-    def _extract_users_from_value(self, raw_data) -> set:
-        """Tip 2 Formatı: Veri 'string_list_data' altında listelenir ve kullanıcı adı 'value' alanındadır."""
-        if 'string_list_data' in raw_data:
-            data_list = raw_data.get('string_list_data', [])
-            return {item.get('value') for item in data_list if item.get('value')}
-        return set()
-    
-    def _extract_users_from_embedded_list(self, raw_data, main_key: str) -> set:
+    def _extract_member(self, member_name: str, shape: str, main_key: str = None) -> ExtractedRelation:
         """
-        YENİ Tip 3 Formatı: Veri, main_key altında bir listedir ve 
-        kullanıcı adları bu listenin ilk elemanı içindeki 'string_list_data' altındadır.
-        (Örn: accepted_requests)
+        Arşiv öğesini akış halinde ayrıştırıp kullanıcıları çıkarır (bkz. json_stream.py).
+        Belge ağacı belleğe alınmaz; öğeler açıldıkça (decompress) okunur ve işlenir.
         """
-        if main_key in raw_data:
-            outer_list = raw_data.get(main_key, [])
-            if outer_list and isinstance(outer_list, list) and 'string_list_data' in outer_list[0]:
-                data_list = outer_list[0].get('string_list_data', [])
-                return {item.get('value') for item in data_list if item.get('value')}
-        return set()
-    
-    def _extract_users_from_top_level_list(self, raw_data: list) -> set:
+        try:
+            with self._open_member(member_name) as f:
+                return extract_relation_from_stream(io.TextIOWrapper(f, encoding='utf-8'), shape, main_key)
+        except RangeRequestsNotSupported:
+            # Uzak dosya okuma sırasında değişti; eksik ilişkiyle devam etmek sonucu bozar
+            raise
+        except Exception as e:
+            self.log.error("JSON okunamadı (%s): %s", member_name, e)
+            return ExtractedRelation()
+
+    def read_account(self):
         """
-        Tip 4 Formatı: Veri, doğrudan bir üst seviye listedir.
-        Kullanıcı adı her liste öğesinin içindeki string_list_data[0]['value'] alanındadır.
-        (Örn: followers_1.json, recently_unfollowed_profiles.json)
+        Arşivin sahibi olan hesabın kullanıcı adı (personal_information.json); bulunamazsa None.
+        İstemcinin gönderdiği kullanıcı adına güvenilmez; anlık görüntüler bu hesaba kaydedilir.
         """
-        users = set()
-        if isinstance(raw_data, list):
-            for item in raw_data:
-                string_data_list = item.get('string_list_data', [])
-                if string_data_list and isinstance(string_data_list, list):
-                    # Genellikle sadece ilk eleman (index 0) kullanıcı adını içerir
-                    user_value = string_data_list[0].get('value')
-                    if user_value:
-                        users.add(user_value)
-        return users
-
-    def _extract_users_from_key_and_value(self, raw_data: dict, main_key: str) -> set:
+        member_name = self._index.resolve(PERSONAL_INFORMATION_PATH) if self._index is not None else None
+        if member_name is None:
+            self.log.warning("Hesap bilgileri arşivde bulunamadı: %s", PERSONAL_INFORMATION_PATH)
+            return None
+        try:
+            with self._open_member(member_name) as f:
+                return extract_account_username(json.load(f))
+        except Exception as e:
+            self.log.error("Hesap bilgileri okunamadı (%s): %s", member_name, e)
+            return None
+
+    def _member_source(self):
         """
-        Tip 5 Formatı: Veri, main_key altındaki listedir.
-        Kullanıcı adı her liste öğesinin içindeki string_list_data[0]['value'] alanındadır.
-        (Örn: hide_story_from.json, accepted_requests.json, received_requests.json)
+        Ayrıştırma sürecinin öğeyi kendisinin açıp akış halinde okuyacağı kaynak: diskteki ZIP ya da
+        çıkarılmış klasör. Uzak ve bellekteki arşivler için None; onların öğelerini açıp baytlarını
+        sürece kopyalamak akış halinde ayrıştırmanın bellek kazancını yok eder.
         """
-        users = set()
-        if main_key in raw_data:
-            outer_list = raw_data.get(main_key, [])
-            if isinstance(outer_list, list):
-                for item in outer_list:
-                    string_data_list = item.get('string_list_data', [])
-                    if string_data_list and isinstance(string_data_list, list):
-                        # Kullanıcı adı 'value' alanında
-                        user_value = string_data_list[0].get('value')
-                        if user_value:
-                            users.add(user_value)
-        return users
-
-
-    def _get_ordered_user_list(self, raw_data: list) -> list:
+        if self._remote_file is not None or self._download_buffer is not None:
+            return None
+        if self._zip_ref is not None:
+            return self.zip_path
+        return self.extraction_path
+
+    def _extract_relation(self, relative_path: str, shape: str, main_key: str = None) -> ExtractedRelation:
         """
-        Tip 4 Formatındaki (followers_1.json) veriyi sıralı bir kullanıcı adı listesi olarak döndürür.
+        Manifest yolunu (desen olabilir) çözer ve eşleşen tüm parçaları ayrıştırır.
+        Birden fazla parça (followers_1.json, followers_2.json, ...) varsa paralel ayrıştırılır
+        ve sonuçlar parça sırasıyla tek bir ilişkide birleştirilir.
         """
-        users = []
-        if isinstance(raw_data, list):
-            for item in raw_data:
-                string_data_list = item.get('string_list_data', [])
-                if string_data_list and isinstance(string_data_list, list):
-                    user_value = string_data_list[0].get('value')
-                    if user_value:
-                        # Burada listenin sıralamasını koruyoruz
-                        users.append(user_value)
-        return users
-    
+        # Yol çözümleme arşiv indeksi üzerinden yapılır (tarihli ana klasör ve harf duyarlılığı dahil)
+        member_names = self._index.resolve_members(relative_path) if self._index is not None else []
+
+        if not member_names:
+            self.log.warning("Dosya bulunamadı: %s", relative_path)
+            return ExtractedRelation()
+
+        source = self._member_source() if self.parse_executor is not None else None
+        if source is not None:
+            # Ayrıştırma süreç havuzunda; parçalar havuzdaki süreçlere dağılır, her süreç öğeyi diskten okur
+            futures = [self.parse_executor.submit(extract_relation_from_member, source, name, shape, main_key)
+                       for name in member_names]
+            shards = [self._pool_result(future, name, shape, main_key) for future, name in zip(futures, member_names)]
+        elif len(member_names) == 1:
+            return self._extract_member(member_names[0], shape, main_key)
+        else:
+            self.log.debug("%d parça paralel ayrıştırılıyor: %s", len(member_names), relative_path)
+            with ThreadPoolExecutor(max_workers=min(SHARD_PARSE_WORKERS, len(member_names))) as executor:
+                shards = list(executor.map(lambda name: self._extract_member(name, shape, main_key), member_names))
+
+        relation = shards[0]
+        for shard in shards[1:]:
+            relation.extend(shard)
+        return relation
+
+    def _pool_result(self, future, member_name: str, shape: str, main_key: str = None) -> ExtractedRelation:
+        """Havuzdaki ayrıştırmanın sonucu; çocuk süreç öldüyse (BrokenProcessPool) öğe bu iş parçacığında ayrıştırılır."""
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self.log.warning("Ayrıştırma süreci öldü; %s bu iş parçacığında ayrıştırılıyor.", member_name)
+            return self._extract_member(member_name, shape, main_key)
+
+    @instrumented(PHASE_COLUMNAR_LOAD)
+    def _load_columnar_relations(self):
+        """Bu arşiv daha önce ayrıştırıldıysa ilişkileri sütunlu depodan okur; yoksa (None, None)."""
+        if self.columnar_store is None or self.fingerprint is None:
+            return None, None
+
+        columns = self.columnar_store.load(self.fingerprint)
+        if columns is None or not set(self.manifest) <= set(columns.keys):
+            return None, None
+
+        store = UsernameStore.from_ids(columns.vocabulary, {key: columns.ids(key) for key in self.manifest})
+        relations = {key: ExtractedRelation.from_columns(store.decode(columns.ids(key)), columns.timestamps(key))
+                     for key in self.manifest}
+        self._report_progress(PHASE_ANALYSIS, force=True,
+                              members_read=len(self.manifest), members_total=len(self.manifest))
+        self.log.info("İlişkiler sütunlu depodan okundu, JSON ayrıştırılmadı.")
+        return relations, store
+
+    def _save_columnar_relations(self, relations: dict, store: UsernameStore):
+        if self.columnar_store is None or self.fingerprint is None:
+            return
+        try:
+            self.columnar_store.save(self.fingerprint, store.usernames, {
+                key: (store.encode_ordered(relation.ordered), relation.timestamps)
+                for key, relation in relations.items()})
+        except OSError as e:
+            # Depo yazılamasa da analiz sonucu etkilenmez
+            self.log.warning("Sütunlu depoya yazılamadı: %s", e)
+
+    @instrumented(PHASE_PARSE)
+    def _parse_relations(self) -> dict:
+        """Manifest'teki tüm belgeleri ayrıştırır; her belge tek geçişte dolaşılır."""
+        relations = {}
+        for key, relative_path in self.manifest.items():
+            shape, main_key = RELATION_SPECS[key]
+            relations[key] = self._extract_relation(relative_path, shape, main_key)
+            self._report_progress(PHASE_ANALYSIS, force=len(relations) == len(self.manifest),
+                                  members_read=len(relations), members_total=len(self.manifest))
+
+        # Okunan (açılmış) JSON baytları
+        if self._index is not None:
+            self.instrumentation.add_bytes(bytes_in=sum(
+                self._zip_ref.getinfo(member_name).file_size if self._zip_ref is not None
+                else os.path.getsize(os.path.join(self.extraction_path, member_name))
+                for member_name in self._manifest_member_names()))
+        return relations
+
+    @instrumented(PHASE_ANALYSIS)
     def run_analysis(self) -> dict:
 
-        print(f"[{self.username}]: Kapsamlı Takip Analizi başlatılıyor...")
-        
-        FILE_PATH_PREFIX = 'connections/followers_and_following/'
-
-        # 1. TÜM VERİLERİ YÜKLE
-        data = {
-            'followers': self._load_json_data(FILE_PATH_PREFIX + 'followers_1.json'),
-            'following': self._load_json_data(FILE_PATH_PREFIX + 'following.json'),
-            'blocked': self._load_json_data(FILE_PATH_PREFIX + 'blocked_profiles.json'),
-            'unfollowed': self._load_json_data(FILE_PATH_PREFIX + 'recently_unfollowed_profiles.json'),
-            'accepted_requests': self._load_json_data(FILE_PATH_PREFIX + 'recent_follow_requests.json'), 
-            'received_requests': self._load_json_data(FILE_PATH_PREFIX + 'follow_requests_you\'ve_received.json'),
-            'hide_story_from': self._load_json_data(FILE_PATH_PREFIX + 'hide_story_from.json'),
-            'pending_requests': self._load_json_data(FILE_PATH_PREFIX + 'pending_follow_requests.json'),
-            'restricted_profiles': self._load_json_data(FILE_PATH_PREFIX + 'restricted_profiles.json'),
-            # 'following_requests_you\'ve_received.json' ve 'hide_story_from.json' tip 2 formatında varsayılmıştır.
-        }
+        self.log.debug("Kapsamlı Takip Analizi başlatılıyor...")
+        relations, store = self._load_columnar_relations()
 
-        # 2. TÜM LİSTELERİ ÇIKAR
-        
-        # Tip 2 Formatları (string_list_data / value):
-        followers_list = self._extract_users_from_top_level_list(data['followers'])
-        recently_unfollowed_list = self._extract_users_from_key_and_value(data['unfollowed'],'relationships_unfollowed_users')
-        
-        received_requests_list = self._extract_users_from_value(data['received_requests'])
-        
-        #tip 5
-        hide_story_list = self._extract_users_from_key_and_value(
-            data['hide_story_from'], 
-            'relationships_hide_stories_from'
-        )
-        accepted_requests_list = self._extract_users_from_key_and_value(
-            data['accepted_requests'],
-            'relationships_permanent_follow_requests'
-            )
-        
-        
-        # Tip 1 Formatları (relations / title):
-        following_list = self._extract_users_from_title(data['following'], 'relationships_following')
-        blocked_list = self._extract_users_from_title(data['blocked'], 'relationships_blocked_users')
-        # YENİ ÇIKARILAN LİSTELER (Tip 3 Formatı)
-        pending_requests_list = self._extract_users_from_key_and_value(
-            data['pending_requests'], 
-            'relationships_follow_requests_sent' # pending_follow_requests.json anahtarı
-        )
-        restricted_profiles_list = self._extract_users_from_embedded_list(
-            data['restricted_profiles'], 
-            'relationships_restricted_users' # restricted_profiles.json anahtarı
-        )
+        if relations is None:
+            self._prefetch_remote_members()
+
+            # 1-2. TÜM VERİLERİ YÜKLE VE LİSTELERİ ÇIKAR (manifest'teki dosyalar, bkz. manifest.py)
+            # Sıralı liste ve zaman damgaları birlikte çıkar.
+            relations = self._parse_relations()
+
+            # Kullanıcı adları bir kez sıralanıp tamsayı kimliklere çevrilir; ilişkiler sıralı kimlik dizileridir
+            store = UsernameStore({key: relation.ordered for key, relation in relations.items()})
+            self._save_columnar_relations(relations, store)
 
-        # Yeni Takipçiler Analizi için sıralı listeyi al
-        ordered_followers_list = self._get_ordered_user_list(data['followers'])
-        # 'YENİ TAKİPÇİLER' ANALİZİ (Testinize göre ilk 50'yi en son takipçiler kabul ediyoruz)
+        # Anlık görüntü kaydı için takipçi/takip kimlik dizileri analizden sonra da erişilebilir kalır
+        self.username_store = store
+
+        followers_ids = store.ids('followers')
+        following_ids = store.ids('following')
+
+        # 'YENİ TAKİPÇİLER' ANALİZİ: takip zaman damgalarına göre en yeni takipçiler
+        # (zaman damgası olmayan kayıtlarda eskisi gibi dosya sırası geçerlidir)
+        timeline = FollowerTimeline(relations['followers'].ordered, relations['followers'].timestamps)
+        self.follower_timeline = timeline
         NEW_FOLLOWER_COUNT_LIMIT = 15
-        recent_followers_list = ordered_followers_list[:NEW_FOLLOWER_COUNT_LIMIT]
+        recent_followers_list = timeline.recent(NEW_FOLLOWER_COUNT_LIMIT)
+        now = time.time()
 
-        # 3. KAPSAMLI ANALİZLERİ YAP
-        total_followers = len(followers_list)
-        total_following = len(following_list)
-        
-        mutual_following = followers_list.intersection(following_list)
-        not_following_back = following_list - followers_list # Sizin takip edip, onların etmediği (GT Yapmayan)
-        you_not_following = followers_list - following_list # Onların takip edip, sizin etmediğiniz (Sizin GT yapmadığınız)
+        # 3. KAPSAMLI ANALİZLERİ YAP (sıralı tamsayı dizileri üzerinde vektörel küme işlemleri)
+        mutual_following = store.intersection(followers_ids, following_ids)
+        not_following_back = store.difference(following_ids, followers_ids) # Sizin takip edip, onların etmediği (GT Yapmayan)
+        you_not_following = store.difference(followers_ids, following_ids) # Onların takip edip, sizin etmediğiniz (Sizin GT yapmadığınız)
         
         # 4. SONUÇLARI HAZIRLA (7 Metrik)
         analysis_metrics = {
@@ -275,55 +481,66 @@ class DataProcessor:
             "mutual_following_count": len(mutual_following),
             "not_following_back_count": len(not_following_back),
             "you_not_following_count": len(you_not_following),
-            "unfollowed_count": len(recently_unfollowed_list),
+            "unfollowed_count": len(store.ids('unfollowed')),
             "recent_followers_count": len(recent_followers_list), 
-            "accepted_requests_count": len(accepted_requests_list),
-            "pending_requests_count": len(pending_requests_list),
-            "blocked_count": len(blocked_list),
-            "hide_story_count": len(hide_story_list),
-            "restricted_profiles_count": len(restricted_profiles_list),
-            # "received_requests_count": len(received_requests_list),    # Ekstra bilgi
+            "accepted_requests_count": len(store.ids('accepted_requests')),
+            "pending_requests_count": len(store.ids('pending_requests')),
+            "blocked_count": len(store.ids('blocked')),
+            "hide_story_count": len(store.ids('hide_story_from')),
+            "restricted_profiles_count": len(store.ids('restricted_profiles')),
+            # Zaman penceresi metrikleri (örn. new_followers_last_7_days_count)
+            **{f"new_followers_last_{days}_days_count": timeline.count_since(days, now)
+               for days in NEW_FOLLOWER_WINDOWS_DAYS},
+            # "received_requests_count": len(store.ids('received_requests')),    # Ekstra bilgi
             
         }
         # LİSTE SONUÇLARI (Pop-up'larda gösterilecek veriler)
+        # Kimlikler sıralı atandığı için çözülen listeler zaten alfabetik sıradadır
         analysis_user_lists = {
-            "mutual_following_list": sorted(list(mutual_following)), 
-            "not_following_back_list": sorted(list(not_following_back)),         
-            "you_not_following_list": sorted(list(you_not_following)),
-            "unfollowed_list": sorted(list(recently_unfollowed_list)),
+            "mutual_following_list": store.decode(mutual_following), 
+            "not_following_back_list": store.decode(not_following_back),         
+            "you_not_following_list": store.decode(you_not_following),
+            "unfollowed_list": store.decode(store.ids('unfollowed')),
             "recent_followers_list": recent_followers_list,
-            "accepted_requests_list": sorted(list(accepted_requests_list)),
-            "pending_requests_list": sorted(list(pending_requests_list)), 
-            "blocked_list": sorted(list(blocked_list)),
-            "hide_story_list": sorted(list(hide_story_list)),
-            "restricted_profiles_list": sorted(list(restricted_profiles_list)), 
+            "accepted_requests_list": store.decode(store.ids('accepted_requests')),
+            "pending_requests_list": store.decode(store.ids('pending_requests')), 
+            "blocked_list": store.decode(store.ids('blocked')),
+            "hide_story_list": store.decode(store.ids('hide_story_from')),
+            "restricted_profiles_list": store.decode(store.ids('restricted_profiles')), 
         
         }
         
         # 5. Frontend'e Gönderilecek Formatı Ayarla (analysisResults tipine uydur)
         self.analysis_results = {
             "all_metrics": analysis_metrics,
-            "user_lists": analysis_user_lists # Kullanıcı Adı Listeleri
+            "user_lists": analysis_user_lists, # Kullanıcı Adı Listeleri
+            # Son FOLLOWER_VELOCITY_WEEKS haftada haftalık yeni takipçi sayıları (eskiden yeniye)
+            "timeline": {
+                "weekly_new_followers": timeline.weekly_velocity(FOLLOWER_VELOCITY_WEEKS, now),
+                "generated_at": now,
+            },
         }
         
-        print(f"[{self.username}]: Kapsamlı Analiz Tamamlandı. GT Yapmayan: {analysis_metrics['not_following_back_count']}, Takibi Bırakılan: {analysis_metrics['unfollowed_count']}")
+        self.log.info("Kapsamlı Analiz Tamamlandı. GT Yapmayan: %d, Takibi Bırakılan: %d",
+                      analysis_metrics['not_following_back_count'], analysis_metrics['unfollowed_count'])
         return self.analysis_results
     
+    @instrumented(PHASE_CLEANUP)
     def cleanup(self):
         """
-        İndirilen ZIP dosyasını ve çıkarılan klasörü temizler.
+        İndirilen ZIP dosyasını ve çıkarılan klasörü (işin geçici klasörünün tamamı) temizler.
+        Birden fazla çağrılabilir; yalnızca ilk çağrı siler.
         """
-        # Burada os.remove ve shutil.rmtree kullanılacak.
-        print(f"[{self.username}]: Temizlik işlemi başlıyor...")
-        # ZIP dosyasını sil
-        if os.path.exists(self.zip_path):
-            os.remove(self.zip_path)
-            print(f"[{self.username}]: ZIP dosyası silindi.")
-        
-        # Çıkarılan klasörü sil
-        if os.path.exists(self.extraction_path):
-            shutil.rmtree(self.extraction_path)
-            print(f"[{self.username}]: Ayıklanan klasör silindi.")
-        
-        print(f"[{self.username}]: Temizlik tamamlandı.")
-        # Temizlik şu an 'app.py' içinde çağrılmıyor. İsteğe bağlı olarak eklenebilir.
\ No newline at end of file
+        self.log.debug("Temizlik işlemi başlıyor...")
+        # Akış modunda açık kalan ZIP'i ve bellek içi indirme tamponunu kapat (silmeden önce)
+        self.close_archive()
+        if self._download_buffer is not None:
+            self._download_buffer.close()
+            self._download_buffer = None
+
+        # ZIP dosyası ve çıkarılan klasör işin geçici klasöründe; klasör toptan silinir
+        if self._remove_scratch.alive:
+            self._remove_scratch()
+            self.log.debug("Geçici klasör silindi: %s", self.scratch_dir)
+
+        self.log.debug("Temizlik tamamlandı.")
\ No newline at end of file
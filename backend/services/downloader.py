@@ -0,0 +1,238 @@
+import contextlib
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .remote_zip import RangeRequestsNotSupported
+
+# Aynı anda açılacak bağlantı sayısı
+DEFAULT_CONNECTIONS = 4
+# Dosya bu boyutta parçalara bölünür; her parça ayrı bir Range isteğidir
+PART_SIZE = 1024 * 1024 * 8
+# Her yanıttan okunan blok boyutu (1 MB)
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Bir parça için art arda izin verilen geçici hata sayısı
+MAX_RETRIES = 5
+RETRY_BACKOFF_SECONDS = 1.0
+
+# Geçici kabul edilen HTTP durum kodları (parça yeniden denenir)
+_TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_CONTENT_RANGE_RE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+)')
+
+
+class TransientDownloadError(Exception):
+    """Yeniden denenebilecek geçici indirme hatası."""
+
+
+class ParallelDownloader:
+    """
+    Dosyayı bayt aralıklarına bölüp havuzlanmış birden fazla bağlantıyla önceden
+    boyutlandırılmış bir dosyaya indirir. Kopan bir parça, en son yazılan bayttan devam eder.
+    Sunucu Range desteklemiyorsa tek bağlantılı akışa geri düşer. Parça istekleri yoklamada görülen
+    ETag / Last-Modified ile If-Range gönderir; dosya indirme sırasında değişirse (200 yanıtı ya da
+    tutmayan Content-Range) parçalar bırakılır ve dosya baştan tek bağlantıyla indirilir, böylece iki
+    sürümden birleştirilmiş bir dosya oluşmaz.
+    spool_max_bytes verilirse bu boyuta kadar (ya da boyutu bilinmeyen) dosyalar diske değil
+    bellekteki bir SpooledTemporaryFile'a (self.buffer) indirilir; sınır aşılırsa o da diske taşar.
+    """
+
+    def __init__(self, url: str, dest_path: str, connections: int = DEFAULT_CONNECTIONS,
+                 part_size: int = PART_SIZE, max_retries: int = MAX_RETRIES, timeout: int = 30,
+                 on_progress=None, reserve_space=None, spool_max_bytes: int = 0):
+        self.url = url
+        self.dest_path = dest_path
+        self.connections = connections
+        self.part_size = part_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+        # İlerleme bildirimi: on_progress(indirilen_bayt, toplam_bayt)
+        self.on_progress = on_progress
+        # Diske yazmadan önce çağrılır: reserve_space(bayt); yer yoksa hata fırlatmalıdır (bkz. scratch.py)
+        self.reserve_space = reserve_space
+        self.spool_max_bytes = spool_max_bytes
+        # Bellek içi indirmede hedef (dest_path yerine); parçalar aynı nesneye kilitle yazar
+        self.buffer = None
+        self._buffer_lock = threading.Lock()
+
+        self.total_size = 0
+        self.downloaded_size = 0
+        self._lock = threading.Lock()
+        # Yoklamadaki sürüm (If-Range); güçlü ETag yoksa Last-Modified
+        self.validator = None
+        # Şimdiye kadar ayrılan disk yeri; baştan indirmede aynı yer tekrar ayrılmaz
+        self._reserved_bytes = 0
+        # Bir parça dosyanın değiştiğini gördüğünde diğer parçalar da durur
+        self._source_changed = threading.Event()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def download(self) -> int:
+        """Dosyayı indirir ve toplam bayt sayısını döndürür."""
+        try:
+            total_size = self._probe_size()
+        except RangeRequestsNotSupported:
+            return self._download_single_stream()
+
+        self.total_size = total_size
+        if self.spool_max_bytes and total_size <= self.spool_max_bytes:
+            # Parçalar kendi ofsetlerine yazar; BytesIO aradaki boşluğu kendisi doldurur
+            self._open_buffer()
+        else:
+            self._reserve(total_size)
+            # Hedef dosyayı önceden boyutlandır; parçalar kendi ofsetlerine yazar
+            with open(self.dest_path, 'wb') as f:
+                f.truncate(total_size)
+
+        parts = [(start, min(start + self.part_size, total_size) - 1)
+                 for start in range(0, total_size, self.part_size)]
+        try:
+            with ThreadPoolExecutor(max_workers=self.connections) as executor:
+                # list() ile tüm parçaları bekle; herhangi birindeki hata burada yükselir
+                list(executor.map(lambda part: self._download_part(*part), parts))
+        except RangeRequestsNotSupported:
+            # Yazılan parçalar eski sürüme ait olabilir; hepsi atılır
+            self._restart()
+            return self._download_single_stream()
+
+        return total_size
+
+    def close(self):
+        self.session.close()
+
+    def _open_buffer(self):
+        # Bellekten taşarsa geçici dosya hedef dosyanın klasöründe (iş klasörü) açılır
+        self.buffer = tempfile.SpooledTemporaryFile(max_size=self.spool_max_bytes,
+                                                    dir=os.path.dirname(self.dest_path) or None)
+
+    def _open_dest(self, mode: str):
+        """Yazma hedefi: bellek içi tampon (kapatılmaz) ya da dest_path."""
+        if self.buffer is not None:
+            return contextlib.nullcontext(self.buffer)
+        return open(self.dest_path, mode)
+
+    def _write_at(self, f, offset: int, chunk: bytes):
+        if self.buffer is not None:
+            # Paylaşılan tamponda konum + yazma birlikte yapılmalı
+            with self._buffer_lock:
+                f.seek(offset)
+                f.write(chunk)
+        else:
+            f.seek(offset)
+            f.write(chunk)
+
+    def _restart(self):
+        """Parçalı indirmeyi bırakır; tek bağlantılı indirme hedefi ve ilerlemeyi sıfırdan kurar."""
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+        with self._lock:
+            self.downloaded_size = 0
+
+    def _reserve(self, nbytes: int):
+        if self.reserve_space is not None and nbytes > 0:
+            self.reserve_space(nbytes)
+            self._reserved_bytes += nbytes
+
+    def _reserve_up_to(self, total_bytes: int):
+        """Ayrılan toplam yeri total_bytes'a tamamlar."""
+        self._reserve(total_bytes - self._reserved_bytes)
+
+    def _probe_size(self) -> int:
+        """İlk baytı isteyerek Range desteğini ve toplam boyutu öğrenir."""
+        with self.session.get(self.url, headers={'Range': 'bytes=0-0'},
+                              stream=True, timeout=self.timeout) as r:
+            r.raise_for_status()
+            content_range = r.headers.get('Content-Range', '')
+            if r.status_code != 206 or '/' not in content_range:
+                raise RangeRequestsNotSupported(f"HTTP {r.status_code}")
+            total = content_range.rsplit('/', 1)[1]
+            if not total.isdigit():
+                raise RangeRequestsNotSupported(f"Content-Range: {content_range}")
+            # Zayıf ETag'ler If-Range'de kullanılamaz
+            etag = r.headers.get('ETag')
+            self.validator = etag if etag and not etag.startswith('W/') else r.headers.get('Last-Modified')
+            return int(total)
+
+    def _check_part_response(self, r, offset: int):
+        """Parça yanıtı istenen aralık ve yoklamadaki dosya için mi; değilse dosya değişmiştir."""
+        match = _CONTENT_RANGE_RE.match(r.headers.get('Content-Range', ''))
+        if r.status_code != 206 or not match or int(match.group(1)) != offset \
+                or int(match.group(3)) != self.total_size:
+            self._source_changed.set()
+            raise RangeRequestsNotSupported(f"HTTP {r.status_code}, Content-Range: "
+                                            f"{r.headers.get('Content-Range', '-')} (beklenen başlangıç {offset})")
+
+    def _download_part(self, start: int, end: int):
+        """[start, end] aralığını indirir; geçici hatalarda kaldığı yerden devam eder."""
+        offset = start
+        failures = 0
+
+        with self._open_dest('r+b') as f:
+            while offset <= end and not self._source_changed.is_set():
+                try:
+                    headers = {'Range': f'bytes={offset}-{end}'}
+                    if self.validator:
+                        # Dosya değiştiyse sunucu aralık yerine tüm yeni dosyayı (200) gönderir
+                        headers['If-Range'] = self.validator
+                    with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as r:
+                        if r.status_code in _TRANSIENT_STATUS_CODES:
+                            raise TransientDownloadError(f"HTTP {r.status_code}")
+                        r.raise_for_status()
+                        self._check_part_response(r, offset)
+
+                        for chunk in r.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                            if self._source_changed.is_set():
+                                return
+                            if chunk:
+                                chunk = chunk[:end + 1 - offset]
+                                self._write_at(f, offset, chunk)
+                                offset += len(chunk)
+                                self._add_progress(len(chunk))
+                        if offset <= end and not self._source_changed.is_set():
+                            raise TransientDownloadError("Bağlantı parça tamamlanmadan kapandı")
+                    failures = 0
+
+                except (TransientDownloadError, requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError):
+                    failures += 1
+                    if failures > self.max_retries:
+                        raise
+                    time.sleep(RETRY_BACKOFF_SECONDS * failures)
+
+    def _download_single_stream(self) -> int:
+        """Range desteklenmediğinde tüm dosyayı tek bağlantıyla indirir."""
+        with self.session.get(self.url, stream=True, timeout=self.timeout) as r:
+            r.raise_for_status()
+            self.total_size = int(r.headers.get('content-length', 0))
+            if self.spool_max_bytes and self.total_size <= self.spool_max_bytes:
+                self._open_buffer()
+            else:
+                self._reserve_up_to(self.total_size)
+
+            with self._open_dest('wb') as f:
+                for chunk in r.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    if chunk:  # boş chunk'ları filtrele
+                        # Boyut bilinmiyorsa disk yeri tampon taştıktan sonra her blok için ayrılır
+                        if not self.total_size and self.downloaded_size + len(chunk) > self.spool_max_bytes:
+                            self._reserve_up_to(self.downloaded_size + len(chunk) - self.spool_max_bytes)
+                        f.write(chunk)
+                        self._add_progress(len(chunk))
+
+        return self.downloaded_size
+
+    def _add_progress(self, byte_count: int):
+        with self._lock:
+            self.downloaded_size += byte_count
+            downloaded_size = self.downloaded_size
+        if self.on_progress is not None:
+            self.on_progress(downloaded_size, self.total_size)
@@ -0,0 +1,161 @@
+import contextvars
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Aynı anda çalışacak analiz hattı sayısı (indirme / uzak okuma ağırlıklı, iş parçacıkları)
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', 4))
+# JSON ayrıştırma için süreç sayısı; 0 verilirse ayrıştırma hattın kendi iş parçacığında yapılır
+PARSE_PROCESS_WORKERS = int(os.environ.get('PARSE_PROCESS_WORKERS', min(4, os.cpu_count() or 1)))
+# Çalışanlara ek olarak sırada bekleyebilecek en fazla analiz; dolunca yeni istekler 429 alır
+ANALYSIS_QUEUE_SIZE = int(os.environ.get('ANALYSIS_QUEUE_SIZE', 8))
+
+# Henüz süre ölçümü yokken Retry-After için varsayılan analiz süresi (saniye)
+DEFAULT_ANALYSIS_SECONDS = 30
+# Analiz süresi hareketli ortalamasında son ölçümün ağırlığı
+DURATION_SMOOTHING = 0.2
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorBusy(Exception):
+    """Analiz kuyruğu dolu; istemci retry_after saniye sonra tekrar denemeli."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Sunucu şu anda çok yoğun, lütfen {retry_after} saniye sonra tekrar deneyin.")
+        self.retry_after = retry_after
+
+
+class ParsePool:
+    """
+    JSON ayrıştırma süreç havuzu. Çocuk süreçlerden biri ölürse (örn. OOM ile öldürülürse)
+    ProcessPoolExecutor kalıcı olarak bozulur ve sonraki her submit BrokenProcessPool fırlatır;
+    bu sarmalayıcı bozuk havuzu kapatıp yenisini kurar. O anda çalışan işlerin Future'ları
+    BrokenProcessPool ile sonuçlanır; çağıran bunları kendi iş parçacığında yeniden çalıştırabilir.
+    Havuz ilk submit'te kurulur; hiç ayrıştırma yapmayan (örn. yalnızca önbellekten yanıt veren)
+    bir işçi süreç başlatmaz.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        # Ölen süreç yüzünden yeniden kurulan havuz sayısı (/metrics)
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._pool = None
+        self._closed = False
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    def _create(self) -> ProcessPoolExecutor:
+        # fork, iş parçacıklı bir sunucuda kilitleri yarım kopyalayabilir; süreçler spawn ile başlatılır
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def _current(self) -> ProcessPoolExecutor:
+        pool = self._pool
+        if pool is not None:
+            return pool
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Ayrıştırma süreç havuzu kapatıldı.")
+            if self._pool is None:
+                self._pool = self._create()
+            return self._pool
+
+    def submit(self, fn, *args, **kwargs):
+        """fn'i bir çocuk süreçte çalıştırır ve Future döndürür; havuz bozulmuşsa önce yenisi kurulur."""
+        pool = self._current()
+        try:
+            return pool.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            return self._replace(pool).submit(fn, *args, **kwargs)
+
+    def _replace(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Ayrıştırma süreç havuzu kapatıldı.")
+            # Aynı bozuk havuzu aynı anda gören iş parçacıklarından yalnızca biri yenisini kurar
+            if self._pool is broken:
+                logger.warning("Ayrıştırma süreç havuzu bozuldu (çocuk süreç öldü); yeniden kuruluyor.")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._create()
+                self.restarts += 1
+            return self._pool
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+class AnalysisExecutor:
+    """
+    Analiz hatlarını sınırlı sayıda çalıştıran ve kuyruğu sınırlayan yürütücü.
+    Hatlar (indirme, uzak okuma, önbellek) bir iş parçacığı havuzunda çalışır; CPU ağırlıklı
+    JSON ayrıştırması ayrı bir süreç havuzuna (parse_pool) verilir, böylece GIL aynı anda
+    çalışan analizleri birbirine bağlamaz. Çalışan + bekleyen analiz sayısı sınırı aşarsa
+    submit() ExecutorBusy fırlatır; bellek ve disk kullanımı eşzamanlı analiz sayısıyla sınırlı kalır.
+    """
+
+    def __init__(self, analysis_workers: int = ANALYSIS_WORKERS, parse_workers: int = PARSE_PROCESS_WORKERS,
+                 queue_size: int = ANALYSIS_QUEUE_SIZE):
+        self.analysis_workers = analysis_workers
+        self.capacity = analysis_workers + queue_size
+        self._pool = ThreadPoolExecutor(max_workers=analysis_workers, thread_name_prefix='analysis')
+        self.parse_pool = ParsePool(parse_workers) if parse_workers > 0 else None
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._average_duration = None
+
+    def submit(self, fn, *args, **kwargs):
+        """fn'i kuyruğa ekler ve Future döndürür; kuyruk doluysa ExecutorBusy fırlatır."""
+        with self._lock:
+            if self._admitted >= self.capacity:
+                raise ExecutorBusy(self._retry_after())
+            self._admitted += 1
+
+        try:
+            # Çağıranın bağlamı (örn. günlükteki iş kimliği) havuz iş parçacığına taşınır
+            future = self._pool.submit(contextvars.copy_context().run, self._timed, fn, *args, **kwargs)
+        except Exception:
+            self._release(None)
+            raise
+        return future
+
+    @property
+    def in_flight(self) -> int:
+        """Çalışan + sırada bekleyen analiz sayısı."""
+        return self._admitted
+
+    def _timed(self, fn, *args, **kwargs):
+        started = time.monotonic()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._release(time.monotonic() - started)
+
+    def _release(self, duration):
+        with self._lock:
+            self._admitted -= 1
+            if duration is not None:
+                self._average_duration = duration if self._average_duration is None else (
+                    DURATION_SMOOTHING * duration + (1 - DURATION_SMOOTHING) * self._average_duration)
+
+    def _retry_after(self) -> int:
+        """Kuyruğun bir çalışan kadar boşalması için tahmini süre (saniye)."""
+        average = self._average_duration if self._average_duration is not None else DEFAULT_ANALYSIS_SECONDS
+        waves = (self._admitted - self.analysis_workers + 1) / self.analysis_workers
+        return max(1, math.ceil(average * max(waves, 1)))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
@@ -0,0 +1,206 @@
+# Instagram dışa aktarım JSON'larından kullanıcı adlarını çıkaran tablo tabanlı motor.
+# Her belge tek geçişte dolaşılır; dosya sırasındaki kullanıcı adı listesi ve
+# zaman damgaları birlikte üretilir. Yeni bir dosya biçimi için EXTRACTION_SHAPES'e
+# bir giriş eklemek yeterlidir.
+
+import io
+import logging
+import os
+from array import array
+from contextlib import ExitStack
+from zipfile import ZipFile
+
+from .json_stream import iter_array_items
+
+logger = logging.getLogger(__name__)
+
+# Desteklenen belge biçimleri (eski _extract_users_from_* yardımcılarına karşılık gelir)
+SHAPE_TITLE = 'title'                  # Tip 1: main_key altındaki liste, kullanıcı adı 'title'
+SHAPE_VALUE = 'value'                  # Tip 2: üst seviye 'string_list_data', kullanıcı adı 'value'
+SHAPE_EMBEDDED_LIST = 'embedded_list'  # Tip 3: main_key listesinin ilk elemanındaki 'string_list_data'
+SHAPE_TOP_LEVEL_LIST = 'top_level_list'  # Tip 4: üst seviye liste, string_list_data[0]['value']
+SHAPE_KEY_AND_VALUE = 'key_and_value'  # Tip 5: main_key altındaki liste, string_list_data[0]['value']
+
+# Öğe listesinin belgedeki yeri
+CONTAINER_ROOT = 'root'            # belgenin kendisi bir liste
+CONTAINER_MAIN_KEY = 'main_key'    # belge[main_key]
+CONTAINER_STRING_LIST = 'string_list_data'  # belge['string_list_data']
+
+# Zaman damgası olmayan (ya da geçersiz) kayıtlar için zaman damgası sütunundaki değer
+MISSING_TIMESTAMP = -1
+
+# personal_information.json'da kullanıcı adının etiketi; dışa aktarımın diline göre değişir
+ACCOUNT_USERNAME_LABELS = ('Username', 'Kullanıcı adı')
+
+
+def _title_record(item) -> tuple:
+    """Kullanıcı adı 'title' alanında; zaman damgası (varsa) string_list_data[0] içinde."""
+    string_data_list = item.get('string_list_data')
+    timestamp = None
+    if string_data_list and isinstance(string_data_list, list):
+        timestamp = string_data_list[0].get('timestamp')
+    return item.get('title'), timestamp
+
+
+def _value_record(item) -> tuple:
+    """Öğenin kendisi bir string_list_data girdisidir."""
+    return item.get('value'), item.get('timestamp')
+
+
+def _first_string_list_record(item) -> tuple:
+    """Kullanıcı adı öğenin string_list_data[0]['value'] alanında."""
+    string_data_list = item.get('string_list_data', [])
+    if string_data_list and isinstance(string_data_list, list):
+        # Genellikle sadece ilk eleman (index 0) kullanıcı adını içerir
+        return string_data_list[0].get('value'), string_data_list[0].get('timestamp')
+    return None, None
+
+
+# biçim -> (öğe listesinin yeri, öğeler ilk elemanın string_list_data'sına mı açılıyor, kayıt fonksiyonu)
+EXTRACTION_SHAPES = {
+    SHAPE_TITLE: (CONTAINER_MAIN_KEY, False, _title_record),
+    SHAPE_VALUE: (CONTAINER_STRING_LIST, False, _value_record),
+    SHAPE_EMBEDDED_LIST: (CONTAINER_MAIN_KEY, True, _value_record),
+    SHAPE_TOP_LEVEL_LIST: (CONTAINER_ROOT, False, _first_string_list_record),
+    SHAPE_KEY_AND_VALUE: (CONTAINER_MAIN_KEY, False, _first_string_list_record),
+}
+
+
+class ExtractedRelation:
+    """
+    Tek bir belgeden çıkarılan kullanıcılar: dosya sırasındaki liste ve zaman damgaları.
+    Zaman damgaları int64 bir array sütununda tutulur (eksikse MISSING_TIMESTAMP); NumPy'a
+    kopyasız aktarılabilir (bkz. timeline.py).
+    Tekrarsız küme ayrıca tutulmaz; küme işlemleri UsernameStore'da kimlik dizileriyle yapılır.
+    """
+
+    __slots__ = ('ordered', 'timestamps')
+
+    def __init__(self):
+        # Dosyadaki sırayla kullanıcı adları ve aynı sıradaki zaman damgaları (Unix saniye)
+        self.ordered = []
+        self.timestamps = array('q')
+
+    def add(self, username: str, timestamp):
+        self.ordered.append(username)
+        self.timestamps.append(timestamp if isinstance(timestamp, int) and 0 <= timestamp < 2 ** 63 else MISSING_TIMESTAMP)
+
+    @classmethod
+    def from_columns(cls, ordered: list, timestamps) -> 'ExtractedRelation':
+        """Sütunlu depodan okunan veriyle ilişki kurar (timestamps int64 bir NumPy dizisi olabilir)."""
+        relation = cls()
+        relation.ordered = ordered
+        relation.timestamps = timestamps
+        return relation
+
+    def extend(self, other: 'ExtractedRelation'):
+        """Başka bir parçanın (örn. followers_2.json) sonuçlarını sırayı koruyarak ekler."""
+        self.ordered.extend(other.ordered)
+        self.timestamps.extend(other.timestamps)
+
+    def __len__(self) -> int:
+        return len(self.ordered)
+
+
+def _container_key(container: str, main_key: str):
+    """Öğe listesinin bulunduğu üst seviye alan adı (belgenin kendisi listeyse None)."""
+    if container == CONTAINER_ROOT:
+        return None
+    return main_key if container == CONTAINER_MAIN_KEY else container
+
+
+def _unwrap_and_filter(items, unwrap_first: bool):
+    if unwrap_first:
+        # Tip 3: kullanıcılar listenin ilk elemanının string_list_data alanında
+        first = next(iter(items), None)
+        if not isinstance(first, dict):
+            return
+        items = first.get('string_list_data', [])
+        if not isinstance(items, list):
+            return
+
+    for item in items:
+        if isinstance(item, dict):
+            yield item
+
+
+def iter_shape_items(raw_data, shape: str, main_key: str = None):
+    """Belgedeki kullanıcı öğelerini, biçim tablosuna göre sırayla döndürür."""
+    container, unwrap_first, _record = EXTRACTION_SHAPES[shape]
+    key = _container_key(container, main_key)
+
+    if key is None:
+        items = raw_data
+    elif isinstance(raw_data, dict):
+        items = raw_data.get(key, [])
+    else:
+        items = []
+
+    if isinstance(items, list):
+        yield from _unwrap_and_filter(items, unwrap_first)
+
+
+def iter_shape_items_from_stream(stream, shape: str, main_key: str = None):
+    """
+    iter_shape_items'ın akış sürümü: belge ağacı hiç kurulmaz, öğeler metin akışından
+    okundukça tek tek döndürülür (bkz. json_stream.py).
+    """
+    container, unwrap_first, _record = EXTRACTION_SHAPES[shape]
+    items = iter_array_items(stream, _container_key(container, main_key))
+    yield from _unwrap_and_filter(items, unwrap_first)
+
+
+def extract_account_username(raw_data):
+    """personal_information.json belgesinden hesabın kullanıcı adını döndürür; bulunamazsa None."""
+    profiles = raw_data.get('profile_user') if isinstance(raw_data, dict) else None
+    if not profiles or not isinstance(profiles, list) or not isinstance(profiles[0], dict):
+        return None
+
+    string_map = profiles[0].get('string_map_data')
+    if not isinstance(string_map, dict):
+        return None
+    for label in ACCOUNT_USERNAME_LABELS:
+        entry = string_map.get(label)
+        value = entry.get('value') if isinstance(entry, dict) else None
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def extract_relation(raw_data, shape: str, main_key: str = None) -> ExtractedRelation:
+    """Belgeyi tek geçişte dolaşır ve kullanıcı adlarını (dosya sırasıyla) ve zaman damgalarını birlikte çıkarır."""
+    return _extract_from_items(iter_shape_items(raw_data, shape, main_key), shape)
+
+
+def extract_relation_from_stream(stream, shape: str, main_key: str = None) -> ExtractedRelation:
+    """extract_relation ile aynı sonucu, belgeyi belleğe almadan metin akışından üretir."""
+    return _extract_from_items(iter_shape_items_from_stream(stream, shape, main_key), shape)
+
+
+def extract_relation_from_member(source, member_name: str, shape: str, main_key: str = None) -> ExtractedRelation:
+    """
+    Ayrıştırma süreç havuzunda çalışır (bkz. executor.py); argümanlar süreçler arasında kopyalanabilir olmalı.
+    source: ZIP dosyasının yolu ya da ZIP'in çıkarıldığı klasör; öğe süreç içinde akış halinde okunur.
+    Belge okunamazsa hata yazılır ve boş ilişki döner (DataProcessor._extract_member ile aynı davranış).
+    """
+    try:
+        with ExitStack() as stack:
+            if os.path.isdir(source):
+                member = stack.enter_context(open(os.path.join(source, member_name), 'rb'))
+            else:
+                member = stack.enter_context(stack.enter_context(ZipFile(source, 'r')).open(member_name))
+            return extract_relation_from_stream(io.TextIOWrapper(member, encoding='utf-8'), shape, main_key)
+    except Exception as e:
+        logger.error("JSON okunamadı (%s): %s", member_name, e)
+        return ExtractedRelation()
+
+
+def _extract_from_items(items, shape: str) -> ExtractedRelation:
+    record = EXTRACTION_SHAPES[shape][2]
+    relation = ExtractedRelation()
+
+    for item in items:
+        username, timestamp = record(item)
+        if username:
+            relation.add(username, timestamp)
+    return relation
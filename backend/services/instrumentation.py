@@ -0,0 +1,212 @@
+import functools
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# 1 ise her aşamanın tepe bellek kullanımı tracemalloc ile ölçülür (belirgin ek yük getirir)
+TRACE_MEMORY = os.environ.get('TRACE_MEMORY', '0') == '1'
+
+# Aşama süresi histogramının üst sınırları (saniye)
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+METRIC_PREFIX = 'insta_analyzer'
+
+# progress.py'deki aşamalara ek olarak yalnızca ölçümde ayrılan aşamalar
+PHASE_PARSE = 'parse'
+PHASE_COLUMNAR_LOAD = 'columnar_load'
+PHASE_CLEANUP = 'cleanup'
+
+logger = logging.getLogger(__name__)
+
+
+class PhaseMetrics:
+    """
+    Tüm işlerin aşama ölçümlerini süreç içinde toplar ve Prometheus metin biçiminde sunar.
+    Her iş, her aşama için bir gözlem ekler (aynı işte tekrarlanan aşamalar önceden toplanır).
+    Her gunicorn işçisi kendi sayaçlarını tutar (prometheus_client'ın varsayılan davranışı gibi).
+    """
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # aşama -> toplamlar ve histogram sayaçları
+        self._phases = {}
+
+    def observe(self, record: dict):
+        with self._lock:
+            totals = self._phases.setdefault(record["phase"], {
+                "count": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "bytes_in": 0, "bytes_out": 0,
+                "peak_traced_bytes": 0, "buckets": [0] * len(self.buckets),
+            })
+            totals["count"] += 1
+            totals["wall_seconds"] += record["wall_seconds"]
+            totals["cpu_seconds"] += record["cpu_seconds"]
+            totals["bytes_in"] += record["bytes_in"]
+            totals["bytes_out"] += record["bytes_out"]
+            totals["peak_traced_bytes"] = max(totals["peak_traced_bytes"], record["peak_traced_bytes"] or 0)
+            for index, bound in enumerate(self.buckets):
+                if record["wall_seconds"] <= bound:
+                    totals["buckets"][index] += 1
+
+    def render(self, gauges: dict = None) -> str:
+        """Prometheus metin biçimi (0.0.4). gauges: ek anlık değerler, isim -> (açıklama, değer)"""
+        with self._lock:
+            phases = {phase: dict(totals, buckets=list(totals["buckets"])) for phase, totals in self._phases.items()}
+
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            lines.extend(f"{METRIC_PREFIX}_{sample_name}{labels} {value}" for sample_name, labels, value in samples)
+
+        family('phase_duration_seconds', 'histogram', 'Wall time of pipeline phases.', [
+            sample
+            for phase, totals in sorted(phases.items())
+            for sample in (
+                [('phase_duration_seconds_bucket', f'{{phase="{phase}",le="{bound}"}}', count)
+                 for bound, count in zip(self.buckets, totals["buckets"])]
+                + [('phase_duration_seconds_bucket', f'{{phase="{phase}",le="+Inf"}}', totals["count"]),
+                   ('phase_duration_seconds_sum', f'{{phase="{phase}"}}', totals["wall_seconds"]),
+                   ('phase_duration_seconds_count', f'{{phase="{phase}"}}', totals["count"])])
+        ])
+        family('phase_cpu_seconds_total', 'counter', 'CPU time spent in pipeline phases (calling thread).',
+               [('phase_cpu_seconds_total', f'{{phase="{phase}"}}', totals["cpu_seconds"])
+                for phase, totals in sorted(phases.items())])
+        family('phase_bytes_in_total', 'counter', 'Bytes read by pipeline phases.',
+               [('phase_bytes_in_total', f'{{phase="{phase}"}}', totals["bytes_in"])
+                for phase, totals in sorted(phases.items())])
+        family('phase_bytes_out_total', 'counter', 'Bytes written by pipeline phases.',
+               [('phase_bytes_out_total', f'{{phase="{phase}"}}', totals["bytes_out"])
+                for phase, totals in sorted(phases.items())])
+        if TRACE_MEMORY:
+            family('phase_peak_traced_bytes', 'gauge', 'Largest traced memory peak seen in a phase.',
+                   [('phase_peak_traced_bytes', f'{{phase="{phase}"}}', totals["peak_traced_bytes"])
+                    for phase, totals in sorted(phases.items())])
+
+        for name, (help_text, value) in sorted((gauges or {}).items()):
+            family(name, 'gauge', help_text, [(name, '', value)])
+
+        return '\n'.join(lines) + '\n'
+
+
+# Uygulama genelindeki varsayılan kayıt (GET /metrics bunu sunar)
+default_metrics = PhaseMetrics()
+
+
+class _Frame:
+    __slots__ = ('name', 'wall_started', 'cpu_started', 'child_wall', 'child_cpu', 'peak')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_started = time.perf_counter()
+        self.cpu_started = time.thread_time()
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+        self.peak = 0
+
+
+class PhaseRecorder:
+    """
+    Bir işin aşamalarını (indirme, uzak okuma, ayrıştırma, analiz...) ölçer.
+    İç içe aşamalarda süreler dışlayıcıdır: 'analysis' içinde çalışan 'parse' süresi
+    analysis'ten düşülür. Aynı aşama birden fazla çalışırsa değerler toplanır.
+    CPU süresi çağıran iş parçacığınındır; süreç havuzundaki ayrıştırma CPU'su dahil değildir.
+    TRACE_MEMORY açıksa tepe bellek süreç geneli tracemalloc değeridir; eşzamanlı işler birbirini etkiler.
+    """
+
+    def __init__(self, metrics: PhaseMetrics = default_metrics):
+        self.metrics = metrics
+        self._stack = []
+        self._records = {}
+        self._lock = threading.Lock()
+        self._finished = False
+        if TRACE_MEMORY and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _record(self, name: str) -> dict:
+        return self._records.setdefault(name, {
+            "phase": name, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+            "bytes_in": 0, "bytes_out": 0, "peak_traced_bytes": None,
+        })
+
+    def add_bytes(self, bytes_in: int = 0, bytes_out: int = 0, phase: str = None):
+        """Baytları verilen (yoksa o an çalışan) aşamaya ekler."""
+        with self._lock:
+            name = phase or (self._stack[-1].name if self._stack else 'other')
+            record = self._record(name)
+            record["bytes_in"] += bytes_in
+            record["bytes_out"] += bytes_out
+
+    def _enter(self, name: str):
+        if TRACE_MEMORY and tracemalloc.is_tracing():
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = _Frame(name)
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, frame: _Frame):
+        wall = time.perf_counter() - frame.wall_started
+        cpu = time.thread_time() - frame.cpu_started
+        self._stack.pop()
+        if TRACE_MEMORY and tracemalloc.is_tracing():
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+
+        if self._stack:
+            parent = self._stack[-1]
+            parent.child_wall += wall
+            parent.child_cpu += cpu
+            parent.peak = max(parent.peak, frame.peak)
+
+        with self._lock:
+            record = self._record(frame.name)
+            record["wall_seconds"] += wall - frame.child_wall
+            record["cpu_seconds"] += cpu - frame.child_cpu
+            if TRACE_MEMORY:
+                record["peak_traced_bytes"] = max(record["peak_traced_bytes"] or 0, frame.peak)
+
+        # Gecikme analizi için her aşama tek satır (süre iç aşamalar dahil)
+        logger.debug("Aşama tamamlandı: %s", frame.name, extra={
+            "phase": frame.name, "duration_ms": round(wall * 1000, 2), "cpu_ms": round(cpu * 1000, 2)})
+
+    @contextmanager
+    def phase(self, name: str):
+        """with recorder.phase('download'): ... biçiminde kullanılır."""
+        frame = self._enter(name)
+        try:
+            yield self
+        finally:
+            self._exit(frame)
+
+    def finish(self):
+        """İş bitti: aşama toplamlarını bir kez genel metriklere aktarır."""
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            records = [dict(record) for record in self._records.values()]
+        if self.metrics is not None:
+            for record in records:
+                self.metrics.observe(record)
+
+    def as_dict(self) -> list:
+        """İş kaydına eklenecek aşama ölçümleri (ilk çalışma sırasıyla)."""
+        with self._lock:
+            return [dict(record, wall_seconds=round(record["wall_seconds"], 4),
+                         cpu_seconds=round(record["cpu_seconds"], 4))
+                    for record in self._records.values()]
+
+
+def instrumented(phase_name: str):
+    """DataProcessor metodunu self.instrumentation üzerinde bir aşama olarak ölçer."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.instrumentation.phase(phase_name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,256 @@
+import logging
+import os
+import time
+import uuid
+
+from .columnar_store import ColumnarStore
+from .data_processor import DataProcessor
+from .executor import AnalysisExecutor, ExecutorBusy
+from .instrumentation import PhaseRecorder
+from .progress import PHASE_DONE, ProgressTracker
+from .result_cache import ResultCache, url_validator_key
+from .result_pages import ResultPages, result_id_for
+from .scratch import ScratchManager, default_scratch
+from .snapshots import SnapshotStore
+from .state_store import InMemoryStateStore
+from .structured_logging import current_job_id, log_duration
+
+# Bir iş kaydının (durum + sonuç) depoda tutulacağı süre; her güncellemede yenilenir (saniye)
+JOB_TTL_SECONDS = int(os.environ.get('JOB_TTL_SECONDS', 60 * 30))
+
+# İş durumları
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCESS = 'success'
+JOB_ERROR = 'error'
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineError(Exception):
+    """Analiz hattının bir adımı başarısız oldu; mesaj doğrudan kullanıcıya gösterilir."""
+
+
+def _with_snapshot_diff(results: dict, snapshot_store: SnapshotStore, account: str, snapshot_id: int) -> dict:
+    """Bir önceki anlık görüntüden bu yana kazanılan/kaybedilen takipçileri sonuçlara ekler."""
+    diff = snapshot_store.diff_since_previous(account, snapshot_id)
+    if diff is None:
+        return results
+
+    return {
+        **results,
+        "all_metrics": {
+            **results["all_metrics"],
+            "new_followers_since_last_count": len(diff["gained_followers"]),
+            "lost_followers_since_last_count": len(diff["lost_followers"]),
+            "previous_snapshot_at": diff["from_taken_at"],
+        },
+        "user_lists": {
+            **results["user_lists"],
+            "new_followers_since_last_list": diff["gained_followers"],
+            "lost_followers_since_last_list": diff["lost_followers"],
+        },
+    }
+
+
+def _with_result_id(results: dict, result_pages: ResultPages, fingerprint: str, snapshot_id: int = None) -> dict:
+    """Sonuçları sayfalama için arşiv parmak izinden türetilen kimlikle saklar ve kimliği sonuçlara ekler."""
+    if result_pages is None:
+        return results
+    result_id = result_pages.save(results, result_id_for(fingerprint, snapshot_id) if fingerprint else None)
+    return {**results, "result_id": result_id}
+
+
+def _download_and_extract(processor: DataProcessor):
+    """Arşivi tam indirir ve açar; başarısız olursa PipelineError."""
+    # İndirme işlemi
+    if not processor.download_file():
+        raise PipelineError("Dosya indirme işlemi başarısız oldu. Link süresi dolmuş veya ağ hatası var.")
+
+    #zip açma
+    if not processor.unzip_and_extract():
+        raise PipelineError("ZIP dosyasını açma işlemi başarısız oldu veya dosya bozuk.")
+
+
+def run_pipeline(download_url: str, username: str = None, progress_callback=None,
+                 result_cache: ResultCache = None, snapshot_store: SnapshotStore = None,
+                 columnar_store: ColumnarStore = None, parse_executor=None,
+                 recorder: PhaseRecorder = None, scratch_manager: ScratchManager = None,
+                 result_pages: ResultPages = None) -> dict:
+    """
+    İndirme -> ZIP açma -> analiz adımlarını sırayla çalıştırır ve sonuçları döndürür.
+    result_cache verilirse aynı içerikli dışa aktarımlar için önceki sonuç döndürülür.
+    snapshot_store verilirse arşivdeki hesabın (personal_information.json) anlık görüntüsü kaydedilir
+    ve sonuçlara bir önceki dışa aktarımdan bu yana takipçi değişimleri eklenir. username yalnızca
+    günlük kayıtlarında kullanılır; istemcinin gönderdiği ada anlık görüntü yazılmaz ve okunmaz.
+    columnar_store verilirse aynı arşivin ayrıştırılmış verisi diskten yeniden kullanılır.
+    parse_executor verilirse diskteki arşivlerin JSON ayrıştırması o havuzda (süreç havuzu) yapılır.
+    recorder verilirse aşama ölçümleri ona yazılır (bkz. instrumentation.py).
+    scratch_manager: geçici klasörün ayrıldığı kota yöneticisi (bkz. scratch.py); yer yoksa ScratchSpaceFull.
+    result_pages verilirse sonuçlar sayfalama için saklanır ve sonuçlara result_id eklenir.
+    Hangi adımda olursa olsun iş bitince geçici dosyalar temizlenir.
+    """
+    processor = DataProcessor(download_url=download_url, username=username or "user",
+                              progress_callback=progress_callback, columnar_store=columnar_store,
+                              parse_executor=parse_executor, instrumentation=recorder,
+                              scratch_manager=scratch_manager)
+    try:
+        # Önce sadece gerekli baytları HTTP Range ile okumayı dene; sunucu desteklemiyorsa tam indir
+        if not processor.open_remote_archive():
+            # Aynı dosya (ETag + boyut) daha önce analiz edildiyse indirmeye gerek yok
+            fingerprint = result_cache.fingerprint_for(
+                url_validator_key(download_url, processor.remote_etag, processor.remote_size)) if result_cache else None
+            cached = result_cache.get(fingerprint) if fingerprint else None
+            # Anlık görüntü tutuluyorsa önbellek ancak bu arşivin görüntüsü zaten kayıtlıysa kullanılabilir
+            snapshot = snapshot_store.find_by_fingerprint(fingerprint) \
+                if cached is not None and snapshot_store is not None else None
+            if cached is not None and (snapshot_store is None or snapshot is not None):
+                processor.log.info("Sonuç önbellekten döndürüldü (ETag).")
+                if snapshot is not None:
+                    account, snapshot_id = snapshot
+                    return _with_result_id(_with_snapshot_diff(cached, snapshot_store, account, snapshot_id),
+                                           result_pages, fingerprint, snapshot_id)
+                return _with_result_id(cached, result_pages, fingerprint)
+
+            _download_and_extract(processor)
+
+        # Gerekli öğelerin içeriği (CRC32 + boyut) daha önce analiz edildiyse tekrar hesaplama
+        cached = result_cache.get(processor.fingerprint) if result_cache else None
+        # Anlık görüntüler arşivin kendi hesabına kaydedilir; hesap bilgisi yoksa görüntü tutulmaz.
+        # Önbellekte sonuç yoksa hesap bilgileri analiz öğeleriyle birlikte getirilip sonra okunur
+        account_read = cached is not None and snapshot_store is not None
+        account = processor.read_account() if account_read else None
+        # Anlık görüntü isteniyorsa önbellek ancak bu arşivin görüntüsü zaten kayıtlıysa kullanılabilir
+        snapshot_id = snapshot_store.find_snapshot(account, processor.fingerprint) \
+            if cached is not None and account else None
+        if cached is not None and (not account or snapshot_id is not None):
+            processor.log.info("Sonuç önbellekten döndürüldü (arşiv parmak izi).")
+            if account:
+                cached = _with_snapshot_diff(cached, snapshot_store, account, snapshot_id)
+            return _with_result_id(cached, result_pages, processor.fingerprint, snapshot_id)
+
+        # Uzak arşivde gerekli öğeler tek toplu Range isteğiyle gelir; dosya bu arada değiştiyse tam indir
+        if not processor.fetch_remote_members():
+            _download_and_extract(processor)
+        if snapshot_store is not None and not account_read:
+            account = processor.read_account()
+
+        try:
+            results = processor.run_analysis()
+        except Exception as e:
+            processor.log.exception("Analiz sırasında beklenmedik hata oluştu: %s", e)
+            raise PipelineError(f"Analiz sırasında hata oluştu: {e}") from e
+
+        if result_cache is not None:
+            result_cache.set(processor.fingerprint, results,
+                             alias=url_validator_key(download_url, processor.remote_etag, processor.remote_size))
+
+        if account:
+            store = processor.username_store
+            snapshot_id = snapshot_store.add_snapshot(account, processor.fingerprint,
+                                                      store.decode(store.ids('followers')),
+                                                      store.decode(store.ids('following')))
+            results = _with_snapshot_diff(results, snapshot_store, account, snapshot_id)
+        return _with_result_id(results, result_pages, processor.fingerprint, snapshot_id)
+    finally:
+        processor.cleanup()
+        processor.instrumentation.finish()
+
+
+class JobManager:
+    """
+    Analizleri arka planda AnalysisExecutor üzerinde çalıştırır (kuyruk doluysa submit ExecutorBusy fırlatır).
+    İstek hemen bir iş kimliği ile döner; durum ve sonuçlar get() ile sorgulanır.
+    İş kayıtları durum deposunda tutulur; depo Redis ise herhangi bir işçi sorguyu yanıtlayabilir.
+    İş sonucu yalnızca metrikler + sonuç kimliğidir; listeler GET /results/<id>/lists/<key> ile sayfalanır.
+    """
+
+    def __init__(self, executor: AnalysisExecutor = None, job_ttl: int = JOB_TTL_SECONDS,
+                 result_cache: ResultCache = None, store=None, result_pages: ResultPages = None,
+                 snapshot_store: SnapshotStore = None, columnar_store: ColumnarStore = None,
+                 scratch_manager: ScratchManager = None):
+        self.executor = executor if executor is not None else AnalysisExecutor()
+        self.store = store if store is not None else InMemoryStateStore()
+        self.job_ttl = job_ttl
+        self.result_cache = result_cache
+        self.result_pages = result_pages if result_pages is not None else ResultPages(self.store)
+        self.snapshot_store = snapshot_store
+        self.columnar_store = columnar_store
+        self.scratch_manager = scratch_manager if scratch_manager is not None else default_scratch
+        # Aşama/bayt ilerlemesi (GET /jobs/<id> ve SSE akışı buradan okur)
+        self.progress = ProgressTracker(self.store, ttl=job_ttl)
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    def submit(self, download_url: str, username: str = None) -> str:
+        """
+        Yeni bir analiz işi kuyruğa ekler ve iş kimliğini döndürür.
+        Kuyruk ya da geçici alan doluysa ExecutorBusy (ScratchSpaceFull) fırlatır.
+        """
+        self.scratch_manager.admit()
+        job_id = uuid.uuid4().hex
+        self.store.set(self._key(job_id), {
+            "job_id": job_id,
+            "state": JOB_QUEUED,
+            "created_at": time.time(),
+            "finished_at": None,
+            "results": None,
+            "message": None,
+            "metrics": None,
+        }, ttl=self.job_ttl)
+        self.progress.start(job_id)
+        try:
+            self.executor.submit(self._run, job_id, download_url, username)
+        except ExecutorBusy:
+            # Reddedilen iş için kayıt bırakma
+            self.store.delete(self._key(job_id))
+            self.progress.discard(job_id)
+            raise
+        return job_id
+
+    def get(self, job_id: str):
+        """İşin güncel durumunun bir kopyasını döndürür; iş yoksa None."""
+        job = self.store.get(self._key(job_id))
+        if job is None:
+            return None
+        job = dict(job)
+        job["progress"] = self.progress.get(job_id)[1]
+        return job
+
+    def _run(self, job_id: str, download_url: str, username: str):
+        # Bu iş parçacığında yazılan tüm günlük kayıtları iş kimliğini taşır
+        token = current_job_id.set(job_id)
+        started = time.perf_counter()
+        self._update(job_id, state=JOB_RUNNING)
+        # Aşama ölçümleri iş kaydına eklenir (hata durumunda da)
+        recorder = PhaseRecorder()
+        try:
+            results = run_pipeline(download_url, username, progress_callback=self.progress.callback_for(job_id),
+                                   result_cache=self.result_cache, snapshot_store=self.snapshot_store,
+                                   columnar_store=self.columnar_store,
+                                   parse_executor=self.executor.parse_pool, recorder=recorder,
+                                   scratch_manager=self.scratch_manager, result_pages=self.result_pages)
+            self._update(job_id, state=JOB_SUCCESS, results=ResultPages.summary(results, results["result_id"]),
+                         finished_at=time.time(), metrics=recorder.as_dict())
+            log_duration(logger, "Analiz işi tamamlandı.", started, state=JOB_SUCCESS)
+        except (PipelineError, ExecutorBusy) as e:
+            # ExecutorBusy: iş kabul edildikten sonra geçici alan kotası doldu (ScratchSpaceFull)
+            self._update(job_id, state=JOB_ERROR, message=str(e), finished_at=time.time(),
+                         metrics=recorder.as_dict())
+            log_duration(logger, "Analiz işi başarısız: %s", started, e, state=JOB_ERROR)
+        except Exception as e:
+            logger.exception("İş sırasında beklenmedik hata: %s", e)
+            self._update(job_id, state=JOB_ERROR, message=f"Beklenmedik hata: {e}", finished_at=time.time(),
+                         metrics=recorder.as_dict())
+        finally:
+            # Son durumu kısıtlamaya takılmadan yayınla; bekleyen SSE bağlantıları uyanır
+            self.progress.update(job_id, PHASE_DONE, force=True)
+            current_job_id.reset(token)
+
+    def _update(self, job_id: str, **fields):
+        # İş kaydını yalnızca işi çalıştıran iş parçacığı günceller; yeni bir sözlük yazılır
+        job = self.store.get(self._key(job_id))
+        if job is not None:
+            self.store.set(self._key(job_id), {**job, **fields}, ttl=self.job_ttl)
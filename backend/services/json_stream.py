@@ -0,0 +1,124 @@
+import json
+
+# Arşiv öğesinden her seferinde okunacak karakter sayısı
+READ_CHUNK_SIZE = 1024 * 64
+
+_WHITESPACE = ' \t\n\r'
+# Bir JSON değerinin hemen ardından gelip sayının devamı olabilecek karakterler
+_NUMBER_CHARS = '0123456789.eE+-'
+
+
+class _StreamReader:
+    """
+    Metin akışını parça parça okuyan küçük yardımcı. Yalnızca o anda ayrıştırılan değer
+    ve okunmamış parça bellekte tutulur; dizi elemanları tek tek json.JSONDecoder ile çözülür.
+    """
+
+    def __init__(self, stream, chunk_size: int = READ_CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Akıştan bir parça daha okur; akış bittiyse False döner."""
+        if self.eof:
+            return False
+
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        # Tüketilmiş kısmı at; tampon yalnızca okunmamış veriyi taşır
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Boşlukları atlayıp sıradaki karakteri döndürür (akış bittiyse '')."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ''
+
+    def advance(self):
+        self.position += 1
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Beklenen '{char}', bulunan '{found}' (konum {self.position})")
+        self.advance()
+
+    def decode_value(self):
+        """Sıradaki tam JSON değerini çözer; değer tamponun sonuna taşıyorsa daha fazla okur."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # Sayı gibi değerler tampon sınırında bölünmüş olabilir ('-8.' + '5e3'); emin olmak için devam et
+            if (end == len(self.buffer) or self.buffer[end] in _NUMBER_CHARS) and self._fill():
+                continue
+
+            self.position = end
+            return value
+
+    def iter_array(self):
+        """İmleç '[' üzerindeyken dizinin elemanlarını tek tek döndürür."""
+        self.expect('[')
+        while True:
+            char = self.peek()
+            if char == ']':
+                self.advance()
+                return
+            if char == ',':
+                self.advance()
+                continue
+            if char == '':
+                raise ValueError("Dizi kapanmadan akış bitti")
+            yield self.decode_value()
+
+
+def iter_array_items(stream, key: str = None):
+    """
+    Bir JSON belgesindeki dizinin elemanlarını, belgenin tamamını belleğe almadan döndürür.
+    key None ise belgenin kendisi dizidir; aksi halde üst seviye nesnenin key alanındaki dizi okunur.
+    Beklenen yapı yoksa hiçbir şey döndürmez.
+    """
+    reader = _StreamReader(stream)
+
+    if key is None:
+        if reader.peek() == '[':
+            yield from reader.iter_array()
+        return
+
+    if reader.peek() != '{':
+        return
+    reader.advance()
+
+    while True:
+        char = reader.peek()
+        if char in ('}', ''):
+            return
+        if char == ',':
+            reader.advance()
+            continue
+
+        field = reader.decode_value()
+        reader.expect(':')
+        if field == key and reader.peek() == '[':
+            yield from reader.iter_array()
+            return
+        # İlgilenmediğimiz alanın değerini atla
+        reader.decode_value()
@@ -0,0 +1,62 @@
+# Her analizin Instagram dışa aktarım arşivinden hangi dosyalara ihtiyaç duyduğunu
+# tanımlayan bildirimsel liste. DataProcessor yalnızca burada listelenen öğeleri okur;
+# yeni bir analiz eklemek için buraya yeni bir giriş eklemek yeterlidir.
+
+from .extractors import (
+    SHAPE_EMBEDDED_LIST,
+    SHAPE_KEY_AND_VALUE,
+    SHAPE_TITLE,
+    SHAPE_TOP_LEVEL_LIST,
+    SHAPE_VALUE,
+)
+
+FILE_PATH_PREFIX = 'connections/followers_and_following/'
+
+DEFAULT_ANALYSIS = 'follow_analysis'
+
+# Dışa aktarımın sahibi olan hesabın bilgileri (kullanıcı adı). İlişki olarak ayrıştırılmaz;
+# takipçi anlık görüntüleri istemcinin gönderdiği ada değil buradaki hesaba kaydedilir.
+PERSONAL_INFORMATION_PATH = 'personal_information/personal_information/personal_information.json'
+
+# analiz adı -> {veri anahtarı: arşiv içindeki göreli yol}
+# Yol bir desen olabilir; büyük hesaplarda takipçiler followers_1.json, followers_2.json, ...
+# parçalarına bölünür ve hepsi sırayla birleştirilir.
+ANALYSIS_MANIFESTS = {
+    'follow_analysis': {
+        'followers': FILE_PATH_PREFIX + 'followers_[0-9]*.json',
+        'following': FILE_PATH_PREFIX + 'following.json',
+        'blocked': FILE_PATH_PREFIX + 'blocked_profiles.json',
+        'unfollowed': FILE_PATH_PREFIX + 'recently_unfollowed_profiles.json',
+        'accepted_requests': FILE_PATH_PREFIX + 'recent_follow_requests.json',
+        'received_requests': FILE_PATH_PREFIX + 'follow_requests_you\'ve_received.json',
+        'hide_story_from': FILE_PATH_PREFIX + 'hide_story_from.json',
+        'pending_requests': FILE_PATH_PREFIX + 'pending_follow_requests.json',
+        'restricted_profiles': FILE_PATH_PREFIX + 'restricted_profiles.json',
+    },
+}
+
+# veri anahtarı -> (belge biçimi, ana anahtar); biçimler için bkz. extractors.py
+RELATION_SPECS = {
+    'followers': (SHAPE_TOP_LEVEL_LIST, None),
+    'following': (SHAPE_TITLE, 'relationships_following'),
+    'blocked': (SHAPE_TITLE, 'relationships_blocked_users'),
+    'unfollowed': (SHAPE_KEY_AND_VALUE, 'relationships_unfollowed_users'),
+    'accepted_requests': (SHAPE_KEY_AND_VALUE, 'relationships_permanent_follow_requests'),
+    'received_requests': (SHAPE_VALUE, None),
+    'hide_story_from': (SHAPE_KEY_AND_VALUE, 'relationships_hide_stories_from'),
+    'pending_requests': (SHAPE_KEY_AND_VALUE, 'relationships_follow_requests_sent'),
+    'restricted_profiles': (SHAPE_EMBEDDED_LIST, 'relationships_restricted_users'),
+}
+
+
+def required_members(analyses=(DEFAULT_ANALYSIS,)) -> dict:
+    """
+    Verilen analizlerin ihtiyaç duyduğu tüm arşiv öğelerini tek bir sözlükte birleştirir.
+    Aynı veri anahtarı birden fazla analizde geçiyorsa tek sefer okunur.
+    """
+    members = {}
+    for analysis in analyses:
+        if analysis not in ANALYSIS_MANIFESTS:
+            raise ValueError(f"Bilinmeyen analiz: {analysis}")
+        members.update(ANALYSIS_MANIFESTS[analysis])
+    return members
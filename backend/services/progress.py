@@ -0,0 +1,86 @@
+import threading
+import time
+
+# Aynı aşama içinde iki ilerleme yayını arasındaki en kısa süre (saniye)
+MIN_PUBLISH_INTERVAL = 0.5
+
+# Analiz hattının aşamaları
+PHASE_QUEUED = 'queued'
+PHASE_REMOTE_READ = 'remote_read'
+PHASE_DOWNLOAD = 'download'
+PHASE_EXTRACT = 'extract'
+PHASE_ANALYSIS = 'analysis'
+PHASE_DONE = 'done'
+
+
+class ProgressTracker:
+    """
+    İş başına ilerleme bilgisini (aşama, indirilen bayt, okunan öğe) durum deposunda tutar.
+    Güncellemeler kısıtlanır: aşama değişmedikçe en fazla MIN_PUBLISH_INTERVAL'de bir yayınlanır.
+    Aynı süreçteki bekleyen SSE bağlantıları hemen uyandırılır; başka işçilerin yayınları
+    depo MIN_PUBLISH_INTERVAL aralıklarla yoklanarak görülür.
+    """
+
+    def __init__(self, store, ttl: int, min_interval: float = MIN_PUBLISH_INTERVAL):
+        self.store = store
+        self.ttl = ttl
+        self.min_interval = min_interval
+        self._condition = threading.Condition()
+        # Bu süreçte çalışan işlerin son yayınlanan durumu (kısıtlama için):
+        # job_id -> {"version": int, "published_at": float, "progress": dict}
+        self._entries = {}
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"progress:{job_id}"
+
+    def start(self, job_id: str):
+        self.store.set(self._key(job_id), {"version": 0, "progress": {"phase": PHASE_QUEUED}}, ttl=self.ttl)
+
+    def discard(self, job_id: str):
+        """Hiç çalıştırılmayan (reddedilen) işin ilerleme kaydını siler."""
+        self.store.delete(self._key(job_id))
+
+    def update(self, job_id: str, phase: str, force: bool = False, **fields):
+        """İlerlemeyi günceller; kısıtlama süresi dolmadıysa sessizce yok sayar."""
+        now = time.monotonic()
+        with self._condition:
+            entry = self._entries.setdefault(job_id, {"version": 0, "published_at": 0.0, "progress": {}})
+
+            phase_changed = entry["progress"].get("phase") != phase
+            if not (force or phase_changed or now - entry["published_at"] >= self.min_interval):
+                return
+
+            progress = dict(entry["progress"]) if not phase_changed else {}
+            progress.update(fields, phase=phase)
+            entry.update(progress=progress, published_at=now, version=entry["version"] + 1)
+            self.store.set(self._key(job_id), {"version": entry["version"], "progress": progress}, ttl=self.ttl)
+
+            # İş bitti; yerel kısıtlama durumuna artık gerek yok
+            if phase == PHASE_DONE:
+                del self._entries[job_id]
+            self._condition.notify_all()
+
+    def get(self, job_id: str):
+        """(sürüm, ilerleme) döndürür; iş yoksa (None, None)."""
+        entry = self.store.get(self._key(job_id))
+        if entry is None:
+            return None, None
+        return entry["version"], dict(entry["progress"])
+
+    def wait_for_update(self, job_id: str, last_version: int, timeout: float):
+        """last_version'dan yeni bir sürüm yayınlanana ya da timeout dolana kadar bekler."""
+        deadline = time.monotonic() + timeout
+        while True:
+            version, progress = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if progress is None or version != last_version or remaining <= 0:
+                return version, progress
+            with self._condition:
+                self._condition.wait(timeout=min(remaining, self.min_interval))
+
+    def callback_for(self, job_id: str):
+        """DataProcessor'a verilecek ilerleme fonksiyonunu üretir."""
+        def report(phase: str, force: bool = False, **fields):
+            self.update(job_id, phase, force=force, **fields)
+        return report
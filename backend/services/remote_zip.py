@@ -0,0 +1,176 @@
+import io
+import re
+import threading
+
+import requests
+
+# İlk istekte dosyanın sonundan okunacak bayt sayısı (EOCD + çoğu zaman merkez dizinin tamamı)
+TAIL_SIZE = 1024 * 256
+# Önbellekte olmayan bir okuma için en az bu kadar bayt istenir
+MIN_FETCH_SIZE = 1024 * 64
+# Önceden getirilen iki aralık arasındaki boşluk bundan küçükse tek istekte birleştirilir
+MERGE_GAP = 1024 * 64
+
+_CONTENT_RANGE_RE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+
+
+class RangeRequestsNotSupported(Exception):
+    """Sunucu HTTP Range isteklerini desteklemiyor (206 yerine 200 döndü)."""
+
+    def __init__(self, message: str, headers=None):
+        super().__init__(message)
+        # Yanıt başlıkları (ETag / Content-Length önbellek anahtarı için kullanılabilir)
+        self.headers = headers or {}
+
+
+class HttpRangeFile(io.RawIOBase):
+    """
+    Uzak bir dosyayı HTTP Range istekleriyle okuyan, seek edilebilir salt okunur dosya nesnesi.
+    ZipFile'a doğrudan verilebilir: önce dosyanın sonundaki merkez dizin, sonra yalnızca
+    okunan öğelerin baytları indirilir.
+    """
+
+    def __init__(self, url: str, session=None, tail_size: int = TAIL_SIZE, timeout: int = 30):
+        self.url = url
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self._owns_session = session is None
+        self._lock = threading.Lock()
+        self._position = 0
+        # (başlangıç, bayt) çiftleri; okunan aralıklar kapanana kadar bellekte tutulur
+        self._segments = []
+
+        self.bytes_fetched = 0
+        self.request_count = 0
+        self.etag = None
+        try:
+            self.size = self._probe(tail_size)
+        except Exception:
+            if self._owns_session:
+                self.session.close()
+            raise
+
+    def _probe(self, tail_size: int) -> int:
+        """Dosyanın son baytlarını ister; sunucunun Range desteğini ve toplam boyutu öğrenir."""
+        with self.session.get(self.url, headers={'Range': f'bytes=-{tail_size}'},
+                              stream=True, timeout=self.timeout) as r:
+            r.raise_for_status()
+            match = _CONTENT_RANGE_RE.match(r.headers.get('Content-Range', ''))
+            if r.status_code != 206 or not match or match.group(3) == '*':
+                # Gövdeyi okumadan bağlantıyı kapat; tam indirme ayrı yapılacak
+                raise RangeRequestsNotSupported(f"HTTP {r.status_code}", headers=r.headers)
+
+            start = int(match.group(1))
+            data = r.content
+            self.etag = r.headers.get('ETag')
+
+        self.request_count += 1
+        self.bytes_fetched += len(data)
+        self._segments.append((start, data))
+        return int(match.group(3))
+
+    def _fetch(self, start: int, end: int) -> bytes:
+        """
+        [start, end) aralığını tek bir Range isteğiyle indirir. Yanıtın Content-Range başlangıcı ve
+        toplam boyutu açılıştakiyle aynı olmalı; değilse dosya okuma sırasında değişmiştir (ya da sunucu
+        aralığı yok saymıştır) ve RangeRequestsNotSupported fırlatılır, çağıran tam indirmeye geçer.
+        """
+        headers = {'Range': f'bytes={start}-{end - 1}'}
+        r = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        r.raise_for_status()
+        if r.status_code != 206:
+            raise RangeRequestsNotSupported(f"HTTP {r.status_code}")
+
+        content_range = r.headers.get('Content-Range', '')
+        match = _CONTENT_RANGE_RE.match(content_range)
+        if not match or int(match.group(1)) != start or match.group(3) != str(self.size):
+            raise RangeRequestsNotSupported(
+                f"Content-Range uyuşmuyor: {content_range or '-'} (istenen bytes {start}-{end - 1}/{self.size})")
+
+        self.request_count += 1
+        self.bytes_fetched += len(r.content)
+        return r.content
+
+    def _find_segment(self, start: int, end: int):
+        for segment_start, data in self._segments:
+            if segment_start <= start and end <= segment_start + len(data):
+                return segment_start, data
+        return None
+
+    def prefetch(self, ranges):
+        """
+        Verilen [başlangıç, bitiş) aralıklarını önceden indirir.
+        Birbirine yakın aralıklar (MERGE_GAP) tek istekte birleştirilir.
+        """
+        pending = sorted(
+            (max(0, start), min(self.size, end)) for start, end in ranges
+            if not self._find_segment(max(0, start), min(self.size, end))
+        )
+        merged = []
+        for start, end in pending:
+            if merged and start - merged[-1][1] <= MERGE_GAP:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        with self._lock:
+            for start, end in merged:
+                if start < end:
+                    self._segments.append((start, self._fetch(start, end)))
+
+    # --- io.RawIOBase arayüzü ---
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            self._position = self.size + offset
+        else:
+            raise ValueError(f"Geçersiz whence değeri: {whence}")
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        start = self._position
+        end = min(start + len(buffer), self.size)
+        if start >= end:
+            return 0
+
+        with self._lock:
+            segment = self._find_segment(start, end)
+            if segment is None:
+                fetch_end = min(max(end, start + MIN_FETCH_SIZE), self.size)
+                segment = (start, self._fetch(start, fetch_end))
+                self._segments.append(segment)
+
+        segment_start, data = segment
+        length = end - start
+        buffer[:length] = data[start - segment_start:end - segment_start]
+        self._position = end
+        return length
+
+    def close(self):
+        self._segments = []
+        if self._owns_session:
+            self.session.close()
+        super().close()
+
+
+def member_byte_range(zip_info) -> tuple:
+    """
+    Bir ZIP öğesinin yerel başlık + sıkıştırılmış veri aralığını tahmin eder.
+    Yerel başlıktaki 'extra' alanı merkez dizindekinden farklı olabileceği için pay bırakılır.
+    """
+    start = zip_info.header_offset
+    header_size = 30 + len(zip_info.filename.encode('utf-8')) + len(zip_info.extra) + 1024
+    return start, start + header_size + zip_info.compress_size
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+from urllib.parse import urlsplit
+
+from .state_store import InMemoryStateStore
+
+# Bellek içi önbellekteki sonuçların toplamda kaplayabileceği yaklaşık bayt (dolunca en az kullanılan atılır)
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+# Bir sonucun önbellekte kalma süresi (saniye)
+RESULT_CACHE_TTL_SECONDS = int(os.environ.get('RESULT_CACHE_TTL_SECONDS', 60 * 60))
+
+# Analiz çıktısının biçimi değiştiğinde artırılır; eski önbellek kayıtları geçersiz olur
+RESULT_SCHEMA_VERSION = 2
+
+
+def archive_fingerprint(zip_ref, index, manifest: dict) -> str:
+    """
+    Analizin okuduğu arşiv öğelerinin içerik parmak izi.
+    Merkez dizindeki CRC32 ve boyut değerlerinden üretilir; öğe verisi okunmaz.
+    """
+    entries = []
+    for key, relative_path in sorted(manifest.items()):
+        members = []
+        for member_name in index.resolve_members(relative_path):
+            info = zip_ref.getinfo(member_name)
+            members.append([info.CRC, info.file_size])
+        entries.append([key, members])
+
+    payload = json.dumps([RESULT_SCHEMA_VERSION, entries], separators=(',', ':'))
+    return 'archive:' + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def url_validator_key(download_url: str, etag: str, content_length) -> str:
+    """
+    Sunucunun ETag + Content-Length değerlerinden bir takma ad anahtarı üretir.
+    İmzalı URL'lerin sorgu kısmı her seferinde değiştiği için yalnızca host ve yol kullanılır.
+    Zayıf (W/) ETag'ler içerik eşitliğini garanti etmediği için kullanılmaz.
+    """
+    if not etag or etag.startswith('W/') or not content_length:
+        return None
+
+    parts = urlsplit(download_url)
+    payload = json.dumps([RESULT_SCHEMA_VERSION, parts.netloc, parts.path, etag, int(content_length)])
+    return 'etag:' + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    İçerik adresli analiz sonucu önbelleği (TTL + LRU).
+    Asıl anahtar arşiv parmak izidir; ETag anahtarları bu parmak izine takma ad olarak tutulur,
+    böylece aynı dosya indirilmeden tanınabilir.
+    Paylaşımlı (Redis) bir depo verilirse tüm işçiler aynı önbelleği kullanır.
+    """
+
+    def __init__(self, store=None, max_bytes: int = RESULT_CACHE_MAX_BYTES, ttl: int = RESULT_CACHE_TTL_SECONDS):
+        # Bellek içi depoda sonuçlar kendi boyut sınırıyla ayrı tutulur
+        self._store = store if store is not None and store.shared else InMemoryStateStore(max_bytes=max_bytes)
+        self.ttl = ttl
+
+    def get(self, fingerprint: str):
+        if not fingerprint:
+            return None
+        return self._store.get(f"result:{fingerprint}")
+
+    def fingerprint_for(self, alias: str):
+        """Takma ada (ETag anahtarı) karşılık gelen arşiv parmak izi; bilinmiyorsa None."""
+        if not alias:
+            return None
+        return self._store.get(f"alias:{alias}")
+
+    def set(self, fingerprint: str, results: dict, alias: str = None):
+        if not fingerprint:
+            return
+        self._store.set(f"result:{fingerprint}", results, ttl=self.ttl)
+        if alias:
+            self._store.set(f"alias:{alias}", fingerprint, ttl=self.ttl)
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import uuid
+from bisect import bisect_left
+from itertools import islice, takewhile
+
+# Saklanan analiz sonuçlarının (liste sayfaları için) tutulacağı süre (saniye)
+RESULT_PAGES_TTL_SECONDS = int(os.environ.get('RESULT_PAGES_TTL_SECONDS', 60 * 60))
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Listeler depoda bu boyutta parçalar halinde tutulur; bir sayfa en fazla birkaç parça okur
+RESULT_PAGES_CHUNK_SIZE = int(os.environ.get('RESULT_PAGES_CHUNK_SIZE', 1000))
+
+# Dosya sırasıyla tutulan (alfabetik sıralı olmayan) listeler; önek araması doğrusal yapılır
+UNSORTED_LISTS = {'recent_followers_list'}
+
+
+class InvalidPageRequest(ValueError):
+    """cursor / limit parametreleri geçersiz."""
+
+
+class _MissingChunk(Exception):
+    """Listenin bir parçası depodan düşmüş (süresi dolmuş ya da atılmış)."""
+
+
+def result_id_for(fingerprint: str, snapshot_id: int = None) -> str:
+    """
+    Arşiv parmak izinden (ve sonuçlara eklenmiş anlık görüntü farkından) türetilen sonuç kimliği.
+    Aynı dışa aktarımın tekrar gönderilmesi aynı kimliği verir; sonuç depoda tek kopya kalır.
+    """
+    payload = fingerprint if snapshot_id is None else f"{fingerprint}:snapshot:{snapshot_id}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class ResultPages:
+    """
+    Analiz sonuçlarını bir sonuç kimliğiyle saklar ve kullanıcı listelerini sayfa sayfa sunar.
+    Her liste depoda chunk_size'lık parçalar halinde ayrı anahtarlarda durur; listenin başlık
+    anahtarı uzunluğu ve her parçanın ilk kullanıcı adını tutar. Bir sayfa istendiğinde
+    yalnızca o sayfanın düştüğü parçalar okunur.
+    """
+
+    def __init__(self, store, ttl: int = RESULT_PAGES_TTL_SECONDS, chunk_size: int = RESULT_PAGES_CHUNK_SIZE):
+        self.store = store
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+
+    def save(self, results: dict, result_id: str = None) -> str:
+        """
+        Sonuçları saklar ve istemcinin sayfa isteklerinde kullanacağı sonuç kimliğini döndürür.
+        result_id verilmezse (bkz. result_id_for) rastgele bir kimlik üretilir. Aynı kimlikle
+        zaten saklanmış listeler yeniden yazılmaz, yalnızca süreleri uzatılır.
+        """
+        result_id = result_id or uuid.uuid4().hex
+        user_lists = results.get("user_lists", {})
+        for list_key, usernames in user_lists.items():
+            key = f"lists:{result_id}:{list_key}"
+            if not self._touch_list(key, len(usernames)):
+                self._write_list(key, usernames)
+        self.store.set(f"lists:{result_id}:summary", self.summary(results, result_id), ttl=self.ttl)
+        return result_id
+
+    def _chunk_count(self, total: int) -> int:
+        return -(-total // self.chunk_size)
+
+    def _touch_list(self, key: str, total: int) -> bool:
+        """Başlığın ve tüm parçaların süresini uzatır; herhangi biri yoksa False döner."""
+        if not self.store.touch(key, ttl=self.ttl):
+            return False
+        return all([self.store.touch(f"{key}:{index}", ttl=self.ttl) for index in range(self._chunk_count(total))])
+
+    def _write_list(self, key: str, usernames: list):
+        # Parçalar başlıktan önce yazılır; başlığı gören okuyucu parçaları da bulur
+        firsts = []
+        for index in range(self._chunk_count(len(usernames))):
+            chunk = usernames[index * self.chunk_size:(index + 1) * self.chunk_size]
+            firsts.append(chunk[0])
+            self.store.set(f"{key}:{index}", chunk, ttl=self.ttl)
+        self.store.set(key, {"total": len(usernames), "chunk_size": self.chunk_size, "firsts": firsts}, ttl=self.ttl)
+
+    @staticmethod
+    def summary(results: dict, result_id: str) -> dict:
+        """Listeler olmadan, metrikler + sonuç kimliği + liste boyutlarından oluşan hafif yanıt."""
+        return {
+            "result_id": result_id,
+            "all_metrics": results.get("all_metrics", {}),
+            "list_sizes": {key: len(usernames) for key, usernames in results.get("user_lists", {}).items()},
+            "timeline": results.get("timeline"),
+        }
+
+    def get_summary(self, result_id: str):
+        return self.store.get(f"lists:{result_id}:summary")
+
+    def get_page(self, result_id: str, list_key: str, cursor=None, limit=None, prefix: str = None):
+        """
+        Listenin bir sayfasını döndürür; sonuç ya da liste yoksa None.
+        cursor listedeki mutlak konumdur (ilk sayfa için boş). prefix verilirse yalnızca
+        o önekle başlayan kullanıcı adları döner; sıralı listelerde başlangıç ikili aramayla bulunur.
+        """
+        try:
+            cursor = int(cursor) if cursor not in (None, '') else None
+            limit = int(limit) if limit not in (None, '') else DEFAULT_PAGE_SIZE
+        except ValueError:
+            raise InvalidPageRequest("cursor ve limit tamsayı olmalıdır.")
+        if (cursor is not None and cursor < 0) or not 1 <= limit <= MAX_PAGE_SIZE:
+            raise InvalidPageRequest(f"limit 1 ile {MAX_PAGE_SIZE} arasında, cursor negatif olmayan bir sayı olmalıdır.")
+
+        key = f"lists:{result_id}:{list_key}"
+        header = self.store.get(key)
+        if header is None:
+            return None
+
+        prefix = (prefix or '').lower()
+        sorted_list = list_key not in UNSORTED_LISTS
+        # Bu istekte okunan parçalar (ikili arama ile tarama aynı parçayı ikinci kez okumasın)
+        chunks = {}
+        try:
+            if cursor is None:
+                cursor = self._bisect(key, header, prefix, chunks) if prefix and sorted_list else 0
+
+            entries = self._iter_from(key, header, cursor, chunks)
+            if prefix and sorted_list:
+                # Sıralı listede önek aralığı ilk eşleşmeyen kullanıcı adında biter
+                entries = takewhile(lambda entry: entry[1].startswith(prefix), entries)
+            elif prefix:
+                entries = (entry for entry in entries if entry[1].startswith(prefix))
+
+            # Sayfadan sonraki ilk eşleşme de okunur: varsa konumu bir sonraki sayfanın cursor'ıdır
+            items, next_cursor = [], None
+            for position, username in entries:
+                if len(items) == limit:
+                    next_cursor = str(position)
+                    break
+                items.append(username)
+        except _MissingChunk:
+            return None
+
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+            "total": header["total"],
+        }
+
+    def _chunk(self, key: str, index: int, chunks: dict) -> list:
+        if index not in chunks:
+            chunk = self.store.get(f"{key}:{index}")
+            if chunk is None:
+                raise _MissingChunk(f"{key}:{index}")
+            chunks[index] = chunk
+        return chunks[index]
+
+    def _iter_from(self, key: str, header: dict, start: int, chunks: dict):
+        """start konumundan itibaren (konum, kullanıcı adı) çiftlerini parça parça okuyarak döndürür."""
+        chunk_size = header["chunk_size"]
+        index, offset = divmod(start, chunk_size)
+        while index * chunk_size < header["total"]:
+            chunk = self._chunk(key, index, chunks)
+            yield from enumerate(islice(chunk, offset, None), start=index * chunk_size + offset)
+            index, offset = index + 1, 0
+
+    def _bisect(self, key: str, header: dict, prefix: str, chunks: dict) -> int:
+        """Sıralı listede prefix'ten küçük olmayan ilk kullanıcı adının konumu; tek parça okunur."""
+        index = bisect_left(header["firsts"], prefix) - 1
+        if index < 0:
+            return 0
+        return index * header["chunk_size"] + bisect_left(self._chunk(key, index, chunks), prefix)
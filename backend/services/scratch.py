@@ -0,0 +1,217 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from .executor import ExecutorBusy
+
+# İşlerin geçici klasörlerinin (indirilen ZIP, çıkarılan dosyalar) oluşturulduğu dizin
+SCRATCH_DIR = os.environ.get(
+    'SCRATCH_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'scratch'))
+# Geçici klasörlerin toplamda kullanabileceği en fazla bayt
+SCRATCH_QUOTA_BYTES = int(os.environ.get('SCRATCH_QUOTA_BYTES', 2 * 1024 * 1024 * 1024))
+# Sahibi olmayan (yarım kalmış, çöken işlerden kalan) klasörler bu süreden eskiyse silinir (saniye)
+SCRATCH_MAX_AGE_SECONDS = int(os.environ.get('SCRATCH_MAX_AGE_SECONDS', 60 * 60))
+# Temizlikçinin dizini tarama aralığı (saniye)
+SCRATCH_JANITOR_INTERVAL_SECONDS = int(os.environ.get('SCRATCH_JANITOR_INTERVAL_SECONDS', 60))
+
+# Her iş klasöründe, iş sürdükçe dokunulan nabız dosyası; yaş klasörün ve bu dosyanın en yenisinden hesaplanır
+HEARTBEAT_FILENAME = '.heartbeat'
+
+logger = logging.getLogger(__name__)
+
+
+class ScratchSpaceFull(ExecutorBusy):
+    """Geçici alan kotası dolu; iş kabul edilmez ya da yazmadan önce durdurulur (429 ile aynı davranış)."""
+
+
+def _last_activity(path: str) -> float:
+    """Klasörün (ya da dosyanın) ve varsa nabız dosyasının en yeni değiştirilme zamanı; yoksa OSError."""
+    mtime = os.path.getmtime(path)
+    try:
+        return max(mtime, os.path.getmtime(os.path.join(path, HEARTBEAT_FILENAME)))
+    except OSError:
+        return mtime
+
+
+def _tree_size(path: str) -> int:
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(directory, name))
+            except OSError:
+                pass
+    return total
+
+
+class ScratchDir:
+    """Bir işin geçici klasörü ve kota içinde ayırdığı bayt miktarı."""
+
+    def __init__(self, manager: 'ScratchManager', path: str):
+        self.manager = manager
+        self.path = path
+        self.reserved = 0
+        self.heartbeat()
+
+    def heartbeat(self):
+        """
+        Nabız dosyasına dokunur: kök dizini paylaşan diğer işçilerin temizlikçileri klasörü canlı sayar.
+        Yer ayırırken ve bu süreçteki her taramada çağrılır; klasör silinmişse bir şey yapmaz.
+        """
+        try:
+            with open(os.path.join(self.path, HEARTBEAT_FILENAME), 'a'):
+                pass
+            os.utime(os.path.join(self.path, HEARTBEAT_FILENAME))
+        except OSError:
+            pass
+
+    def reserve(self, nbytes: int):
+        """Yazmadan önce nbytes daha yer ayırır; kotada ya da diskte yer yoksa ScratchSpaceFull."""
+        self.heartbeat()
+        self.manager._reserve(self, nbytes)
+
+    def release(self):
+        """Klasörü siler ve ayrılan yeri kotaya geri verir."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.manager._release(self)
+
+
+class ScratchManager:
+    """
+    İşlerin geçici klasörlerini tek bir kök dizinde, toplam bayt kotasıyla yönetir.
+    İşler yazmadan önce yer ayırır (reserve); kota dolduğunda yeni işler kabul edilmez (admit)
+    ve ayırma ScratchSpaceFull fırlatır. Arka plandaki temizlikçi, sahibi olmayan ve
+    max_age'den eski klasörleri siler; sahipsiz ama henüz genç klasörler kotadan düşülür.
+    Kök dizini paylaşan diğer gunicorn işçilerinin klasörleri de bu süreç için sahipsizdir;
+    yaşları nabız dosyasından (bkz. ScratchDir.heartbeat) hesaplandığı için çalışan bir işin
+    klasörü, sahibi olan işçinin temizlikçisi çalıştığı sürece silinmez. max_age bu yüzden
+    janitor_interval'dan belirgin biçimde uzun olmalıdır.
+    Kök dizin ilk kullanımda oluşturulur; import sırasında diske dokunulmaz.
+    """
+
+    def __init__(self, root: str = SCRATCH_DIR, quota_bytes: int = SCRATCH_QUOTA_BYTES,
+                 max_age: int = SCRATCH_MAX_AGE_SECONDS, janitor_interval: int = SCRATCH_JANITOR_INTERVAL_SECONDS):
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.max_age = max_age
+        self.janitor_interval = janitor_interval
+        self._root_ready = False
+
+        self._lock = threading.Lock()
+        # Bu süreçte çalışan işlerin klasörleri (yol -> ScratchDir)
+        self._active = {}
+        self._reserved = 0
+        # Son taramada bulunan sahipsiz klasörlerin boyutu
+        self._orphan_bytes = 0
+        self._janitor = None
+        self._stop = threading.Event()
+
+    def _ensure_root(self):
+        if not self._root_ready:
+            os.makedirs(self.root, exist_ok=True)
+            self._root_ready = True
+
+    @property
+    def used_bytes(self) -> int:
+        """Çalışan işlerin ayırdığı + sahipsiz klasörlerin kapladığı bayt."""
+        return self._reserved + self._orphan_bytes
+
+    def _full_error(self) -> ScratchSpaceFull:
+        # Yer ancak bir iş bitince ya da temizlikçi çalışınca açılır
+        return ScratchSpaceFull(max(1, self.janitor_interval))
+
+    def admit(self):
+        """Yeni bir iş için yer yoksa ScratchSpaceFull fırlatır (iş kuyruğa alınmadan önce çağrılır)."""
+        if self.used_bytes >= self.quota_bytes:
+            raise self._full_error()
+
+    def allocate(self) -> ScratchDir:
+        """İş için benzersiz bir geçici klasör oluşturur."""
+        self.admit()
+        self._ensure_root()
+        scratch = ScratchDir(self, tempfile.mkdtemp(prefix='job-', dir=self.root))
+        with self._lock:
+            self._active[scratch.path] = scratch
+        return scratch
+
+    def _reserve(self, scratch: ScratchDir, nbytes: int):
+        if nbytes <= 0:
+            return
+        self._ensure_root()
+        with self._lock:
+            if self.used_bytes + nbytes > self.quota_bytes or shutil.disk_usage(self.root).free < nbytes:
+                logger.warning("Geçici alan yetersiz: %d bayt istendi, kullanılan %d / %d bayt.",
+                               nbytes, self.used_bytes, self.quota_bytes)
+                raise self._full_error()
+            scratch.reserved += nbytes
+            self._reserved += nbytes
+
+    def _release(self, scratch: ScratchDir):
+        with self._lock:
+            if self._active.pop(scratch.path, None) is not None:
+                self._reserved -= scratch.reserved
+                scratch.reserved = 0
+
+    def sweep(self, now: float = None) -> int:
+        """
+        Sahipsiz klasörlerden max_age'den eski olanları siler, kalanların boyutunu kotaya yansıtır.
+        Bu süreçteki işlerin nabzını da yeniler. Silinen klasör sayısını döndürür.
+        """
+        now = now if now is not None else time.time()
+        self._ensure_root()
+        with self._lock:
+            active = dict(self._active)
+        for scratch in active.values():
+            scratch.heartbeat()
+
+        removed, orphan_bytes = 0, 0
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if path in active:
+                continue
+            # Taramalar arasında sahibi (ya da başka bir işçinin temizlikçisi) silmiş olabilir
+            try:
+                age = now - _last_activity(path)
+                if age > self.max_age:
+                    if os.path.isdir(path):
+                        shutil.rmtree(path, ignore_errors=True)
+                    else:
+                        os.remove(path)
+                    removed += 1
+                else:
+                    orphan_bytes += _tree_size(path) if os.path.isdir(path) else os.path.getsize(path)
+            except OSError:
+                continue
+
+        with self._lock:
+            self._orphan_bytes = orphan_bytes
+        if removed:
+            logger.info("Temizlikçi %d eski geçici klasörü sildi.", removed)
+        return removed
+
+    def start_janitor(self):
+        """Temizlikçiyi arka planda (daemon iş parçacığı) başlatır; ilk tarama hemen yapılır."""
+        if self._janitor is not None:
+            return
+        self._janitor = threading.Thread(target=self._janitor_loop, name='scratch-janitor', daemon=True)
+        self._janitor.start()
+
+    def _janitor_loop(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("Geçici alan taraması başarısız.")
+            if self._stop.wait(self.janitor_interval):
+                return
+
+    def stop_janitor(self):
+        self._stop.set()
+
+
+# DataProcessor'ın varsayılan olarak kullandığı yönetici (temizlikçiyi app.py başlatır)
+default_scratch = ScratchManager()
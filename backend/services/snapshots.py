@@ -0,0 +1,249 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .username_store import ID_DTYPE, UsernameStore
+
+# Anlık görüntülerin tutulduğu SQLite dosyası
+SNAPSHOT_DB_PATH = os.environ.get(
+    'SNAPSHOT_DB_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'snapshots.sqlite3'))
+
+# SQLite'ın tek sorguda kabul ettiği parametre sayısının altında kalan parça boyutu
+_SQL_CHUNK_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usernames (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    follower_count INTEGER NOT NULL,
+    following_count INTEGER NOT NULL,
+    followers BLOB NOT NULL,
+    following BLOB NOT NULL,
+    UNIQUE (account, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS snapshots_account ON snapshots (account, taken_at);
+CREATE TABLE IF NOT EXISTS snapshot_diffs (
+    snapshot_id INTEGER PRIMARY KEY REFERENCES snapshots (id) ON DELETE CASCADE,
+    previous_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    gained_followers BLOB NOT NULL,
+    lost_followers BLOB NOT NULL,
+    gained_following BLOB NOT NULL,
+    lost_following BLOB NOT NULL,
+    gained_follower_count INTEGER NOT NULL,
+    lost_follower_count INTEGER NOT NULL
+);
+"""
+
+
+def _to_blob(ids: np.ndarray) -> bytes:
+    return np.asarray(ids, dtype=ID_DTYPE).tobytes()
+
+
+def _from_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=ID_DTYPE)
+
+
+def _normalize_account(account: str) -> str:
+    return account.strip().lstrip('@').lower()
+
+
+class SnapshotStore:
+    """
+    Aynı hesabın ardışık dışa aktarımlarından alınan takipçi/takip anlık görüntüleri.
+    Kullanıcı adları kalıcı bir tabloda tamsayı kimliklere çevrilir; her anlık görüntü
+    sıralı int32 kimlik dizilerini blob olarak saklar. Yeni bir görüntü eklenirken bir
+    öncekine göre kazanılan/kaybedilen kimlikler hesaplanıp saklanır, böylece geçmiş
+    sorguları dizileri yeniden karşılaştırmadan yanıtlanır.
+    """
+
+    def __init__(self, db_path: str = SNAPSHOT_DB_PATH):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Tek bağlantı iş parçacıkları arasında kilitle paylaşılır; diğer süreçler için WAL + bekleme süresi
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- kullanıcı adı <-> kalıcı kimlik ---
+
+    def _intern(self, usernames) -> np.ndarray:
+        """Kullanıcı adlarını kalıcı kimliklere çevirir (yeni adlar eklenir); sıralı, tekrarsız dizi döner."""
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS pending_usernames (username TEXT PRIMARY KEY)")
+        self._conn.execute("DELETE FROM pending_usernames")
+        self._conn.executemany("INSERT OR IGNORE INTO pending_usernames (username) VALUES (?)",
+                               ((username,) for username in usernames))
+        self._conn.execute("INSERT OR IGNORE INTO usernames (username) SELECT username FROM pending_usernames")
+        rows = self._conn.execute(
+            "SELECT u.id FROM pending_usernames p JOIN usernames u ON u.username = p.username")
+        ids = np.fromiter((row[0] for row in rows), dtype=ID_DTYPE)
+        return np.unique(ids)
+
+    def _decode(self, ids: np.ndarray) -> list:
+        """Kimlikleri kullanıcı adlarına çevirir (alfabetik sıralı)."""
+        ids = ids.tolist()
+        usernames = []
+        for start in range(0, len(ids), _SQL_CHUNK_SIZE):
+            chunk = ids[start:start + _SQL_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            usernames.extend(row[0] for row in self._conn.execute(
+                f"SELECT username FROM usernames WHERE id IN ({placeholders})", chunk))
+        return sorted(usernames)
+
+    # --- anlık görüntüler ---
+
+    def add_snapshot(self, account: str, fingerprint: str, followers, following) -> int:
+        """
+        Hesabın yeni anlık görüntüsünü kaydeder ve kimliğini döndürür.
+        Aynı arşiv (parmak izi) daha önce kaydedildiyse mevcut görüntünün kimliği döner; aynı arşivi
+        aynı anda kaydeden süreçlerden yalnızca biri ekler, diğerleri onun kimliğini alır.
+        """
+        account = _normalize_account(account)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM snapshots WHERE account = ? AND fingerprint = ?", (account, fingerprint)).fetchone()
+            if row is not None:
+                return row[0]
+
+            follower_ids = self._intern(followers)
+            following_ids = self._intern(following)
+            previous = self._conn.execute(
+                "SELECT id, followers, following FROM snapshots WHERE account = ? "
+                "ORDER BY taken_at DESC, id DESC LIMIT 1", (account,)).fetchone()
+
+            inserted = self._conn.execute(
+                "INSERT INTO snapshots (account, fingerprint, taken_at, follower_count, following_count, "
+                "followers, following) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (account, fingerprint) DO NOTHING",
+                (account, fingerprint, time.time(), len(follower_ids), len(following_ids),
+                 _to_blob(follower_ids), _to_blob(following_ids)))
+            if inserted.rowcount == 0:
+                # Başka bir süreç aynı arşivi yukarıdaki kontrolden sonra kaydetti; onun kimliği döner
+                return self._conn.execute(
+                    "SELECT id FROM snapshots WHERE account = ? AND fingerprint = ?", (account, fingerprint)).fetchone()[0]
+            snapshot_id = inserted.lastrowid
+
+            if previous is not None:
+                previous_id, previous_followers, previous_following = previous
+                self._store_diff(snapshot_id, previous_id,
+                                 _from_blob(previous_followers), follower_ids,
+                                 _from_blob(previous_following), following_ids)
+            return snapshot_id
+
+    def _store_diff(self, snapshot_id, previous_id, old_followers, new_followers, old_following, new_following):
+        gained_followers = UsernameStore.difference(new_followers, old_followers)
+        lost_followers = UsernameStore.difference(old_followers, new_followers)
+        self._conn.execute(
+            "INSERT INTO snapshot_diffs (snapshot_id, previous_id, gained_followers, lost_followers, "
+            "gained_following, lost_following, gained_follower_count, lost_follower_count) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (snapshot_id, previous_id, _to_blob(gained_followers), _to_blob(lost_followers),
+             _to_blob(UsernameStore.difference(new_following, old_following)),
+             _to_blob(UsernameStore.difference(old_following, new_following)),
+             len(gained_followers), len(lost_followers)))
+
+    def find_snapshot(self, account: str, fingerprint: str):
+        """Hesabın bu arşivden alınmış görüntüsünün kimliği; yoksa None."""
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM snapshots WHERE account = ? AND fingerprint = ?",
+                                     (_normalize_account(account), fingerprint)).fetchone()
+        return row[0] if row is not None else None
+
+    def find_by_fingerprint(self, fingerprint: str):
+        """
+        Bu arşivden alınmış görüntünün (hesap, kimlik) çifti; yoksa None.
+        Parmak izi hesap bilgileri öğesini de kapsadığı için arşiv tek bir hesaba aittir.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT account, id FROM snapshots WHERE fingerprint = ? ORDER BY id LIMIT 1",
+                                     (fingerprint,)).fetchone()
+        return tuple(row) if row is not None else None
+
+    def history(self, account: str) -> list:
+        """Hesabın görüntüleri (eskiden yeniye) ve her birinin bir öncekine göre takipçi değişim sayıları."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.id, s.taken_at, s.follower_count, s.following_count, "
+                "d.previous_id, d.gained_follower_count, d.lost_follower_count "
+                "FROM snapshots s LEFT JOIN snapshot_diffs d ON d.snapshot_id = s.id "
+                "WHERE s.account = ? ORDER BY s.taken_at, s.id", (_normalize_account(account),)).fetchall()
+        return [{
+            "snapshot_id": snapshot_id,
+            "taken_at": taken_at,
+            "follower_count": follower_count,
+            "following_count": following_count,
+            "previous_snapshot_id": previous_id,
+            "gained_follower_count": gained or 0,
+            "lost_follower_count": lost or 0,
+        } for snapshot_id, taken_at, follower_count, following_count, previous_id, gained, lost in rows]
+
+    def diff(self, account: str, from_id: int, to_id: int):
+        """
+        İki görüntü arasında kazanılan/kaybedilen takipçi ve takip edilenler.
+        Ardışık görüntüler için saklanan fark kullanılır; diğer çiftler sıralı dizilerden hesaplanır.
+        Görüntülerden biri hesaba ait değilse None döner.
+        """
+        account = _normalize_account(account)
+        with self._lock:
+            rows = dict((row[0], row[1:]) for row in self._conn.execute(
+                "SELECT id, taken_at, followers, following FROM snapshots WHERE account = ? AND id IN (?, ?)",
+                (account, from_id, to_id)))
+            if from_id not in rows or to_id not in rows:
+                return None
+
+            stored = self._conn.execute(
+                "SELECT gained_followers, lost_followers, gained_following, lost_following "
+                "FROM snapshot_diffs WHERE snapshot_id = ? AND previous_id = ?", (to_id, from_id)).fetchone()
+            if stored is not None:
+                changes = [_from_blob(blob) for blob in stored]
+            else:
+                _, old_followers, old_following = rows[from_id]
+                _, new_followers, new_following = rows[to_id]
+                old_followers, new_followers = _from_blob(old_followers), _from_blob(new_followers)
+                old_following, new_following = _from_blob(old_following), _from_blob(new_following)
+                changes = [
+                    UsernameStore.difference(new_followers, old_followers),
+                    UsernameStore.difference(old_followers, new_followers),
+                    UsernameStore.difference(new_following, old_following),
+                    UsernameStore.difference(old_following, new_following),
+                ]
+            gained_followers, lost_followers, gained_following, lost_following = (
+                self._decode(ids) for ids in changes)
+
+        return {
+            "from_snapshot_id": from_id,
+            "to_snapshot_id": to_id,
+            "from_taken_at": rows[from_id][0],
+            "to_taken_at": rows[to_id][0],
+            "gained_followers": gained_followers,
+            "lost_followers": lost_followers,
+            "gained_following": gained_following,
+            "lost_following": lost_following,
+        }
+
+    def diff_since_previous(self, account: str, snapshot_id: int):
+        """Görüntünün kendinden önceki görüntüye göre farkı; ilk görüntüyse None."""
+        with self._lock:
+            row = self._conn.execute("SELECT previous_id FROM snapshot_diffs WHERE snapshot_id = ?",
+                                     (snapshot_id,)).fetchone()
+        if row is None:
+            return None
+        return self.diff(account, row[0], snapshot_id)
@@ -0,0 +1,114 @@
+import json
+import logging
+import math
+import os
+import threading
+
+from cachetools import TLRUCache
+
+try:
+    import redis
+except ImportError:  # Yerel geliştirmede redis kurulu olmayabilir
+    redis = None
+
+# Ayarlanmışsa iş durumu, ilerleme ve sonuç önbelleği tüm gunicorn işçileri arasında Redis'te paylaşılır
+REDIS_URL = os.environ.get('REDIS_URL')
+# Redis anahtarlarının ön eki (aynı Redis'i kullanan başka uygulamalarla çakışmayı önler)
+REDIS_KEY_PREFIX = os.environ.get('REDIS_KEY_PREFIX', 'insta-analyzer:')
+# Bellek içi depodaki değerlerin toplamda kaplayabileceği yaklaşık bayt (dolunca en az kullanılan atılır)
+STATE_STORE_MAX_BYTES = int(os.environ.get('STATE_STORE_MAX_BYTES', 256 * 1024 * 1024))
+
+logger = logging.getLogger(__name__)
+
+
+def _json_size(value) -> int:
+    """Değerin JSON uzunluğu; Redis'te kaplayacağı yerle aynı ölçü (bellekteki boyutun yaklaşığı)."""
+    return len(json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str))
+
+
+class InMemoryStateStore:
+    """
+    Tek süreç içinde geçerli anahtar/değer deposu (yerel çalıştırma ve Redis yokken yedek).
+    Her anahtarın kendi TTL'i vardır; değerlerin toplam (JSON) boyutu max_bytes'ı aşınca
+    en az kullanılan anahtarlar atılır. Tek başına max_bytes'tan büyük değer saklanmaz.
+    Değerler kopyalanmadan saklanır; çağıranlar saklanan nesneleri değiştirmemelidir.
+    """
+
+    shared = False
+
+    def __init__(self, max_bytes: int = STATE_STORE_MAX_BYTES):
+        # Değer (ttl, veri, boyut) üçlüsüdür; son kullanma zamanı ekleme anında hesaplanır,
+        # boyut bir kez ölçülür (touch yeniden ölçmez)
+        self._data = TLRUCache(maxsize=max_bytes, ttu=lambda _key, value, now: now + value[0],
+                               getsizeof=lambda value: value[2])
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry[1] if entry is not None else None
+
+    def set(self, key: str, value, ttl: int = None):
+        entry = (ttl if ttl else math.inf, value, _json_size(value))
+        with self._lock:
+            try:
+                self._data[key] = entry
+            except ValueError:
+                # Tek başına depodan büyük değer; eski değer de geçersiz olduğu için atılır
+                self._data.pop(key, None)
+                logger.warning("Değer bellek içi depoya sığmıyor (%d bayt), saklanmadı: %s", entry[2], key)
+
+    def touch(self, key: str, ttl: int = None) -> bool:
+        """Anahtarın süresini yeniler; anahtar yoksa False döner."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            self._data[key] = (ttl if ttl else math.inf, entry[1], entry[2])
+            return True
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisStateStore:
+    """
+    Redis üzerinde JSON olarak saklanan paylaşımlı anahtar/değer deposu.
+    Tüm gunicorn işçileri (ve birden fazla sunucu) aynı iş durumunu ve önbelleği görür.
+    Bellek sınırı ve LRU atma Redis tarafında (maxmemory-policy allkeys-lru) yapılandırılır.
+    """
+
+    shared = True
+
+    def __init__(self, client, key_prefix: str = REDIS_KEY_PREFIX):
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def get(self, key: str):
+        raw = self.client.get(self.key_prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value, ttl: int = None):
+        self.client.set(self.key_prefix + key, json.dumps(value, separators=(',', ':')), ex=ttl or None)
+
+    def touch(self, key: str, ttl: int = None) -> bool:
+        """Anahtarın süresini yeniler; anahtar yoksa False döner."""
+        if ttl:
+            return bool(self.client.expire(self.key_prefix + key, ttl))
+        self.client.persist(self.key_prefix + key)
+        return bool(self.client.exists(self.key_prefix + key))
+
+    def delete(self, key: str):
+        self.client.delete(self.key_prefix + key)
+
+
+def create_state_store(redis_url: str = REDIS_URL):
+    """REDIS_URL tanımlı ve redis paketi kuruluysa Redis deposu, aksi halde bellek içi depo döndürür."""
+    if redis_url and redis is not None:
+        logger.info("Paylaşımlı durum deposu: Redis")
+        return RedisStateStore(redis.Redis.from_url(redis_url))
+
+    if redis_url:
+        logger.warning("REDIS_URL tanımlı ama redis paketi kurulu değil; bellek içi depo kullanılıyor.")
+    return InMemoryStateStore()
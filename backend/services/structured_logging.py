@@ -0,0 +1,151 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import urlsplit
+
+# Uygulama günlüklerinin en düşük seviyesi
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# Yazılmayı bekleyen en fazla kayıt; kuyruk doluysa yeni kayıtlar atılır (istek iş parçacığı beklemez)
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+# Seviye başına örnekleme oranı (0-1); WARNING ve üstü her zaman yazılır
+LOG_SAMPLE_RATES = {
+    logging.DEBUG: float(os.environ.get('LOG_SAMPLE_DEBUG', 0.1)),
+    logging.INFO: float(os.environ.get('LOG_SAMPLE_INFO', 1.0)),
+}
+
+# Tüm backend modüllerinin ortak üst günlükçüsü ('backend')
+APP_LOGGER_NAME = __name__.split('.')[0]
+
+# O an işlenen işin kimliği; günlük kayıtlarına otomatik eklenir
+current_job_id = contextvars.ContextVar('job_id', default=None)
+
+# İmzalı indirme linklerindeki belirteçler sorgu kısmında taşınır
+_URL_QUERY = re.compile(r'(https?://[^\s?#\'"]+)[?#][^\s\'"]*')
+
+# LogRecord'un kendi alanları; bunların dışındakiler (extra=...) JSON'a alan olarak eklenir
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'job_id'}
+
+
+def redact_url(url: str) -> str:
+    """URL'nin yalnızca host ve yolunu bırakır; sorgu (imza, belirteç) ve parça atılır."""
+    if not url:
+        return url
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def redact_text(text: str) -> str:
+    """Metin içindeki tüm URL'lerin sorgu kısmını gizler (örn. requests hata mesajları)."""
+    return _URL_QUERY.sub(r'\1?<redacted>', text)
+
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON olarak yazar: zaman, seviye, günlükçü, mesaj, iş kimliği ve extra alanları."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact_text(record.getMessage()),
+        }
+        job_id = getattr(record, 'job_id', None)
+        if job_id is not None:
+            entry["job_id"] = job_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = redact_text(record.exc_text)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Kaydı üreten iş parçacığındaki iş kimliğini kayda ekler (kuyruğa girmeden önce)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'job_id'):
+            record.job_id = current_job_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """DEBUG/INFO kayıtlarını LOG_SAMPLE_RATES oranında geçirir; WARNING ve üstüne dokunmaz."""
+
+    def __init__(self, rates: dict = None):
+        super().__init__()
+        self.rates = rates if rates is not None else LOG_SAMPLE_RATES
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Kayıtları sınırlı kuyruğa bırakır; yazma işi QueueListener iş parçacığında yapılır.
+    Kuyruk doluysa kayıt beklemeden atılır ve sayılır.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Aynı süreçte kalındığı için kayıt kopyalanmaz; yalnızca sonradan değişebilecek parçalar sabitlenir
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener = None
+
+
+def configure_logging(level: str = LOG_LEVEL):
+    """
+    backend günlükçüsünü JSON satırları + kuyruk üzerinden stdout'a yazacak şekilde kurar.
+    Birden fazla çağrılırsa ilk kurulum geçerli kalır.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(SamplingFilter())
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    logger = logging.getLogger(APP_LOGGER_NAME)
+    logger.setLevel(level)
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    # Süreç kapanırken kuyrukta kalanlar yazılır
+    atexit.register(_listener.stop)
+
+
+def log_duration(logger: logging.Logger, message: str, started: float, *args, **fields):
+    """time.perf_counter() ile başlatılmış bir işlemin süresini duration_ms alanıyla (INFO) yazar."""
+    logger.info(message, *args, extra={**fields, "duration_ms": round((time.perf_counter() - started) * 1000, 2)})
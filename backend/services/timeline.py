@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+
+from .extractors import MISSING_TIMESTAMP
+
+SECONDS_PER_DAY = 24 * 60 * 60
+SECONDS_PER_WEEK = 7 * SECONDS_PER_DAY
+
+
+class FollowerTimeline:
+    """
+    Takipçilerin takip etmeye başladığı zamanlar (string_list_data'daki timestamp) üzerinde
+    zaman penceresi sorguları. Zaman damgaları çıkarma sırasında doldurulan int64 sütundan
+    kopyasız okunur; sorgular JSON'u yeniden ayrıştırmadan vektörel maskelerle yanıtlanır.
+    """
+
+    def __init__(self, usernames: list, timestamps):
+        """usernames: dosya sırasıyla takipçiler; timestamps: aynı sıradaki int64 zaman damgaları"""
+        self.usernames = usernames
+        self.timestamps = np.frombuffer(timestamps, dtype=np.int64) if len(timestamps) else np.empty(0, np.int64)
+        self._known = self.timestamps != MISSING_TIMESTAMP
+
+    def recent(self, limit: int) -> list:
+        """
+        En son takip eden `limit` kullanıcı (yeniden eskiye).
+        Zaman damgası olmayanlar en sona kalır ve kendi aralarında dosya sırasını korur.
+        """
+        # Kararlı sıralama: aynı zaman damgasında dosya sırası korunur
+        order = np.argsort(-self.timestamps, kind='stable')[:limit]
+        return [self.usernames[index] for index in order.tolist()]
+
+    def since(self, days: float, now: float = None) -> list:
+        """Son `days` gün içinde takip etmeye başlayanlar (yeniden eskiye)."""
+        now = time.time() if now is None else now
+        mask = self._known & (self.timestamps >= int(now - days * SECONDS_PER_DAY))
+        indices = np.flatnonzero(mask)
+        indices = indices[np.argsort(-self.timestamps[indices], kind='stable')]
+        return [self.usernames[index] for index in indices.tolist()]
+
+    def count_since(self, days: float, now: float = None) -> int:
+        now = time.time() if now is None else now
+        return int(np.count_nonzero(self._known & (self.timestamps >= int(now - days * SECONDS_PER_DAY))))
+
+    def weekly_velocity(self, weeks: int, now: float = None) -> list:
+        """
+        Son `weeks` haftanın her birinde gelen yeni takipçi sayısı (eskiden yeniye).
+        Son eleman [now - 7 gün, now] aralığıdır; bir önceki (now - 14 gün, now - 7 gün) ve böyle
+        devam eder. Sınırlar since() ile aynıdır: son haftanın sayısı count_since(7)'ye eşittir.
+        """
+        now = int(time.time() if now is None else now)
+        timestamps = self.timestamps[self._known & (self.timestamps <= now)]
+        # 0 = içinde bulunulan hafta, 1 = bir önceki, ...; tam hafta sınırındaki kayıt yeni haftaya girer
+        weeks_ago = np.maximum((now - timestamps + SECONDS_PER_WEEK - 1) // SECONDS_PER_WEEK - 1, 0)
+        counts = np.bincount(weeks_ago[weeks_ago < weeks], minlength=weeks)
+        return counts[::-1].tolist()
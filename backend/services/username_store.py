@@ -0,0 +1,75 @@
+import numpy as np
+
+# Kimlik dizilerinin veri tipi (2 milyardan fazla farklı kullanıcı adı beklenmiyor)
+ID_DTYPE = np.int32
+
+
+class UsernameStore:
+    """
+    İstek başına kullanıcı adı sözlüğü: her kullanıcı adına yoğun bir tamsayı kimlik verir.
+    Kimlikler kullanıcı adlarının sıralı düzenine göre atanır; bu yüzden sıralı bir kimlik
+    dizisi çözüldüğünde kullanıcı adları da sıralı çıkar ve sonuç listeleri tekrar sıralanmaz.
+    İlişkiler sıralı, tekrarsız NumPy dizileri olarak tutulur; kesişim ve farklar vektörel yapılır.
+    """
+
+    def __init__(self, relations: dict):
+        """relations: ilişki anahtarı -> kullanıcı adları (tekrar içerebilir)"""
+        # Tek seferlik sıralama: tüm ilişkilerdeki farklı kullanıcı adları
+        vocabulary = set()
+        for usernames in relations.values():
+            vocabulary.update(usernames)
+        self.usernames = sorted(vocabulary)
+        self._ids = {username: user_id for user_id, username in enumerate(self.usernames)}
+
+        self.relations = {key: self.encode(usernames) for key, usernames in relations.items()}
+
+    @classmethod
+    def from_ids(cls, vocabulary: list, relation_ids: dict) -> 'UsernameStore':
+        """
+        Önceden kimliklendirilmiş veriden (bkz. columnar_store.py) sözlük kurar; kullanıcı adları
+        yeniden sıralanmaz. vocabulary sıralı olmalı, relation_ids: anahtar -> kimlikler (tekrar içerebilir)
+        """
+        store = cls.__new__(cls)
+        store.usernames = vocabulary
+        store._ids = None
+        store.relations = {key: np.unique(np.asarray(ids, dtype=ID_DTYPE)) for key, ids in relation_ids.items()}
+        return store
+
+    def encode_ordered(self, usernames) -> np.ndarray:
+        """Kullanıcı adlarını aynı sırayla (tekrarlar dahil) kimlik dizisine çevirir."""
+        if self._ids is None:
+            self._ids = {username: user_id for user_id, username in enumerate(self.usernames)}
+        return np.fromiter((self._ids[username] for username in usernames), dtype=ID_DTYPE)
+
+    def encode(self, usernames) -> np.ndarray:
+        """Kullanıcı adlarını sıralı, tekrarsız kimlik dizisine çevirir."""
+        return np.unique(self.encode_ordered(usernames))
+
+    def decode(self, ids: np.ndarray) -> list:
+        """Kimlik dizisini kullanıcı adı listesine çevirir (sıralı dizi -> sıralı liste)."""
+        usernames = self.usernames
+        return [usernames[user_id] for user_id in ids.tolist()]
+
+    def ids(self, key: str) -> np.ndarray:
+        return self.relations[key]
+
+    @staticmethod
+    def intersection(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Her iki dizide de bulunan kimlikler (sıralı, tekrarsız)."""
+        return np.intersect1d(_sorted_unique(left), _sorted_unique(right), assume_unique=True)
+
+    @staticmethod
+    def difference(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """left'te olup right'ta olmayan kimlikler (sıralı, tekrarsız)."""
+        return np.setdiff1d(_sorted_unique(left), _sorted_unique(right), assume_unique=True)
+
+
+def _sorted_unique(ids) -> np.ndarray:
+    """
+    Küme işlemleri assume_unique ile çalışır; ids() dizileri zaten sıralı ve tekrarsızdır ve olduğu
+    gibi döner. Dışarıdan gelen sırasız ya da tekrarlı diziler önce np.unique'ten geçirilir.
+    """
+    ids = np.asarray(ids, dtype=ID_DTYPE)
+    if ids.size < 2 or bool(np.all(ids[1:] > ids[:-1])):
+        return ids
+    return np.unique(ids)
@@ -0,0 +1,97 @@
+import functools
+import importlib
+import os
+import sys
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Modül seviyesindeki depo yolları import sırasında okunur; testler backend/data'ya yazmasın
+_RUNTIME_DIR = tempfile.mkdtemp(prefix='insta-analyzer-tests-')
+os.environ.setdefault('SNAPSHOT_DB_PATH', os.path.join(_RUNTIME_DIR, 'snapshots.sqlite3'))
+os.environ.setdefault('COLUMNAR_STORE_DIR', os.path.join(_RUNTIME_DIR, 'columnar'))
+os.environ.setdefault('SCRATCH_DIR', os.path.join(_RUNTIME_DIR, 'scratch'))
+
+import pytest
+
+from backend.services import structured_logging
+from backend.tests.support import RangeRequestHandler, write_export
+
+
+class _QuietServer(ThreadingHTTPServer):
+    """İstemcinin yanıtı bitmeden bağlantıyı kapatmasını (örn. Range yoklamasına gelen tam gövde) hata saymaz."""
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _PlainHandler(SimpleHTTPRequestHandler):
+    """Range başlığını yok sayan (her zaman 200 + tam gövde), ETag gönderen sunucu."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def end_headers(self):
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            self.send_header('ETag', f'"{int(os.path.getmtime(path))}-{os.path.getsize(path)}"')
+        super().end_headers()
+
+
+@pytest.fixture
+def serve(tmp_path):
+    """
+    tmp_path'i verilen istek sınıfıyla (varsayılan: Range destekli sunucu, bkz. support.py) sunar.
+    Dönen sunucunun url(name) metodu dosyanın adresini, bytes_sent gönderilen gövde baytını verir.
+    """
+    servers = []
+
+    def factory(handler_class=RangeRequestHandler):
+        server = _QuietServer(('127.0.0.1', 0), functools.partial(handler_class, directory=str(tmp_path)))
+        server.bytes_sent = 0
+        server.lock = threading.Lock()
+        server.url = lambda name: f"http://127.0.0.1:{server.server_address[1]}/{name}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield factory
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def range_server(serve):
+    return serve()
+
+
+@pytest.fixture
+def plain_server(serve):
+    return serve(_PlainHandler)
+
+
+# export_url dışa aktarımı: 300 takipçi (iki parça), 120 takip edilen; 72'si karşılıklı
+FOLLOWERS = [f"follower_{number:03d}" for number in range(300)]
+FOLLOWING = FOLLOWERS[:72] + [f"followed_{number:03d}" for number in range(48)]
+
+
+@pytest.fixture
+def export_url(tmp_path, range_server):
+    """Küçük bir dışa aktarımı Range destekli sunucuda yayınlar ve adresini döndürür."""
+    write_export(str(tmp_path / 'export.zip'), FOLLOWERS, FOLLOWING, shards=2)
+    return range_server.url('export.zip')
+
+
+@pytest.fixture
+def app_module(monkeypatch):
+    """backend.app modülü (Flask uygulaması ve paylaşılan servis nesneleri)."""
+    # Uygulama import edilirken backend günlükçüsünü stdout'a yönlendirmesin
+    monkeypatch.setattr(structured_logging, 'configure_logging', lambda *args, **kwargs: None)
+    return importlib.import_module('backend.app')
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
@@ -0,0 +1,95 @@
+"""
+Testlerin ve ölçümlerin (bkz. backend/benchmarks) paylaştığı yardımcılar: dışa aktarım
+ZIP'lerini yerel bir HTTP sunucusundan HTTP Range desteğiyle sunan istek sınıfı ve
+verilen kullanıcı adlarıyla küçük bir dışa aktarım ZIP'i yazan write_export.
+"""
+
+import json
+import os
+import zipfile
+from http.server import SimpleHTTPRequestHandler
+
+from backend.services.manifest import FILE_PATH_PREFIX, PERSONAL_INFORMATION_PATH
+
+# Dışa aktarımlardaki tarihli ana klasör
+EXPORT_ROOT = 'instagram-owner-2024-05-01-AbCdEf12/'
+# Takipçi dosyasındaki en yeni kaydın zaman damgası; sonrakiler birer saat geriye gider
+LATEST_TIMESTAMP = 1714521600
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Tek aralıklı 'Range: bytes=a-b' / 'bytes=-n' isteklerini destekleyen, gönderilen baytı sayan sunucu.
+    If-Range dosyanın güncel ETag'iyle uyuşmazsa aralık yok sayılır ve tüm dosya 200 ile gönderilir.
+    Sunucu nesnesinde bytes_sent sayacı ve onu koruyan lock bulunmalıdır.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.translate_path(self.path.split('?', 1)[0])
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            self.send_error(404)
+            return
+
+        etag = f'"{int(os.path.getmtime(path))}-{size}"'
+        start, end = 0, size - 1
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if range_header and range_header.startswith('bytes=') and (not if_range or if_range == etag):
+            first, _, last = range_header[len('bytes='):].partition('-')
+            if first:
+                start, end = int(first), min(int(last), size - 1) if last else size - 1
+            else:
+                start = max(0, size - int(last))
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', etag)
+        self.end_headers()
+
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(1024 * 1024, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+                with self.server.lock:
+                    self.server.bytes_sent += len(chunk)
+
+
+def write_export(path: str, followers: list, following: list, shards: int = 1, account: str = None):
+    """
+    Yalnızca takipçi ve takip edilen listelerini içeren bir dışa aktarım ZIP'i yazar.
+    followers dosya sırasıyla (en yeni takipçi önce) followers_1.json ... followers_<shards>.json
+    parçalarına bölünerek yazılır; diğer manifest öğeleri arşivde yoktur.
+    account verilirse hesap bilgileri (personal_information.json) de yazılır.
+    """
+    prefix = EXPORT_ROOT + FILE_PATH_PREFIX
+    follower_items = [{"title": "", "media_list_data": [], "string_list_data": [
+        {"href": f"https://www.instagram.com/{username}", "value": username,
+         "timestamp": LATEST_TIMESTAMP - index * 3600}]}
+        for index, username in enumerate(followers)]
+    following_items = [{"title": username, "media_list_data": [], "string_list_data": [
+        {"href": f"https://www.instagram.com/_u/{username}", "timestamp": LATEST_TIMESTAMP}]}
+        for username in following]
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        shard_size = -(-len(follower_items) // shards) or 1
+        for shard in range(shards):
+            zip_file.writestr(f"{prefix}followers_{shard + 1}.json",
+                              json.dumps(follower_items[shard * shard_size:(shard + 1) * shard_size]))
+        zip_file.writestr(prefix + 'following.json', json.dumps({"relationships_following": following_items}))
+        if account is not None:
+            zip_file.writestr(EXPORT_ROOT + PERSONAL_INFORMATION_PATH, json.dumps({"profile_user": [{
+                "media_map_data": {},
+                "string_map_data": {"Username": {"href": "", "value": account, "timestamp": 0}}}]}))
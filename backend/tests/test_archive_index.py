@@ -0,0 +1,55 @@
+import unicodedata
+
+from backend.services.archive_index import ArchiveIndex, normalize_member_path
+
+ROOT = 'instagram-ali.veli-2024-05-01-AbCdEf12'
+
+
+def test_resolves_under_dated_root_directory():
+    index = ArchiveIndex([
+        f'{ROOT}/',
+        f'{ROOT}/connections/',
+        f'{ROOT}/connections/followers_and_following/following.json',
+        f'{ROOT}/connections/followers_and_following/followers_1.json',
+    ])
+    assert index.root_dir == ROOT
+    assert len(index) == 2
+    assert index.resolve('connections/followers_and_following/following.json') == \
+        f'{ROOT}/connections/followers_and_following/following.json'
+    # Tam yol da çözülmeye devam eder
+    assert f'{ROOT}/connections/followers_and_following/following.json' in index
+    assert 'connections/followers_and_following/missing.json' not in index
+
+
+def test_case_separator_and_unicode_variants():
+    decomposed = unicodedata.normalize('NFD', 'Connections/Takipçiler/Following.JSON')
+    index = ArchiveIndex([f'{ROOT}\\{decomposed.replace("/", chr(92))}'])
+    for variant in ('connections/takipçiler/following.json', './CONNECTIONS/TAKIPÇILER/following.json',
+                    '/connections\\takipçiler\\FOLLOWING.json'):
+        assert index.resolve(variant) == f'{ROOT}\\{decomposed.replace("/", chr(92))}'
+    assert normalize_member_path('./A\\B.JSON') == 'a/b.json'
+
+
+def test_no_root_stripping_for_mixed_top_level():
+    index = ArchiveIndex(['a/connections/following.json', 'b/connections/following.json'])
+    assert index.root_dir is None
+    assert index.resolve('connections/following.json') is None
+    assert index.resolve('A/Connections/Following.json') == 'a/connections/following.json'
+
+
+def test_direct_path_wins_over_root_stripped_path():
+    index = ArchiveIndex(['export/export/following.json', 'export/following.json'])
+    assert index.root_dir == 'export'
+    assert index.resolve('export/following.json') == 'export/following.json'
+
+
+def test_pattern_resolves_shards_in_natural_order():
+    shards = [f'{ROOT}/connections/followers_and_following/Followers_{n}.json' for n in (10, 2, 1, 11)]
+    index = ArchiveIndex(shards + [
+        f'{ROOT}/connections/followers_and_following/followers_x.json',
+        f'{ROOT}/connections/other/followers_3.json',
+    ])
+    assert index.resolve_members('connections/followers_and_following/followers_[0-9]*.json') == [
+        shards[2], shards[1], shards[0], shards[3]]
+    assert index.resolve_members('connections/followers_and_following/following.json') == []
+    assert index.resolve_members('connections/followers_and_following/followers_1.json') == [shards[2]]
@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pytest
+
+from backend.services.columnar_store import ColumnarStore
+
+VOCABULARY = ['ali', 'çağla', 'veli']
+RELATIONS = {
+    'followers': ([2, 0, 1], [1714521600, 1714518000, -1]),
+    'following': ([1], [1714521600]),
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ColumnarStore(root=str(tmp_path / 'columnar'), max_archives=2, max_age=60)
+
+
+def test_saved_relations_are_loaded_back(store):
+    store.save('archive:abc', VOCABULARY, RELATIONS)
+    assert store.contains('archive:abc')
+
+    columns = store.load('archive:abc')
+    assert columns.vocabulary == VOCABULARY
+    assert columns.keys == ['followers', 'following']
+    assert columns.ids('followers').tolist() == [2, 0, 1]
+    assert columns.timestamps('followers').tolist() == [1714521600, 1714518000, -1]
+    assert store.load('archive:missing') is None
+
+
+def test_loaded_columns_survive_a_concurrent_prune(store):
+    store.save('archive:abc', VOCABULARY, RELATIONS)
+    columns = store.load('archive:abc')
+    shutil.rmtree(store._path('archive:abc'))
+
+    # Eşlemeler load() içinde açıldı; dizin silinse de okunabilir
+    assert columns.ids('following').tolist() == [1]
+    assert columns.timestamps('following').tolist() == [1714521600]
+    assert store.load('archive:abc') is None
+
+
+def test_missing_column_file_is_a_cache_miss(store):
+    store.save('archive:abc', VOCABULARY, RELATIONS)
+    os.remove(os.path.join(store._path('archive:abc'), 'following.timestamps.npy'))
+    assert store.load('archive:abc') is None
+
+
+def test_directory_removed_before_access_time_update_is_a_cache_miss(store, monkeypatch):
+    store.save('archive:abc', VOCABULARY, RELATIONS)
+
+    def utime_after_prune(path, *args, **kwargs):
+        shutil.rmtree(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, 'utime', utime_after_prune)
+    assert store.load('archive:abc') is None
+
+
+def _age(store, fingerprint, seconds):
+    meta_path = os.path.join(store._path(fingerprint), 'meta.json')
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    meta["created_at"] = time.time() - seconds
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+
+def test_expired_archives_are_not_read_and_are_replaced(store):
+    store.save('archive:abc', VOCABULARY, RELATIONS)
+    _age(store, 'archive:abc', 61)
+
+    assert not store.contains('archive:abc')
+    assert store.load('archive:abc') is None
+    assert not os.path.exists(store._path('archive:abc'))
+
+    store.save('archive:abc', VOCABULARY, RELATIONS)
+    assert store.load('archive:abc').vocabulary == VOCABULARY
+
+
+def test_prune_removes_expired_and_least_recently_used(tmp_path):
+    store = ColumnarStore(root=str(tmp_path / 'columnar'), max_archives=2, max_age=60)
+    filler = ColumnarStore(root=store.root, max_archives=10, max_age=60)
+    for name in ('old', 'first', 'second'):
+        filler.save(f'archive:{name}', VOCABULARY, RELATIONS)
+    _age(store, 'archive:old', 61)
+    os.utime(store._path('archive:first'), (1, 1))
+
+    # Süresi dolan dizin sayılmadan silinir; kalanlardan en eski kullanılan sınırı aşar
+    store.save('archive:third', VOCABULARY, RELATIONS)
+    assert sorted(os.listdir(store.root)) == ['v1-second', 'v1-third']
+
+
+def test_no_age_limit(tmp_path):
+    store = ColumnarStore(root=str(tmp_path / 'columnar'), max_age=0)
+    store.save('archive:abc', VOCABULARY, RELATIONS)
+    _age(store, 'archive:abc', 10 ** 9)
+    assert np.array_equal(store.load('archive:abc').ids('followers'), [2, 0, 1])
@@ -0,0 +1,151 @@
+import gzip
+import json
+import os
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify, request
+
+from backend.services.compression import ResponseCompressor
+
+BODY = {"items": [f"user_{number:04d}" for number in range(500)]}
+
+
+def _fake_brotli(body: bytes) -> bytes:
+    # brotli kurulu olmayabilir; ayırt edilebilir herhangi bir sıkıştırma yeterli
+    return b'br:' + zlib.compress(body)
+
+
+def _decode(response) -> bytes:
+    encoding = response.headers.get('Content-Encoding')
+    data = response.get_data()
+    if encoding == 'gzip':
+        return gzip.decompress(data)
+    if encoding == 'br':
+        assert data.startswith(b'br:')
+        return zlib.decompress(data[len(b'br:'):])
+    assert encoding is None
+    return data
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def compressor(calls):
+    def counting(name, encoder):
+        return lambda body: calls.append(name) or encoder(body)
+
+    return ResponseCompressor(min_size=1024, encoders={
+        'br': counting('br', _fake_brotli),
+        'gzip': counting('gzip', lambda body: gzip.compress(body, mtime=0)),
+    })
+
+
+@pytest.fixture
+def client(compressor):
+    app = Flask(__name__)
+
+    @app.route('/json')
+    def json_body():
+        return jsonify(BODY)
+
+    @app.route('/small')
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route('/random')
+    def random_body():
+        return Response(os.urandom(4096), mimetype='text/plain')
+
+    @app.route('/image')
+    def image():
+        return Response(b'\x89PNG' + b'\0' * 4096, mimetype='image/png')
+
+    @app.route('/events')
+    def events():
+        return Response((f"data: {number}\n\n" for number in range(500)), mimetype='text/event-stream')
+
+    @app.route('/streamed-json')
+    def streamed_json():
+        return Response((json.dumps(BODY)[i:i + 100] for i in range(0, 8000, 100)), mimetype='application/json')
+
+    @app.after_request
+    def compress_response(response):
+        return compressor.compress(response, request.accept_encodings)
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize('accept_encoding, expected', [
+    ('gzip, br', 'br'),
+    ('gzip', 'gzip'),
+    ('br;q=0, gzip', 'gzip'),
+    ('gzip;q=0.5, br;q=0.8', 'br'),
+    ('gzip;q=0.9, br;q=0.1', 'gzip'),
+    ('*', 'br'),
+    ('br;q=0, *', 'gzip'),
+    ('identity', None),
+    ('gzip;q=0, br;q=0', None),
+    (None, None),
+])
+def test_accept_encoding_negotiation(client, accept_encoding, expected):
+    headers = {'Accept-Encoding': accept_encoding} if accept_encoding is not None else {}
+    response = client.get('/json', headers=headers)
+
+    assert response.headers.get('Content-Encoding') == expected
+    assert 'Accept-Encoding' in response.vary
+    assert json.loads(_decode(response)) == BODY
+    assert int(response.headers['Content-Length']) == len(response.get_data())
+
+
+def test_small_and_incompressible_bodies_are_sent_as_is(client):
+    small = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+    assert 'Accept-Encoding' in small.vary
+
+    # Sıkıştırılmış hali daha büyük çıkan gövde olduğu gibi gönderilir
+    random_body = client.get('/random', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in random_body.headers
+    assert len(random_body.get_data()) == 4096
+
+
+def test_size_threshold(compressor):
+    app = Flask(__name__)
+    for size in (compressor.min_size - 1, compressor.min_size):
+        with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+            response = compressor.compress(Response(b'a' * size, mimetype='text/plain'), request.accept_encodings)
+            assert (response.headers.get('Content-Encoding') == 'gzip') == (size >= compressor.min_size)
+
+
+@pytest.mark.parametrize('path', ['/events', '/streamed-json', '/image'])
+def test_streamed_and_non_text_responses_pass_through(client, calls, path):
+    response = client.get(path, headers={'Accept-Encoding': 'gzip, br'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' not in response.vary
+    assert calls == []
+
+
+def test_compressed_body_is_reused(client, calls):
+    first = client.get('/json', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/json', headers={'Accept-Encoding': 'gzip'})
+    assert first.get_data() == second.get_data()
+    assert calls == ['gzip']
+
+    # Başka bir kodlama ayrı önbellek girdisidir
+    client.get('/json', headers={'Accept-Encoding': 'br'})
+    client.get('/json', headers={'Accept-Encoding': 'br'})
+    assert calls == ['gzip', 'br']
+
+
+def test_body_larger_than_cache_is_not_cached(calls):
+    compressor = ResponseCompressor(min_size=1, cache_max_bytes=16,
+                                    encoders={'gzip': lambda body: calls.append('gzip') or gzip.compress(body)})
+    app = Flask(__name__)
+    for _ in range(2):
+        with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+            response = compressor.compress(Response(b'a' * 4096, mimetype='text/plain'), request.accept_encodings)
+            assert gzip.decompress(response.get_data()) == b'a' * 4096
+    assert calls == ['gzip', 'gzip']
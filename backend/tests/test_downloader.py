@@ -0,0 +1,152 @@
+import os
+
+import pytest
+import requests
+
+from backend.services import downloader
+from backend.services.downloader import ParallelDownloader
+from backend.tests.support import RangeRequestHandler
+
+PART_SIZE = 256 * 1024
+
+
+class _DroppingRangeHandler(RangeRequestHandler):
+    """Her parçanın ilk isteğinde gövdenin yarısını gönderip bağlantıyı koparan sunucu."""
+
+    def do_GET(self):
+        range_header = self.headers.get('Range', '')
+        with self.server.lock:
+            self.server.ranges.append(range_header)
+            first_attempt = range_header not in self.server.ranges[:-1]
+        start, _, end = range_header[len('bytes='):].partition('-')
+        if range_header == 'bytes=0-0' or not first_attempt:
+            return super().do_GET()
+
+        path = self.translate_path(self.path)
+        length = int(end) - int(start) + 1
+        self.send_response(206)
+        self.send_header('Content-Range', f"bytes {start}-{end}/{os.path.getsize(path)}")
+        self.send_header('Content-Length', str(length))
+        self.end_headers()
+        with open(path, 'rb') as f:
+            f.seek(int(start))
+            self.wfile.write(f.read(length // 2))
+        self.wfile.flush()
+        self.close_connection = True
+
+
+@pytest.fixture
+def payload(tmp_path):
+    data = os.urandom(3 * PART_SIZE + 100 * 1024)
+    (tmp_path / 'export.zip').write_bytes(data)
+    return data
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(downloader, 'RETRY_BACKOFF_SECONDS', 0)
+    monkeypatch.setattr(downloader, 'STREAM_CHUNK_SIZE', 16 * 1024)
+
+
+@pytest.mark.parametrize('spool_max_bytes', [0, 64 * 1024 * 1024])
+def test_download_resumes_interrupted_parts(serve, tmp_path, payload, spool_max_bytes):
+    server = serve(_DroppingRangeHandler)
+    server.ranges = []
+    dest = tmp_path / 'out' / 'download.zip'
+    dest.parent.mkdir()
+
+    parts = ParallelDownloader(server.url('export.zip'), str(dest), connections=3, part_size=PART_SIZE,
+                               spool_max_bytes=spool_max_bytes)
+    try:
+        assert parts.download() == len(payload)
+        if spool_max_bytes:
+            parts.buffer.seek(0)
+            assert parts.buffer.read() == payload
+            assert not dest.exists()
+        else:
+            assert dest.read_bytes() == payload
+    finally:
+        parts.close()
+
+    # Kopan parçalar baştan değil, yazılan son bayttan sonra yeniden istenir
+    part_starts = [str(start) for start in range(0, len(payload), PART_SIZE)]
+    starts = [r[len('bytes='):].partition('-')[0] for r in server.ranges if r != 'bytes=0-0']
+    assert sorted(start for start in starts if start in part_starts) == sorted(part_starts)
+    assert len(starts) > len(part_starts)
+
+
+def test_download_gives_up_after_max_retries(serve, tmp_path, payload):
+    class _AlwaysDropping(_DroppingRangeHandler):
+        def do_GET(self):
+            if self.headers.get('Range') != 'bytes=0-0':
+                self.server.request_count += 1
+            self.server.ranges.clear()
+            super().do_GET()
+
+    server = serve(_AlwaysDropping)
+    server.ranges = []
+    server.request_count = 0
+    parts = ParallelDownloader(server.url('export.zip'), str(tmp_path / 'download.zip'),
+                               connections=1, part_size=len(payload), max_retries=2)
+    with pytest.raises((requests.exceptions.ChunkedEncodingError, downloader.TransientDownloadError)):
+        parts.download()
+    parts.close()
+    # İlk deneme + max_retries yeniden deneme
+    assert server.request_count == 1 + 2
+
+
+class _ReplacedAfterProbeHandler(RangeRequestHandler):
+    """Yoklamadan (bytes=0-0) sonra dosyayı server.replacement ile değiştiren, istek başlıklarını kaydeden sunucu."""
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append((self.headers.get('Range'), self.headers.get('If-Range')))
+        super().do_GET()
+        if self.headers.get('Range') == 'bytes=0-0' and self.server.replacement:
+            os.replace(self.server.replacement, self.translate_path(self.path))
+            self.server.replacement = None
+
+
+class _ShiftedRangeHandler(RangeRequestHandler):
+    """Parça yanıtlarında Content-Range başlangıcını bir bayt kaydırarak bildiren sunucu."""
+
+    def send_header(self, keyword, value):
+        if keyword == 'Content-Range' and self.headers['Range'] != 'bytes=0-0':
+            first, rest = value[len('bytes '):].split('-', 1)
+            value = f"bytes {int(first) + 1}-{rest}"
+        super().send_header(keyword, value)
+
+
+def _download(server, tmp_path):
+    dest = tmp_path / 'out' / 'download.zip'
+    dest.parent.mkdir()
+    parts = ParallelDownloader(server.url('export.zip'), str(dest), connections=3, part_size=PART_SIZE)
+    try:
+        return parts.download(), dest.read_bytes()
+    finally:
+        parts.close()
+
+
+def test_file_replaced_during_download_is_downloaded_again(serve, tmp_path, payload):
+    # Aynı boyutta, farklı sürüm: yalnızca If-Range ile ayırt edilir
+    replacement = tmp_path / 'replacement.zip'
+    replacement.write_bytes(os.urandom(len(payload)))
+    os.utime(replacement, (1, 1))
+    server = serve(_ReplacedAfterProbeHandler)
+    server.requests = []
+    server.replacement = str(replacement)
+
+    size, data = _download(server, tmp_path)
+    assert server.replacement is None
+    assert size == len(payload)
+    assert data == (tmp_path / 'export.zip').read_bytes() != payload
+    part_requests = [request for request in server.requests if request[0] not in ('bytes=0-0', None)]
+    assert part_requests and all(if_range for _, if_range in part_requests)
+    # Parçalar bırakıldıktan sonra dosya tek istekle (Range olmadan) baştan indirildi
+    assert server.requests[-1] == (None, None)
+
+
+def test_part_with_unexpected_content_range_restarts_download(serve, tmp_path, payload):
+    size, data = _download(serve(_ShiftedRangeHandler), tmp_path)
+    assert size == len(payload)
+    assert data == payload
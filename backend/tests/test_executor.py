@@ -0,0 +1,118 @@
+import os
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from backend.services import data_processor
+from backend.services.executor import AnalysisExecutor, ExecutorBusy, ParsePool
+from backend.services.jobs import run_pipeline
+
+
+def test_parse_pool_replaces_broken_pool():
+    pool = ParsePool(1)
+    try:
+        # Çocuk sürecin ölmesi (örn. OOM) havuzu bozar
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result(timeout=60)
+        assert pool.submit(pow, 2, 10).result(timeout=60) == 1024
+        assert pool.restarts == 1
+    finally:
+        pool.shutdown()
+
+
+def test_parse_pool_starts_processes_on_first_submit():
+    pool = ParsePool(1)
+    assert not pool.started
+    try:
+        assert pool.submit(pow, 3, 3).result(timeout=60) == 27
+        assert pool.started and pool.restarts == 0
+    finally:
+        pool.shutdown()
+    assert not pool.started
+    with pytest.raises(RuntimeError):
+        pool.submit(pow, 3, 3)
+
+
+def test_unused_parse_pool_shuts_down_without_starting():
+    executor = AnalysisExecutor(analysis_workers=1, parse_workers=2, queue_size=0)
+    assert not executor.parse_pool.started
+    executor.shutdown()
+    assert not executor.parse_pool.started
+
+
+class _RecordingPool:
+    """Gönderilen işleri kaydeden ve aynı iş parçacığında çalıştıran ayrıştırma havuzu."""
+
+    def __init__(self):
+        self.sources = []
+
+    def submit(self, fn, source, *args):
+        self.sources.append(source)
+        future = Future()
+        future.set_result(fn(source, *args))
+        return future
+
+
+class _DeadPool(_RecordingPool):
+    """Her işi çocuk süreci ölmüş gibi sonuçlandıran ayrıştırma havuzu."""
+
+    def submit(self, fn, source, *args):
+        self.sources.append(source)
+        future = Future()
+        future.set_exception(BrokenProcessPool("çocuk süreç öldü"))
+        return future
+
+
+@pytest.fixture
+def on_disk(monkeypatch):
+    # İndirilen arşiv bellek içi tampona değil diske yazılsın
+    monkeypatch.setattr(data_processor, 'DOWNLOAD_SPOOL_MAX_BYTES', 0)
+
+
+@pytest.fixture
+def plain_export_url(export_url, plain_server):
+    """export_url'deki arşivin Range desteklemeyen sunucudaki adresi; arşiv tam indirilir."""
+    return plain_server.url('export.zip')
+
+
+def test_disk_archives_are_parsed_in_the_pool_from_a_path(plain_export_url, on_disk):
+    parse_pool = _RecordingPool()
+
+    results = run_pipeline(plain_export_url, parse_executor=parse_pool)
+    assert results["all_metrics"]["mutual_following_count"] == 72
+    # Her parça için yalnızca ZIP'in yolu gönderilir (followers_1/2 + following)
+    assert len(parse_pool.sources) == 3
+    assert all(isinstance(source, str) and source.endswith('.zip') for source in parse_pool.sources)
+
+
+def test_remote_and_spooled_archives_are_parsed_in_the_pipeline_thread(export_url, plain_export_url):
+    for url in (export_url, plain_export_url):
+        parse_pool = _RecordingPool()
+        results = run_pipeline(url, parse_executor=parse_pool)
+        assert results["all_metrics"]["mutual_following_count"] == 72
+        assert parse_pool.sources == []
+
+
+def test_dead_parse_process_falls_back_to_pipeline_thread(plain_export_url, on_disk):
+    parse_pool = _DeadPool()
+
+    results = run_pipeline(plain_export_url, parse_executor=parse_pool)
+    assert parse_pool.sources
+    assert results["all_metrics"]["mutual_following_count"] == 72
+    assert results["all_metrics"]["you_not_following_count"] == 228
+
+
+def test_executor_rejects_when_full():
+    executor = AnalysisExecutor(analysis_workers=1, parse_workers=0, queue_size=1)
+    release = threading.Event()
+    try:
+        executor.submit(release.wait)
+        executor.submit(release.wait)
+        with pytest.raises(ExecutorBusy) as error:
+            executor.submit(release.wait)
+        assert error.value.retry_after >= 1
+    finally:
+        release.set()
+        executor.shutdown()
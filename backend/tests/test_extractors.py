@@ -0,0 +1,148 @@
+import io
+import json
+
+import pytest
+
+from backend.services.extractors import (
+    MISSING_TIMESTAMP, SHAPE_EMBEDDED_LIST, SHAPE_KEY_AND_VALUE, SHAPE_TITLE, SHAPE_TOP_LEVEL_LIST, SHAPE_VALUE,
+    extract_relation, extract_relation_from_stream,
+)
+
+
+# Tablo tabanlı motordan önceki DataProcessor yardımcılarının birebir kopyaları (karşılaştırma için)
+
+def _extract_users_from_title(raw_data, main_key: str) -> set:
+    if main_key in raw_data:
+        data_list = raw_data.get(main_key, [])
+        return {item.get('title') for item in data_list if item.get('title')}
+    return set()
+
+
+def _extract_users_from_value(raw_data) -> set:
+    if 'string_list_data' in raw_data:
+        data_list = raw_data.get('string_list_data', [])
+        return {item.get('value') for item in data_list if item.get('value')}
+    return set()
+
+
+def _extract_users_from_embedded_list(raw_data, main_key: str) -> set:
+    if main_key in raw_data:
+        outer_list = raw_data.get(main_key, [])
+        if outer_list and isinstance(outer_list, list) and 'string_list_data' in outer_list[0]:
+            data_list = outer_list[0].get('string_list_data', [])
+            return {item.get('value') for item in data_list if item.get('value')}
+    return set()
+
+
+def _extract_users_from_key_and_value(raw_data: dict, main_key: str) -> set:
+    users = set()
+    if main_key in raw_data:
+        outer_list = raw_data.get(main_key, [])
+        if isinstance(outer_list, list):
+            for item in outer_list:
+                string_data_list = item.get('string_list_data', [])
+                if string_data_list and isinstance(string_data_list, list):
+                    user_value = string_data_list[0].get('value')
+                    if user_value:
+                        users.add(user_value)
+    return users
+
+
+def _get_ordered_user_list(raw_data: list) -> list:
+    users = []
+    if isinstance(raw_data, list):
+        for item in raw_data:
+            string_data_list = item.get('string_list_data', [])
+            if string_data_list and isinstance(string_data_list, list):
+                user_value = string_data_list[0].get('value')
+                if user_value:
+                    users.append(user_value)
+    return users
+
+
+def _entry(value=None, timestamp=None):
+    entry = {"href": f"https://www.instagram.com/{value}"}
+    if value is not None:
+        entry["value"] = value
+    if timestamp is not None:
+        entry["timestamp"] = timestamp
+    return entry
+
+
+# followers_1.json gibi üst seviye liste: eksik/boş string_list_data, value'suz girdi ve tekrar eden kullanıcı
+TOP_LEVEL = [
+    {"title": "", "string_list_data": [_entry("ayse", 1700000300)]},
+    {"title": "", "string_list_data": [_entry("mehmet")]},
+    {"title": "", "string_list_data": []},
+    {"title": "", "media_list_data": []},
+    {"title": "", "string_list_data": [_entry(timestamp=1700000200)]},
+    {"title": "", "string_list_data": [_entry("zeynep", "1700000100"), _entry("ikinci", 1)]},
+    {"title": "", "string_list_data": [_entry("ayse", 1700000000)]},
+]
+
+# following.json: kullanıcı adı title'da; string_list_data yalnızca zaman damgası taşır ya da hiç yoktur
+TITLE_ONLY = {"relationships_following": [
+    {"title": "ali", "string_list_data": [{"href": "https://www.instagram.com/_u/ali", "timestamp": 1700000000}]},
+    {"title": "veli", "string_list_data": []},
+    {"title": "can"},
+    {"title": "", "string_list_data": [{"timestamp": 1700000000}]},
+    {"title": "deniz", "string_list_data": [{"timestamp": -5}]},
+]}
+
+KEY_AND_VALUE = {"relationships_hide_stories_from": [
+    {"title": "", "string_list_data": [_entry("elif", 1700000000)]},
+    {"title": "", "string_list_data": [_entry("")]},
+    {"title": "", "string_list_data": [_entry("burak", 17.5)]},
+]}
+
+EMBEDDED = {"relationships_follow_requests_received": [
+    {"title": "", "string_list_data": [_entry("ece", 1700000000), _entry("kaan"), _entry()]},
+    {"title": "", "string_list_data": [_entry("yok_sayilir", 1700000000)]},
+]}
+
+VALUE = {"string_list_data": [_entry("selin", 1700000000), _entry("", 1), _entry("emre", None)]}
+
+CASES = [
+    (TOP_LEVEL, SHAPE_TOP_LEVEL_LIST, None, lambda raw, _key: set(_get_ordered_user_list(raw))),
+    (TITLE_ONLY, SHAPE_TITLE, 'relationships_following', _extract_users_from_title),
+    (KEY_AND_VALUE, SHAPE_KEY_AND_VALUE, 'relationships_hide_stories_from', _extract_users_from_key_and_value),
+    (EMBEDDED, SHAPE_EMBEDDED_LIST, 'relationships_follow_requests_received', _extract_users_from_embedded_list),
+    (VALUE, SHAPE_VALUE, None, lambda raw, _key: _extract_users_from_value(raw)),
+    ({}, SHAPE_TITLE, 'relationships_following', _extract_users_from_title),
+    ({"relationships_follow_requests_received": []}, SHAPE_EMBEDDED_LIST,
+     'relationships_follow_requests_received', _extract_users_from_embedded_list),
+]
+
+
+@pytest.mark.parametrize('raw, shape, main_key, legacy', CASES)
+def test_extract_relation_matches_legacy_helpers(raw, shape, main_key, legacy):
+    relation = extract_relation(raw, shape, main_key)
+    assert set(relation.ordered) == legacy(raw, main_key)
+    assert len(relation.timestamps) == len(relation.ordered)
+
+
+def test_top_level_list_keeps_file_order_and_duplicates():
+    relation = extract_relation(TOP_LEVEL, SHAPE_TOP_LEVEL_LIST)
+    assert relation.ordered == _get_ordered_user_list(TOP_LEVEL) == ['ayse', 'mehmet', 'zeynep', 'ayse']
+
+
+def test_missing_or_invalid_timestamps_are_marked():
+    relation = extract_relation(TOP_LEVEL, SHAPE_TOP_LEVEL_LIST)
+    # Eksik ya da metin olarak yazılmış zaman damgası: MISSING_TIMESTAMP
+    assert list(relation.timestamps) == [1700000300, MISSING_TIMESTAMP, MISSING_TIMESTAMP, 1700000000]
+
+    title = extract_relation(TITLE_ONLY, SHAPE_TITLE, 'relationships_following')
+    assert title.ordered == ['ali', 'veli', 'can', 'deniz']
+    # Başlık-yalnız kayıtlarda zaman damgası string_list_data[0]'dan okunur; negatif değer geçersizdir
+    assert list(title.timestamps) == [1700000000, MISSING_TIMESTAMP, MISSING_TIMESTAMP, MISSING_TIMESTAMP]
+
+    floats = extract_relation(KEY_AND_VALUE, SHAPE_KEY_AND_VALUE, 'relationships_hide_stories_from')
+    assert list(floats.timestamps) == [1700000000, MISSING_TIMESTAMP]
+
+
+@pytest.mark.parametrize('raw, shape, main_key, _legacy', CASES)
+def test_stream_extraction_matches_tree_extraction(raw, shape, main_key, _legacy):
+    tree = extract_relation(raw, shape, main_key)
+    stream = extract_relation_from_stream(io.StringIO(json.dumps(raw)), shape, main_key)
+    assert stream.ordered == tree.ordered
+    assert list(stream.timestamps) == list(tree.timestamps)
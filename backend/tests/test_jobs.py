@@ -0,0 +1,91 @@
+import time
+
+import fakeredis
+import pytest
+
+from backend.services.executor import AnalysisExecutor, ExecutorBusy
+from backend.services.jobs import JOB_ERROR, JOB_SUCCESS, JobManager
+from backend.services.progress import PHASE_DONE
+from backend.services.scratch import ScratchManager
+from backend.services.state_store import RedisStateStore
+
+
+@pytest.fixture
+def store():
+    return RedisStateStore(fakeredis.FakeRedis())
+
+
+@pytest.fixture
+def make_manager(tmp_path, store):
+    managers = []
+
+    def factory(**kwargs):
+        kwargs.setdefault('executor', AnalysisExecutor(analysis_workers=1, parse_workers=0, queue_size=0))
+        kwargs.setdefault('scratch_manager', ScratchManager(root=str(tmp_path / 'scratch')))
+        manager = JobManager(store=store, **kwargs)
+        managers.append(manager)
+        return manager
+
+    yield factory
+    for manager in managers:
+        manager.executor.shutdown()
+
+
+def _wait(manager, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job["state"] in (JOB_SUCCESS, JOB_ERROR):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"İş {timeout} saniyede bitmedi: {job}")
+
+
+def test_job_runs_and_is_visible_from_another_worker(make_manager, export_url):
+    manager = make_manager()
+    job_id = manager.submit(export_url)
+    job = _wait(manager, job_id)
+
+    assert job["state"] == JOB_SUCCESS, job["message"]
+    assert job["progress"]["phase"] == PHASE_DONE
+    summary = job["results"]
+    # 300 takipçi, 120 takip edilen, 72'si karşılıklı (bkz. conftest.py)
+    assert summary["all_metrics"]["mutual_following_count"] == 72
+    assert summary["all_metrics"]["not_following_back_count"] == 48
+    assert summary["all_metrics"]["you_not_following_count"] == 228
+    assert summary["list_sizes"]["recent_followers_list"] > 0
+    assert "user_lists" not in summary
+
+    # Aynı Redis'e bağlı başka bir işçi işi ve liste sayfalarını görebilir
+    other = make_manager()
+    assert other.get(job_id)["state"] == JOB_SUCCESS
+    page = other.result_pages.get_page(summary["result_id"], 'recent_followers_list', limit=10)
+    assert len(page["items"]) == 10
+    assert page["total"] == summary["list_sizes"]["recent_followers_list"]
+
+
+def test_failed_download_is_reported(make_manager, range_server):
+    manager = make_manager()
+    job = _wait(manager, manager.submit(range_server.url('missing.zip')))
+    assert job["state"] == JOB_ERROR
+    assert job["message"]
+    assert job["progress"]["phase"] == PHASE_DONE
+
+
+def test_rejected_job_leaves_no_record(make_manager, store, export_url):
+    manager = make_manager(executor=AnalysisExecutor(analysis_workers=1, parse_workers=0, queue_size=0))
+    running = manager.submit(export_url)
+    with pytest.raises(ExecutorBusy):
+        manager.submit(export_url)
+
+    _wait(manager, running)
+    job_keys = [key for key in store.client.scan_iter(f"{store.key_prefix}job:*")]
+    assert job_keys == [f"{store.key_prefix}job:{running}".encode()]
+
+
+def test_repeated_export_reuses_result_id(make_manager, export_url):
+    manager = make_manager()
+    first = _wait(manager, manager.submit(export_url))
+    second = _wait(manager, manager.submit(export_url))
+    assert first["results"]["result_id"] == second["results"]["result_id"]
+    assert first["results"]["list_sizes"] == second["results"]["list_sizes"]
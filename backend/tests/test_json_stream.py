@@ -0,0 +1,59 @@
+import io
+import json
+
+import pytest
+
+from backend.services.json_stream import iter_array_items
+
+DOCUMENTS = [
+    ('[]', None),
+    ('[1234567, -8.5e3, 0, true, false, null, "x"]', None),
+    ('  [ {"a": [1, [2, 3]], "b": {"c": "]"}} , {"d": "}{,"} ]  ', None),
+    ('{"relationships_following": [{"string_list_data": [{"value": "ali", "timestamp": 1700000000}]}]}',
+     'relationships_following'),
+    ('{"other": {"relationships_following": [1]}, "skip": [9, 9], "relationships_following": [2, 3]}',
+     'relationships_following'),
+    ('{"k": ["\\u00e7\\u011f\\u0131\\u00f6\\u015f\\u00fc", "kaçış \\"tırnak\\" \\\\ ters", "\\ud83d\\ude00"]}', 'k'),
+    ('{"k": [' + ', '.join(json.dumps({"value": f"user_{i}", "n": i * 1.5}) for i in range(300)) + ']}', 'k'),
+]
+
+
+class _Trickle(io.TextIOBase):
+    """Her read() çağrısında en fazla limit karakter döndüren akış (tampon sınırlarını zorlamak için)."""
+
+    def __init__(self, text: str, limit: int):
+        self._stream = io.StringIO(text)
+        self.limit = limit
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.limit
+        return self._stream.read(min(size, self.limit))
+
+
+def _expected(document, key):
+    value = json.loads(document)
+    return value if key is None else value[key]
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 7, 64 * 1024])
+@pytest.mark.parametrize('document, key', DOCUMENTS)
+def test_matches_json_load(document, key, limit):
+    assert list(iter_array_items(_Trickle(document, limit), key)) == _expected(document, key)
+
+
+@pytest.mark.parametrize('document, key', [
+    ('{"relationships_followers": [1]}', 'relationships_following'),
+    ('{}', 'k'),
+    ('[1, 2]', 'k'),
+    ('{"k": {"not": "a list"}}', 'k'),
+    ('{"k": [1]}', None),
+    ('', None),
+])
+def test_missing_array_yields_nothing(document, key):
+    assert list(iter_array_items(_Trickle(document, 2), key)) == []
+
+
+def test_truncated_array_raises():
+    with pytest.raises(ValueError):
+        list(iter_array_items(_Trickle('{"k": [1, 2', 3), 'k'))
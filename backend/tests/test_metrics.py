@@ -0,0 +1,71 @@
+import re
+
+from backend.services.instrumentation import DURATION_BUCKETS, METRIC_PREFIX, PhaseRecorder
+
+# Örnek satırı: isim{etiketler} değer
+_SAMPLE = re.compile(r'^(?P<name>[a-z_]+)(?:\{(?P<labels>[^}]*)\})? (?P<value>\S+)$')
+
+
+def _parse(body: str):
+    """Metin biçimini aileler (isim -> (HELP, TYPE)) ve örnekler [(isim, etiketler, değer)] olarak ayırır."""
+    families, samples = {}, []
+    lines = body.splitlines()
+    for index, line in enumerate(lines):
+        if line.startswith('# HELP '):
+            name, help_text = line[len('# HELP '):].split(' ', 1)
+            type_line = lines[index + 1]
+            # Her ailenin TYPE satırı HELP'in hemen ardından gelir
+            assert type_line.startswith(f"# TYPE {name} ")
+            families[name] = (help_text, type_line.rsplit(' ', 1)[1])
+        elif not line.startswith('#'):
+            match = _SAMPLE.match(line)
+            assert match, line
+            labels = dict(re.findall(r'(\w+)="([^"]*)"', match['labels'] or ''))
+            samples.append((match['name'], labels, float(match['value'])))
+    return families, samples
+
+
+def test_metrics_exposition(client):
+    recorder = PhaseRecorder()
+    with recorder.phase('metrics_test_outer'):
+        with recorder.phase('metrics_test_inner'):
+            recorder.add_bytes(bytes_in=123)
+    recorder.finish()
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    families, samples = _parse(response.get_data(as_text=True))
+
+    histogram = f"{METRIC_PREFIX}_phase_duration_seconds"
+    assert families[histogram][1] == 'histogram'
+    assert families[f"{METRIC_PREFIX}_phase_cpu_seconds_total"][1] == 'counter'
+    assert families[f"{METRIC_PREFIX}_phase_bytes_in_total"][1] == 'counter'
+    for gauge in ('analyses_in_flight', 'analysis_capacity', 'scratch_used_bytes', 'scratch_quota_bytes',
+                  'parse_pool_restarts'):
+        assert families[f"{METRIC_PREFIX}_{gauge}"][1] == 'gauge'
+    # Örneklerin tamamı bildirilmiş bir aileye aittir
+    assert all(re.sub(r'_(bucket|sum|count)$', '', name) in families for name, _, _ in samples)
+
+    for phase in ('metrics_test_outer', 'metrics_test_inner'):
+        buckets = [(labels['le'], value) for name, labels, value in samples
+                   if name == f"{histogram}_bucket" and labels['phase'] == phase]
+        assert [le for le, _ in buckets] == [str(bound) for bound in DURATION_BUCKETS] + ['+Inf']
+        counts = [value for _, value in buckets]
+        assert counts == sorted(counts)
+        (count,) = [value for name, labels, value in samples
+                    if name == f"{histogram}_count" and labels == {'phase': phase}]
+        (total,) = [value for name, labels, value in samples
+                    if name == f"{histogram}_sum" and labels == {'phase': phase}]
+        assert counts[-1] == count == 1
+        assert 0 <= total < DURATION_BUCKETS[-1]
+
+    bytes_in = {labels['phase']: value for name, labels, value in samples
+                if name == f"{METRIC_PREFIX}_phase_bytes_in_total"}
+    assert bytes_in['metrics_test_inner'] == 123
+    assert bytes_in['metrics_test_outer'] == 0
+
+    gauges = {name: value for name, labels, value in samples if not labels}
+    assert gauges[f"{METRIC_PREFIX}_analysis_capacity"] > 0
+    # Ayrıştırma havuzu henüz kurulmadıysa da yeniden kurulma sayısı okunabilir
+    assert gauges[f"{METRIC_PREFIX}_parse_pool_restarts"] == 0
@@ -0,0 +1,121 @@
+import functools
+import io
+import os
+import zipfile
+
+import pytest
+
+from backend.services import data_processor
+from backend.services.jobs import run_pipeline
+from backend.services.remote_zip import HttpRangeFile, RangeRequestsNotSupported, member_byte_range
+from backend.tests.support import RangeRequestHandler, write_export
+
+MEMBERS = {
+    'export/connections/followers_1.json': b'[' + b','.join(b'{"value": "f%d"}' % i for i in range(2000)) + b']',
+    'export/connections/following.json': b'{"relationships_following": []}',
+}
+# Uzak okumada hiç istenmemesi gereken büyük, sıkıştırılmamış dolgu
+PADDING_SIZE = 2 * 1024 * 1024
+
+
+class _ShiftedRangeHandler(RangeRequestHandler):
+    """Sondan okuma dışındaki aralıklarda Content-Range başlangıcını bir bayt kaydırarak bildiren sunucu."""
+
+    def send_header(self, keyword, value):
+        if keyword == 'Content-Range' and not self.headers['Range'].startswith('bytes=-'):
+            first, rest = value[len('bytes '):].split('-', 1)
+            value = f"bytes {int(first) + 1}-{rest}"
+        super().send_header(keyword, value)
+
+
+class _ReplacedAfterProbeHandler(RangeRequestHandler):
+    """İlk sondan okumadan sonra dosyayı server.replacement ile değiştirir: okuma sırasında güncellenen dosya."""
+
+    def do_GET(self):
+        super().do_GET()
+        if self.headers.get('Range', '').startswith('bytes=-') and self.server.replacement:
+            os.replace(self.server.replacement, self.translate_path(self.path))
+            self.server.replacement = None
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / 'export.zip'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr(zipfile.ZipInfo('export/media/video.mp4'), os.urandom(PADDING_SIZE),
+                          compress_type=zipfile.ZIP_STORED)
+        for name, data in MEMBERS.items():
+            zip_file.writestr(name, data)
+    return path
+
+
+def test_reads_members_without_fetching_whole_archive(range_server, archive):
+    with HttpRangeFile(range_server.url('export.zip')) as remote, zipfile.ZipFile(remote) as zip_file:
+        assert remote.size == os.path.getsize(archive)
+        assert remote.etag
+        for name, data in MEMBERS.items():
+            assert zip_file.read(name) == data
+        assert remote.bytes_fetched < PADDING_SIZE / 4
+
+
+def test_prefetch_merges_nearby_ranges_into_one_request(range_server, archive):
+    with HttpRangeFile(range_server.url('export.zip'), tail_size=1024) as remote, \
+            zipfile.ZipFile(remote) as zip_file:
+        requests_before = remote.request_count
+        remote.prefetch([member_byte_range(zip_file.getinfo(name)) for name in MEMBERS])
+        assert remote.request_count == requests_before + 1
+
+        # Önceden getirilen aralıklardan okunur; yeni istek yapılmaz
+        for name, data in MEMBERS.items():
+            assert zip_file.read(name) == data
+        assert remote.request_count == requests_before + 1
+
+
+def test_seek_and_read_match_local_file(range_server, archive):
+    local = archive.read_bytes()
+    with HttpRangeFile(range_server.url('export.zip'), tail_size=16) as remote:
+        reader = io.BufferedReader(remote, buffer_size=64)
+        for offset in (0, 1000, PADDING_SIZE - 10, len(local) - 5):
+            reader.seek(offset)
+            assert reader.read(100) == local[offset:offset + 100]
+        reader.seek(-20, io.SEEK_END)
+        assert reader.read() == local[-20:]
+
+
+def test_server_without_range_support_falls_back(plain_server, archive):
+    with pytest.raises(RangeRequestsNotSupported) as error:
+        HttpRangeFile(plain_server.url('export.zip'))
+    # Tam indirmeye geçerken önbellek anahtarı için 200 yanıtının başlıkları korunur
+    assert int(error.value.headers['Content-Length']) == os.path.getsize(archive)
+
+
+def test_fetch_rejects_ranges_from_a_changed_file(range_server, archive):
+    with HttpRangeFile(range_server.url('export.zip'), tail_size=1024) as remote, \
+            zipfile.ZipFile(remote) as zip_file:
+        ranges = [member_byte_range(zip_file.getinfo(name)) for name in MEMBERS]
+        # Açılıştan sonra dosya değişti; toplam boyut artık tutmuyor
+        archive.write_bytes(archive.read_bytes() + b'\0' * 10)
+        with pytest.raises(RangeRequestsNotSupported):
+            remote.prefetch(ranges)
+
+
+def test_fetch_rejects_ranges_with_another_start(serve, archive):
+    server = serve(_ShiftedRangeHandler)
+    with HttpRangeFile(server.url('export.zip'), tail_size=1024) as remote, zipfile.ZipFile(remote) as zip_file:
+        with pytest.raises(RangeRequestsNotSupported):
+            remote.prefetch([member_byte_range(zip_file.getinfo(name)) for name in MEMBERS])
+
+
+def test_pipeline_falls_back_to_full_download_when_the_file_changes(tmp_path, serve, monkeypatch):
+    # Sondan okuma yalnızca merkez dizini alsın; öğeler dosya değiştikten sonra istenir
+    monkeypatch.setattr(data_processor, 'HttpRangeFile', functools.partial(HttpRangeFile, tail_size=1024))
+    write_export(str(tmp_path / 'export.zip'), [f"old_{number}" for number in range(300)], ['old_1', 'a'])
+    write_export(str(tmp_path / 'replacement.zip'), [f"new_{number}" for number in range(50)], ['new_1', 'c'])
+    server = serve(_ReplacedAfterProbeHandler)
+    server.replacement = str(tmp_path / 'replacement.zip')
+
+    results = run_pipeline(server.url('export.zip'))
+    # Merkez dizin eski dosyadan okundu; öğeler iki sürümden birleştirilmeden yeni dosya tam indirildi
+    assert server.replacement is None
+    assert results["all_metrics"]["mutual_following_count"] == 1
+    assert results["all_metrics"]["you_not_following_count"] == 49
@@ -0,0 +1,127 @@
+import pytest
+
+from backend.services.result_pages import RESULT_PAGES_CHUNK_SIZE, InvalidPageRequest, ResultPages, result_id_for
+from backend.services.state_store import InMemoryStateStore
+
+FOLLOWERS = sorted(['ali', 'alican', 'alize', 'aysel', 'bora', 'burak', 'can', 'cem', 'deniz', 'ece'])
+RECENT = ['deniz', 'alize', 'can', 'ali', 'bora']
+RESULTS = {
+    "all_metrics": {"you_not_following_count": len(FOLLOWERS)},
+    "user_lists": {"you_not_following_list": FOLLOWERS, "recent_followers_list": RECENT},
+    "timeline": None,
+}
+
+
+@pytest.fixture(params=[RESULT_PAGES_CHUNK_SIZE, 3, 1])
+def pages(request):
+    """Listeler tek parçada, 3'erli ve 1'erli parçalarda saklanır; sayfalar her durumda aynı olmalı."""
+    return ResultPages(InMemoryStateStore(), chunk_size=request.param)
+
+
+def _collect(pages, result_id, list_key, limit, prefix=None):
+    items, cursor, requests = [], None, 0
+    while True:
+        page = pages.get_page(result_id, list_key, cursor=cursor, limit=limit, prefix=prefix)
+        items += page["items"]
+        requests += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items, requests
+
+
+def test_cursor_walks_the_whole_list(pages):
+    result_id = pages.save(RESULTS)
+    items, requests = _collect(pages, result_id, 'you_not_following_list', limit=3)
+    assert items == FOLLOWERS
+    assert requests == 4
+
+    page = pages.get_page(result_id, 'you_not_following_list', limit=3)
+    assert page == {"items": FOLLOWERS[:3], "next_cursor": "3", "total": len(FOLLOWERS)}
+
+
+@pytest.mark.parametrize('list_key, source', [('you_not_following_list', FOLLOWERS),
+                                              ('recent_followers_list', RECENT)])
+@pytest.mark.parametrize('prefix', ['al', 'AL', 'b', 'x', ''])
+def test_prefix_paging_on_sorted_and_unsorted_lists(pages, list_key, source, prefix):
+    result_id = pages.save(RESULTS)
+    items, _ = _collect(pages, result_id, list_key, limit=2, prefix=prefix)
+    assert items == [name for name in source if name.startswith(prefix.lower())]
+
+
+def test_summary_and_missing_results(pages):
+    result_id = pages.save(RESULTS)
+    summary = pages.get_summary(result_id)
+    assert summary["result_id"] == result_id
+    assert summary["list_sizes"] == {"you_not_following_list": len(FOLLOWERS), "recent_followers_list": len(RECENT)}
+    assert pages.get_page(result_id, 'unknown_list') is None
+    assert pages.get_page('missing', 'you_not_following_list') is None
+
+
+@pytest.mark.parametrize('cursor, limit', [('x', None), (-1, None), (None, 0), (None, 1001)])
+def test_invalid_page_requests(pages, cursor, limit):
+    result_id = pages.save(RESULTS)
+    with pytest.raises(InvalidPageRequest):
+        pages.get_page(result_id, 'you_not_following_list', cursor=cursor, limit=limit)
+
+
+def test_same_archive_is_stored_once(pages, monkeypatch):
+    result_id = result_id_for('archive:abc')
+    assert result_id == result_id_for('archive:abc')
+    assert result_id != result_id_for('archive:abc', snapshot_id=1)
+    assert pages.save(RESULTS, result_id) == result_id
+
+    writes = []
+    original_set = pages.store.set
+    monkeypatch.setattr(pages.store, 'set', lambda key, *args, **kwargs: writes.append(key) or original_set(key, *args, **kwargs))
+    assert pages.save(RESULTS, result_id) == result_id
+    # Listeler yeniden yazılmaz, yalnızca süreleri uzatılır
+    assert writes == [f"lists:{result_id}:summary"]
+    assert pages.get_page(result_id, 'you_not_following_list', limit=1000)["items"] == FOLLOWERS
+
+
+def _count_reads(monkeypatch, store):
+    reads = []
+    original_get = store.get
+    monkeypatch.setattr(store, 'get', lambda key: reads.append(key) or original_get(key))
+    return reads
+
+
+def test_page_reads_only_the_chunks_it_needs(monkeypatch):
+    usernames = [f"user_{number:04d}" for number in range(1000)]
+    pages = ResultPages(InMemoryStateStore(), chunk_size=100)
+    result_id = pages.save({"user_lists": {"you_not_following_list": usernames}})
+    key = f"lists:{result_id}:you_not_following_list"
+    reads = _count_reads(monkeypatch, pages.store)
+
+    page = pages.get_page(result_id, 'you_not_following_list', cursor=250, limit=100)
+    assert page["items"] == usernames[250:350]
+    assert page["next_cursor"] == "350"
+    assert reads == [key, f"{key}:2", f"{key}:3"]
+
+    # Önek araması başlıktaki parça başlarıyla tek parçaya iner
+    reads.clear()
+    page = pages.get_page(result_id, 'you_not_following_list', limit=5, prefix='user_074')
+    assert page["items"] == usernames[740:745]
+    assert reads == [key, f"{key}:7"]
+
+    # Son sayfa: sonrasında okunacak parça yok
+    reads.clear()
+    page = pages.get_page(result_id, 'you_not_following_list', cursor=900, limit=100)
+    assert page["items"] == usernames[900:] and page["next_cursor"] is None
+    assert reads == [key, f"{key}:9"]
+
+
+def test_missing_chunk_is_rewritten_on_next_save():
+    pages = ResultPages(InMemoryStateStore(), chunk_size=3)
+    result_id = pages.save(RESULTS, result_id_for('archive:abc'))
+    pages.store.delete(f"lists:{result_id}:you_not_following_list:2")
+    assert pages.get_page(result_id, 'you_not_following_list', cursor=6) is None
+    # Başlık duruyor ama bir parçası düşmüş: liste tümüyle yeniden yazılır
+    pages.save(RESULTS, result_id)
+    assert pages.get_page(result_id, 'you_not_following_list', cursor=6)["items"] == FOLLOWERS[6:]
+
+
+def test_empty_list(pages):
+    result_id = pages.save({"user_lists": {"mutual_following_list": []}})
+    assert pages.get_page(result_id, 'mutual_following_list') == {"items": [], "next_cursor": None, "total": 0}
+    assert pages.get_page(result_id, 'mutual_following_list', prefix='a')["items"] == []
@@ -0,0 +1,148 @@
+import gc
+import os
+import time
+
+import pytest
+
+from backend.services import data_processor
+from backend.services.data_processor import DataProcessor
+from backend.services.jobs import run_pipeline
+from backend.services.scratch import HEARTBEAT_FILENAME, ScratchManager, ScratchSpaceFull
+from backend.tests.conftest import FOLLOWERS, FOLLOWING
+from backend.tests.support import write_export
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / 'scratch')
+
+
+def test_root_is_created_on_first_use(root):
+    manager = ScratchManager(root=root)
+    manager.admit()
+    assert not os.path.exists(root)
+
+    scratch = manager.allocate()
+    assert os.path.isdir(scratch.path) and os.path.dirname(scratch.path) == root
+    scratch.release()
+
+    assert ScratchManager(root=root + '-sweep').sweep() == 0
+    assert os.path.isdir(root + '-sweep')
+
+
+def test_sweep_keeps_another_workers_live_job(root):
+    # Aynı kök dizini paylaşan iki işçi
+    owner = ScratchManager(root=root, max_age=60)
+    janitor = ScratchManager(root=root, max_age=60)
+    live = owner.allocate()
+    abandoned = owner.allocate()
+    owner._release(abandoned)  # sahibi çöktü: klasör kaldı, nabız durdu
+
+    # Her iki klasör de bir saat önce oluşturulmuş gibi
+    hour_ago = time.time() - 3600
+    for scratch in (live, abandoned):
+        os.utime(scratch.path, (hour_ago, hour_ago))
+        os.utime(os.path.join(scratch.path, HEARTBEAT_FILENAME), (hour_ago, hour_ago))
+
+    # Sahibinin taraması kendi işlerinin nabzını yeniler (sahipsiz klasörü de siler)
+    assert owner.sweep() == 1
+    assert not os.path.exists(abandoned.path)
+    # Klasörün kendisi eski olsa da nabzı yeni: diğer işçinin temizlikçisi silmez
+    assert janitor.sweep() == 0
+    assert os.path.isdir(live.path)
+    live.release()
+
+
+def test_reserve_refreshes_the_heartbeat(root):
+    manager = ScratchManager(root=root)
+    scratch = manager.allocate()
+    heartbeat = os.path.join(scratch.path, HEARTBEAT_FILENAME)
+    os.utime(heartbeat, (1, 1))
+    scratch.reserve(10)
+    assert os.path.getmtime(heartbeat) > time.time() - 60
+    scratch.release()
+    # Silinmiş klasörün nabzı sessizce yok sayılır
+    scratch.heartbeat()
+    assert not os.path.exists(scratch.path)
+
+
+def test_sweep_tolerates_entries_removed_concurrently(root, monkeypatch):
+    manager = ScratchManager(root=root, max_age=60)
+    manager.sweep()
+    stale = os.path.join(root, 'stale.zip')
+    with open(stale, 'wb') as f:
+        f.write(b'x' * 10)
+    os.utime(stale, (1, 1))
+
+    def removed_by_another_worker(path):
+        os.unlink(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, 'remove', removed_by_another_worker)
+    # Başka bir işçi dosyayı önce sildi; tarama hata vermeden devam eder
+    manager.sweep()
+    assert not os.path.exists(stale)
+    assert manager.used_bytes == 0
+
+
+def test_reservations_are_limited_by_the_quota(root):
+    manager = ScratchManager(root=root, quota_bytes=100)
+    first, second = manager.allocate(), manager.allocate()
+    first.reserve(60)
+    with pytest.raises(ScratchSpaceFull):
+        second.reserve(50)
+    assert manager.used_bytes == 60
+
+    second.reserve(40)
+    assert manager.used_bytes == 100
+    # Kota dolu: yeni iş kabul edilmez
+    with pytest.raises(ScratchSpaceFull) as error:
+        manager.allocate()
+    assert error.value.retry_after >= 1
+
+    first.release()
+    assert manager.used_bytes == 40
+    manager.admit()
+    second.release()
+    assert manager.used_bytes == 0 and os.listdir(root) == []
+
+
+@pytest.mark.parametrize('path', ['/jobs', '/'])
+def test_full_scratch_space_is_rejected_with_429(client, app_module, monkeypatch, path):
+    monkeypatch.setattr(app_module.scratch_manager, 'quota_bytes', 0)
+    response = client.post(path, json={"downloadUrl": "https://example.com/export.zip"})
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert response.get_json()["status"] == 'error'
+
+
+def test_processor_releases_its_scratch_space_when_collected(root):
+    manager = ScratchManager(root=root, quota_bytes=100)
+    processor = DataProcessor('https://example.com/export.zip', scratch_manager=manager)
+    processor.scratch.reserve(30)
+    path = processor.scratch_dir
+    assert manager.used_bytes == 30
+
+    del processor
+    gc.collect()
+    assert manager.used_bytes == 0
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize('spooled', [True, False])
+def test_small_quota_only_limits_downloads_to_disk(tmp_path, plain_server, root, monkeypatch, spooled):
+    write_export(str(tmp_path / 'export.zip'), FOLLOWERS, FOLLOWING, shards=2)
+    if not spooled:
+        monkeypatch.setattr(data_processor, 'DOWNLOAD_SPOOL_MAX_BYTES', 0)
+    manager = ScratchManager(root=root, quota_bytes=1024)
+
+    if spooled:
+        # Bellek içi indirme geçici alandan yer ayırmaz
+        results = run_pipeline(plain_server.url('export.zip'), scratch_manager=manager)
+        assert results["all_metrics"]["mutual_following_count"] == 72
+    else:
+        with pytest.raises(ScratchSpaceFull):
+            run_pipeline(plain_server.url('export.zip'), scratch_manager=manager)
+    # Her iki durumda da iş bitince ayrılan yer ve klasör geri verilir
+    assert manager.used_bytes == 0
+    assert os.listdir(root) == []
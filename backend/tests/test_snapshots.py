@@ -0,0 +1,122 @@
+import functools
+
+import pytest
+
+from backend.services import data_processor
+from backend.services.data_processor import DataProcessor
+from backend.services.jobs import run_pipeline
+from backend.services.result_cache import ResultCache
+from backend.services.snapshots import SnapshotStore
+from backend.services.remote_zip import HttpRangeFile
+from backend.tests.support import RangeRequestHandler, write_export
+
+DIFF_LIST = "lost_followers_since_last_list"
+
+
+@pytest.fixture
+def snapshot_store(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'snapshots.sqlite3'))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def analyze(snapshot_store):
+    def run(url, username=None, **kwargs):
+        return run_pipeline(url, username, snapshot_store=snapshot_store, **kwargs)
+    return run
+
+
+class _CountingHandler(RangeRequestHandler):
+    """Gelen istekleri sayan Range destekli sunucu."""
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests = getattr(self.server, 'requests', 0) + 1
+        super().do_GET()
+
+
+def _export(tmp_path, server, name, account, followers):
+    write_export(str(tmp_path / name), followers, followers[:12] + ['someone', 'else'], account=account)
+    return server.url(name)
+
+
+def _users(prefix, count=50):
+    return [f"{prefix}_{number:02d}" for number in range(count)]
+
+
+def test_snapshots_are_keyed_by_the_archive_account(tmp_path, range_server, analyze, snapshot_store):
+    first = analyze(_export(tmp_path, range_server, 'first.zip', 'Owner', _users('old')))
+    assert DIFF_LIST not in first["user_lists"]
+
+    second = analyze(_export(tmp_path, range_server, 'second.zip', 'owner', _users('new', 40)))
+    assert second["all_metrics"]["lost_followers_since_last_count"] == 50
+    assert second["all_metrics"]["new_followers_since_last_count"] == 40
+    assert second["user_lists"][DIFF_LIST] == _users('old')
+    assert len(snapshot_store.history('owner')) == 2
+
+
+def test_client_username_cannot_read_or_write_another_account(tmp_path, range_server, analyze, snapshot_store):
+    analyze(_export(tmp_path, range_server, 'victim.zip', 'victim', _users('victim')))
+
+    spoofed = analyze(_export(tmp_path, range_server, 'attacker.zip', 'attacker', _users('attacker')),
+                      username='victim')
+    assert DIFF_LIST not in spoofed["user_lists"]
+    assert "lost_followers_since_last_count" not in spoofed["all_metrics"]
+    assert len(snapshot_store.history('victim')) == 1
+    assert len(snapshot_store.history('attacker')) == 1
+
+
+def test_archive_without_account_keeps_no_snapshot(tmp_path, range_server, analyze, snapshot_store):
+    results = analyze(_export(tmp_path, range_server, 'anonymous.zip', None, _users('follower')), username='owner')
+    assert results["all_metrics"]["mutual_following_count"] == 12
+    assert DIFF_LIST not in results["user_lists"]
+    assert snapshot_store.history('owner') == []
+
+
+def test_etag_cache_hit_keeps_the_archive_diff(tmp_path, plain_server, analyze, snapshot_store, monkeypatch):
+    result_cache = ResultCache()
+    analyze(_export(tmp_path, plain_server, 'first.zip', 'owner', _users('old')), result_cache=result_cache)
+    url = _export(tmp_path, plain_server, 'second.zip', 'owner', _users('new'))
+    analyzed = analyze(url, result_cache=result_cache)
+
+    # Önbellekten dönmeli: arşiv yeniden indirilmez
+    monkeypatch.setattr(DataProcessor, 'download_file', lambda self: pytest.fail("Arşiv yeniden indirildi"))
+    cached = analyze(url, username='someone_else', result_cache=result_cache)
+    assert cached == analyzed
+    assert cached["user_lists"][DIFF_LIST] == _users('old')
+
+
+def test_account_is_fetched_with_the_other_members(tmp_path, serve, analyze, monkeypatch):
+    # Merkez dizin küçük bir sondan okumayla gelsin; öğeler ayrıca istenmeli
+    monkeypatch.setattr(data_processor, 'HttpRangeFile', functools.partial(HttpRangeFile, tail_size=1024))
+    server = serve(_CountingHandler)
+
+    results = analyze(_export(tmp_path, server, 'export.zip', 'owner', _users('follower')))
+    assert results["all_metrics"]["mutual_following_count"] == 12
+    # Sondan okuma + gerekli öğeler ve hesap bilgileri için tek toplu istek
+    assert server.requests == 2
+
+
+def test_concurrent_add_of_the_same_archive_keeps_one_snapshot(tmp_path, snapshot_store, monkeypatch):
+    other = SnapshotStore(snapshot_store.db_path)
+    first_id = snapshot_store.add_snapshot('owner', 'archive:old', _users('old'), _users('old'))
+    original_intern = SnapshotStore._intern
+    racing = []
+
+    def intern_after_other_process(self, usernames):
+        # İlk kontrolden sonra, eklemeden önce başka bir süreç aynı arşivi kaydeder
+        if self is snapshot_store and not racing:
+            racing.append(other.add_snapshot('@Owner', 'archive:new', _users('new'), _users('new')))
+        return original_intern(self, usernames)
+
+    monkeypatch.setattr(SnapshotStore, '_intern', intern_after_other_process)
+    try:
+        snapshot_id = snapshot_store.add_snapshot('owner', 'archive:new', _users('new'), _users('new'))
+    finally:
+        other.close()
+
+    assert snapshot_id == racing[0] != first_id
+    history = snapshot_store.history('owner')
+    assert [entry["snapshot_id"] for entry in history] == [first_id, snapshot_id]
+    assert history[1]["lost_follower_count"] == 50
@@ -0,0 +1,89 @@
+import fakeredis
+import pytest
+
+from backend.services.state_store import InMemoryStateStore, RedisStateStore
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def store(request, redis_client):
+    return InMemoryStateStore() if request.param == 'memory' else RedisStateStore(redis_client)
+
+
+def test_round_trip_and_delete(store):
+    value = {"state": "running", "results": None, "counts": [1, 2], "name": "çağrı"}
+    store.set('job:1', value, ttl=60)
+    assert store.get('job:1') == value
+    store.delete('job:1')
+    assert store.get('job:1') is None
+    # Olmayan anahtarı silmek hata değildir
+    store.delete('job:1')
+
+
+def test_redis_keys_are_prefixed_json_with_ttl(redis_client):
+    store = RedisStateStore(redis_client, key_prefix='test:')
+    store.set('job:1', {"a": 1}, ttl=30)
+    store.set('forever', [1])
+
+    assert redis_client.get('test:job:1') == b'{"a":1}'
+    assert 0 < redis_client.ttl('test:job:1') <= 30
+    assert redis_client.ttl('test:forever') == -1
+    assert redis_client.get('job:1') is None
+
+
+def test_stores_share_state_through_one_redis(redis_client):
+    # İki gunicorn işçisi aynı Redis'e bağlanır
+    first, second = RedisStateStore(redis_client), RedisStateStore(redis_client)
+    first.set('job:1', {"state": "success"})
+    assert second.get('job:1') == {"state": "success"}
+
+
+
+def test_create_state_store_from_redis_url(monkeypatch):
+    from backend.services import state_store
+
+    urls = []
+
+    def from_url(url):
+        urls.append(url)
+        return fakeredis.FakeRedis()
+
+    monkeypatch.setattr(state_store.redis.Redis, 'from_url', staticmethod(from_url))
+    store = state_store.create_state_store('redis://localhost:6379/0')
+    assert isinstance(store, RedisStateStore)
+    assert urls == ['redis://localhost:6379/0']
+    store.set('key', {"a": 1})
+    assert store.get('key') == {"a": 1}
+
+
+def test_create_state_store_without_url_or_package(monkeypatch):
+    from backend.services import state_store
+
+    assert isinstance(state_store.create_state_store(None), InMemoryStateStore)
+    monkeypatch.setattr(state_store, 'redis', None)
+    assert isinstance(state_store.create_state_store('redis://localhost:6379/0'), InMemoryStateStore)
+
+
+def test_memory_store_is_bounded_by_bytes():
+    store = InMemoryStateStore(max_bytes=1000)
+    for number in range(10):
+        store.set(f'list:{number}', ['x' * 20] * 8)  # ~185 bayt
+    kept = [number for number in range(10) if store.get(f'list:{number}') is not None]
+    assert kept == [5, 6, 7, 8, 9]
+
+    # Tek başına sığmayan değer saklanmaz ve eski değeri de bırakmaz
+    store.set('list:9', ['x' * 2000])
+    assert store.get('list:9') is None
+    assert store.get('list:8') is not None
+
+
+def test_touch_refreshes_existing_keys_only(store):
+    assert store.touch('missing', ttl=60) is False
+    store.set('key', [1, 2], ttl=60)
+    assert store.touch('key', ttl=120) is True
+    assert store.touch('key') is True
+    assert store.get('key') == [1, 2]
@@ -0,0 +1,107 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from backend.services import structured_logging
+from backend.services.structured_logging import (
+    ContextFilter, DroppingQueueHandler, JsonFormatter, SamplingFilter, current_job_id, redact_text, redact_url,
+)
+
+SIGNED_URL = "https://download.example.com/export/owner.zip?Signature=abc123&token=s3cr3t#part"
+
+
+def _record(message='Mesaj %s', args=('x',), level=logging.INFO, exc_info=None, **extra):
+    record = logging.LogRecord('backend.services.jobs', level, __file__, 1, message, args, exc_info)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+@pytest.mark.parametrize('url, expected', [
+    (SIGNED_URL, "https://download.example.com/export/owner.zip"),
+    ("http://127.0.0.1:8000/a/b.zip", "http://127.0.0.1:8000/a/b.zip"),
+    ("", ""),
+    (None, None),
+])
+def test_redact_url(url, expected):
+    assert redact_url(url) == expected
+
+
+def test_redact_text_hides_every_query_string():
+    text = (f"HTTPSConnectionPool: Max retries exceeded with url: {SIGNED_URL} "
+            f"(redirected from 'http://cdn.example.com/x.zip?sig=zzz')")
+    redacted = redact_text(text)
+    for secret in ('abc123', 's3cr3t', 'sig=zzz', '#part'):
+        assert secret not in redacted
+    assert "https://download.example.com/export/owner.zip?<redacted>" in redacted
+    assert "http://cdn.example.com/x.zip?<redacted>'" in redacted
+    assert redact_text("URL'siz mesaj") == "URL'siz mesaj"
+
+
+def test_json_formatter_writes_one_redacted_line():
+    try:
+        raise ValueError(f"indirilemedi: {SIGNED_URL}")
+    except ValueError:
+        exc_info = sys.exc_info()
+    record = _record("İndirme başarısız: %s", (SIGNED_URL,), level=logging.ERROR, exc_info=exc_info,
+                     job_id='job-1', duration_ms=12.5, phase='download')
+    record.exc_text = logging.Formatter().formatException(exc_info)
+
+    line = JsonFormatter().format(record)
+    assert '\n' not in line
+    entry = json.loads(line)
+    assert entry["level"] == 'ERROR'
+    assert entry["logger"] == 'backend.services.jobs'
+    assert entry["message"] == "İndirme başarısız: https://download.example.com/export/owner.zip?<redacted>"
+    assert entry["job_id"] == 'job-1'
+    assert entry["duration_ms"] == 12.5 and entry["phase"] == 'download'
+    assert 'ValueError' in entry["exception"] and 's3cr3t' not in entry["exception"]
+    # LogRecord'un kendi alanları JSON'a taşınmaz
+    assert not {'args', 'msg', 'levelno', 'pathname', 'exc_info'} & set(entry)
+
+
+def test_context_filter_adds_the_current_job_id():
+    token = current_job_id.set('job-42')
+    try:
+        record = _record()
+        assert ContextFilter().filter(record)
+        assert record.job_id == 'job-42'
+    finally:
+        current_job_id.reset(token)
+
+    record = _record()
+    ContextFilter().filter(record)
+    assert record.job_id is None
+    assert 'job_id' not in json.loads(JsonFormatter().format(record))
+
+
+def test_sampling_filter(monkeypatch):
+    sampling = SamplingFilter({logging.DEBUG: 0.0, logging.INFO: 0.5})
+    monkeypatch.setattr(structured_logging.random, 'random', lambda: 0.7)
+    assert not sampling.filter(_record(level=logging.DEBUG))
+    assert not sampling.filter(_record(level=logging.INFO))
+    monkeypatch.setattr(structured_logging.random, 'random', lambda: 0.3)
+    assert not sampling.filter(_record(level=logging.DEBUG))
+    assert sampling.filter(_record(level=logging.INFO))
+    # Oranı verilmeyen seviyeler (WARNING ve üstü) örneklenmez
+    monkeypatch.setattr(structured_logging.random, 'random', lambda: 0.999)
+    assert sampling.filter(_record(level=logging.WARNING))
+    assert sampling.filter(_record(level=logging.ERROR))
+
+
+def test_dropping_queue_handler_never_blocks():
+    log_queue = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(log_queue)
+    arguments = ['önce']
+    handler.handle(_record('Değer: %s', (arguments,)))
+    handler.handle(_record('İkinci', ()))
+
+    assert handler.dropped == 1
+    queued = log_queue.get_nowait()
+    # Mesaj kuyruğa girerken sabitlenir; argümanın sonradan değişmesi kaydı etkilemez
+    arguments.append('sonra')
+    assert queued.getMessage() == "Değer: ['önce']"
+    assert queued.args is None
@@ -0,0 +1,82 @@
+from array import array
+
+import numpy as np
+import pytest
+
+from backend.services.extractors import MISSING_TIMESTAMP
+from backend.services.timeline import SECONDS_PER_DAY, SECONDS_PER_WEEK, FollowerTimeline
+
+NOW = 1714521600
+DAY = SECONDS_PER_DAY
+
+# Dosya sırasıyla takipçiler ve takip etmeye başladıkları an (NOW'a göre)
+FOLLOWERS = [
+    ('simdi', NOW),
+    ('dun', NOW - DAY),
+    ('zamansiz_1', MISSING_TIMESTAMP),
+    ('yedi_gun', NOW - 7 * DAY),
+    ('yedi_gun_bir_saniye', NOW - 7 * DAY - 1),
+    ('on_gun', NOW - 10 * DAY),
+    ('otuz_gun', NOW - 30 * DAY),
+    ('otuz_bir_gun', NOW - 31 * DAY),
+    ('zamansiz_2', MISSING_TIMESTAMP),
+    ('yuz_gun', NOW - 100 * DAY),
+]
+
+
+@pytest.fixture(params=['array', 'numpy'])
+def timeline(request):
+    """Zaman damgaları çıkarma sırasındaki array('q') ya da sütunlu depodaki int64 NumPy dizisi olabilir."""
+    usernames = [username for username, _ in FOLLOWERS]
+    timestamps = array('q', (timestamp for _, timestamp in FOLLOWERS))
+    if request.param == 'numpy':
+        timestamps = np.array(timestamps, dtype=np.int64)
+    return FollowerTimeline(usernames, timestamps)
+
+
+def test_seven_and_thirty_day_windows_include_their_boundary(timeline):
+    assert timeline.since(7, now=NOW) == ['simdi', 'dun', 'yedi_gun']
+    assert timeline.count_since(7, now=NOW) == 3
+    assert timeline.since(30, now=NOW) == ['simdi', 'dun', 'yedi_gun', 'yedi_gun_bir_saniye', 'on_gun', 'otuz_gun']
+    assert timeline.count_since(30, now=NOW) == 6
+    assert timeline.since(0, now=NOW) == ['simdi']
+
+
+def test_entries_without_timestamps_are_never_in_a_window(timeline):
+    assert timeline.count_since(10 ** 6, now=NOW) == len(FOLLOWERS) - 2
+    assert not {'zamansiz_1', 'zamansiz_2'} & set(timeline.since(10 ** 6, now=NOW))
+    assert sum(timeline.weekly_velocity(1000, now=NOW)) == len(FOLLOWERS) - 2
+
+
+def test_recent_orders_newest_first_with_missing_timestamps_last(timeline):
+    assert timeline.recent(3) == ['simdi', 'dun', 'yedi_gun']
+    assert timeline.recent(len(FOLLOWERS))[-2:] == ['zamansiz_1', 'zamansiz_2']
+
+
+def test_weekly_buckets(timeline):
+    # Eskiden yeniye: [..., (now-21g, now-14g], (now-14g, now-7g], [now-7g, now]]
+    assert timeline.weekly_velocity(5, now=NOW) == [2, 0, 0, 2, 3]
+    assert timeline.weekly_velocity(1, now=NOW) == [timeline.count_since(7, now=NOW)]
+    # Pencereden eski kayıtlar sayılmaz
+    assert timeline.weekly_velocity(2, now=NOW) == [2, 3]
+
+
+@pytest.mark.parametrize('offset, week', [(0, 0), (SECONDS_PER_WEEK, 0), (SECONDS_PER_WEEK + 1, 1),
+                                          (2 * SECONDS_PER_WEEK, 1), (2 * SECONDS_PER_WEEK + 1, 2)])
+def test_week_boundaries(offset, week):
+    timeline = FollowerTimeline(['tek'], array('q', [NOW - offset]))
+    counts = timeline.weekly_velocity(3, now=NOW)
+    assert counts[::-1] == [int(index == week) for index in range(3)]
+
+
+def test_future_timestamps_are_not_counted_in_weekly_buckets():
+    timeline = FollowerTimeline(['gelecek', 'bugun'], array('q', [NOW + DAY, NOW]))
+    assert timeline.weekly_velocity(2, now=NOW) == [0, 1]
+
+
+def test_empty_timeline():
+    timeline = FollowerTimeline([], array('q'))
+    assert timeline.recent(5) == []
+    assert timeline.since(7, now=NOW) == []
+    assert timeline.count_since(30, now=NOW) == 0
+    assert timeline.weekly_velocity(4, now=NOW) == [0, 0, 0, 0]
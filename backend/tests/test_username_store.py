@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from backend.services.username_store import ID_DTYPE, UsernameStore
+
+
+def _ids(*values):
+    return np.array(values, dtype=ID_DTYPE)
+
+
+SET_CASES = [
+    (_ids(), _ids()),
+    (_ids(), _ids(1, 2, 3)),
+    (_ids(1, 2, 3), _ids()),
+    (_ids(1, 3, 5, 7), _ids(3, 4, 5)),
+    # Sırasız ve tekrarlı girdiler
+    (_ids(7, 1, 5, 3), _ids(5, 4, 3)),
+    (_ids(2, 2, 1, 1), _ids(1, 1)),
+    (_ids(9, 9, 9), _ids(9)),
+    (_ids(0, 2 ** 31 - 1, 5), _ids(2 ** 31 - 1)),
+]
+
+
+@pytest.mark.parametrize('left, right', SET_CASES)
+def test_intersection_and_difference_match_python_sets(left, right):
+    intersection = UsernameStore.intersection(left, right)
+    difference = UsernameStore.difference(left, right)
+
+    assert intersection.tolist() == sorted(set(left.tolist()) & set(right.tolist()))
+    assert difference.tolist() == sorted(set(left.tolist()) - set(right.tolist()))
+    assert intersection.dtype == difference.dtype == ID_DTYPE
+
+
+def test_relations_are_sorted_unique_and_decode_in_username_order():
+    store = UsernameStore({
+        'followers': ['zeynep', 'ali', 'zeynep', 'can'],
+        'following': ['can', 'burak', 'ali', 'ali'],
+        'empty': [],
+    })
+    for key in ('followers', 'following', 'empty'):
+        ids = store.ids(key)
+        assert ids.dtype == ID_DTYPE
+        assert ids.tolist() == sorted(set(ids.tolist()))
+
+    mutual = UsernameStore.intersection(store.ids('followers'), store.ids('following'))
+    assert store.decode(mutual) == ['ali', 'can']
+    assert store.decode(UsernameStore.difference(store.ids('following'), store.ids('followers'))) == ['burak']
+    assert store.decode(UsernameStore.difference(store.ids('empty'), store.ids('followers'))) == []
+    assert store.encode_ordered(['can', 'ali', 'can']).tolist() == [2, 0, 2]
+
+
+def test_from_ids_deduplicates_unsorted_ids():
+    store = UsernameStore.from_ids(['ali', 'can', 'veli'], {'followers': [2, 0, 2, 1], 'following': []})
+    assert store.ids('followers').tolist() == [0, 1, 2]
+    assert store.ids('following').dtype == ID_DTYPE
+    assert store.decode(store.ids('followers')) == ['ali', 'can', 'veli']
+    assert store.encode(['veli', 'ali', 'veli']).tolist() == [0, 2]